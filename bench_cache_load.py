@@ -0,0 +1,87 @@
+"""
+Benchmark: CacheManager.load_cache cold start, eager vs lazy notice records.
+
+Writes a cache with --notices records twice, once in the old layout (every
+record a parsed dict, loaded with a plain parse as before) and once in the
+LazyNotices layout (records stored as text, loaded and verified by
+CacheManager), then loads each in a fresh process and looks up --touch
+records, as a run that only needs the scraped notices would. Reports load
+time and peak traced memory.
+
+Run:  python bench_cache_load.py [--notices 20000] [--touch 60]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import tracemalloc
+import multiprocessing as mp
+
+import serializers
+from cache_manager import CacheManager
+from bench_serialization import _sample_cache
+
+
+def _run(mode: str, cache_file: str, touch: int, trace: bool, out):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    if mode == 'eager':
+        # What load_cache used to do: parse the whole file into dicts
+        data = serializers.load_file(cache_file)
+    else:
+        data = CacheManager(cache_file).load_cache()
+    loaded = time.perf_counter() - start
+    notices = data['notices']
+    for notice_id in list(notices.keys())[:touch]:
+        notices[notice_id].get('title')
+    total = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else 0
+    out.put((loaded, total, peak / 1024 / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--notices', type=int, default=20000)
+    parser.add_argument('--touch', type=int, default=60)
+    args = parser.parse_args()
+
+    cache = _sample_cache(args.notices)
+    cache['version'] = CacheManager().current_version
+    with tempfile.TemporaryDirectory() as workdir:
+        eager = os.path.join(workdir, 'eager.json')
+        with open(eager, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, separators=(',', ':'))
+
+        # Signed, lazy-layout copy written by the cache manager itself
+        lazy = os.path.join(workdir, 'lazy.json')
+        cm = CacheManager(lazy, hot_size=args.notices)
+        data = cm.load_cache()
+        data.update({k: v for k, v in cache.items() if k != 'notices'})
+        for notice_id, record in cache['notices'].items():
+            data['notices'][notice_id] = record
+            cm.mark_dirty(notice_id)
+        cm.save_cache(data)
+
+        ctx = mp.get_context('spawn')
+        print(f"\n{args.notices} notices, {args.touch} records accessed")
+        print(f"{'layout':<8}{'load ms':>10}{'+access ms':>12}{'peak MB':>10}{'file KB':>10}")
+        for label, path in (('eager', eager), ('lazy', lazy)):
+            # Timed and memory-traced runs are separate: tracemalloc slows allocation
+            results = []
+            for trace in (False, True):
+                out = ctx.Queue()
+                proc = ctx.Process(target=_run, args=(label, path, args.touch, trace, out))
+                proc.start()
+                results.append(out.get())
+                proc.join()
+            (loaded, total, _), (_, _, peak) = results
+            print(f"{label:<8}{loaded * 1000:>10.1f}{total * 1000:>12.1f}{peak:>10.1f}"
+                  f"{os.path.getsize(path) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
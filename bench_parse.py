@@ -0,0 +1,65 @@
+"""
+Benchmark: NoticeScraper.parse_notices engines over saved notice pages.
+
+Parses every HTML fixture with the BeautifulSoup engine ('bs4', html.parser)
+and the lxml engine, checks both return the same notices, and reports the
+mean parse time per page.
+
+Run:  python bench_parse.py [page.html ...] [--repeat 50]
+Without files the pages in fixtures/ are used (notice_page.html has the
+live site's layout; notice_page_redesign.html only matches the table scan).
+"""
+
+import io
+import os
+import sys
+import glob
+import time
+import argparse
+import contextlib
+
+from scraper import NoticeScraper, lxml_html
+
+
+ENGINES = ('bs4', 'lxml')
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def _parse(engine: str, html_content: str, repeat: int):
+    scraper = NoticeScraper()
+    scraper.engine = engine
+    # Keep the parser's per-page messages out of the table
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            notices = scraper.parse_notices(html_content)
+        elapsed = (time.perf_counter() - start) / repeat
+    # Timestamps differ between calls; everything else must match
+    return elapsed, [{k: v for k, v in n.items() if k != 'timestamp'} for n in notices]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('pages', nargs='*')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    if lxml_html is None:
+        print("lxml is not installed; nothing to compare")
+        return 1
+
+    pages = args.pages or sorted(glob.glob(os.path.join(FIXTURES, '*.html')))
+    print(f"{'page':<28}{'rows':>6}" + "".join(f"{e + ' ms':>10}" for e in ENGINES) + f"{'speedup':>9}")
+    for path in pages:
+        with open(path, encoding='utf-8') as f:
+            html_content = f.read()
+        results = {engine: _parse(engine, html_content, args.repeat) for engine in ENGINES}
+        assert results['bs4'][1] == results['lxml'][1], f"engines disagree on {path}"
+        times = [results[e][0] for e in ENGINES]
+        print(f"{os.path.basename(path):<28}{len(results['bs4'][1]):>6}"
+              + "".join(f"{t * 1000:>10.2f}" for t in times)
+              + f"{times[0] / times[1]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
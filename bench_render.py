@@ -0,0 +1,105 @@
+"""
+Benchmark: PDF page → PIL Image conversion in render_page.
+
+Compares the old PNG round trip (pix.tobytes("png") → Image.open → LANCZOS
+resize) with the raw-sample path, with and without rendering straight at
+max_width. Each mode runs in its own process so peak RSS is not shared.
+
+Run:  python bench_render.py [some.pdf] [--dpi 150] [--max-width 1920]
+Without a PDF a synthetic A3 notice (text + scanned-looking image) is used.
+"""
+
+import io
+import sys
+import time
+import argparse
+import resource
+import multiprocessing as mp
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+from content_processor import render_page
+
+
+MODES = ('png-roundtrip', 'raw', 'raw+fit-width')
+
+
+def _sample_pdf(pages: int = 6) -> bytes:
+    """A3 pages (wider than max_width at 150 DPI) with text and a noisy 'scan'."""
+    doc = fitz.open()
+    noise = Image.effect_noise((600, 400), 60).convert("RGB")
+    buf = io.BytesIO()
+    noise.save(buf, format="PNG")
+    for i in range(pages):
+        page = doc.new_page(width=842, height=1191)
+        for line in range(40):
+            page.insert_text((60, 60 + line * 18), f"Notice {i + 1} — line {line} of sample text", fontsize=11)
+        page.insert_image(fitz.Rect(60, 800, 780, 1150), stream=buf.getvalue())
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def _render_png_roundtrip(page, dpi: int, max_width: int) -> Image.Image:
+    """The pre-optimisation path, kept here for comparison."""
+    zoom = dpi / 72
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+    img = Image.open(io.BytesIO(pix.tobytes("png")))
+    img.load()
+    if img.width > max_width:
+        ratio = max_width / img.width
+        img = img.resize((max_width, int(img.height * ratio)), Image.Resampling.LANCZOS)
+    return img
+
+
+def _run_mode(mode: str, pdf_bytes: bytes, dpi: int, max_width: int, out):
+    base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    start = time.perf_counter()
+    for page in doc:
+        if mode == 'png-roundtrip':
+            img = _render_png_roundtrip(page, dpi, max_width)
+        else:
+            img = render_page(page, dpi, max_width, fit_width=(mode == 'raw+fit-width'))
+        img.load()
+        del img
+    elapsed = time.perf_counter() - start
+    pages = len(doc)
+    doc.close()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    out.put((mode, elapsed / pages, (peak_rss - base_rss) / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('pdf', nargs='?')
+    parser.add_argument('--dpi', type=int, default=150)
+    parser.add_argument('--max-width', type=int, default=1920)
+    args = parser.parse_args()
+
+    if args.pdf:
+        with open(args.pdf, 'rb') as f:
+            pdf_bytes = f.read()
+    else:
+        pdf_bytes = _sample_pdf()
+
+    ctx = mp.get_context('spawn')
+    results = []
+    for mode in MODES:
+        out = ctx.Queue()
+        proc = ctx.Process(target=_run_mode, args=(mode, pdf_bytes, args.dpi, args.max_width, out))
+        proc.start()
+        results.append(out.get())
+        proc.join()
+
+    baseline_t, baseline_mem = results[0][1], results[0][2]
+    print(f"{'mode':<16}{'ms/page':>10}{'peak ΔRSS MB':>15}{'time saved':>12}")
+    for mode, per_page, peak_mb in results:
+        saved = (1 - per_page / baseline_t) * 100 if baseline_t else 0
+        print(f"{mode:<16}{per_page * 1000:>10.1f}{peak_mb:>15.1f}{saved:>11.0f}%")
+    print(f"(baseline peak ΔRSS {baseline_mem:.1f} MB; dpi={args.dpi}, max_width={args.max_width})")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
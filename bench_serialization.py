@@ -0,0 +1,92 @@
+"""
+Benchmark: on-disk encodings for the state files (see serializers.py).
+
+Saves and loads a notice cache and a 100-entry log in every available format
+and reports time and size against the original indent=2 JSON ('json').
+
+Run:  python bench_serialization.py [notice_cache.json] [--notices 5000] [--repeat 5]
+Without a cache file a synthetic one with --notices records is used.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import serializers
+
+
+def _sample_cache(count: int) -> dict:
+    """Cache shaped like CacheManager's, with Bangla titles and some history."""
+    notices = {}
+    for i in range(count):
+        nid = f"{i:032x}"
+        notices[nid] = {
+            'id': nid,
+            'serial': str(i),
+            'title': f"অনার্স ১ম বর্ষের পরীক্ষার সময়সূচি সংক্রান্ত বিজ্ঞপ্তি — Notice {i}",
+            'date': '2026-10-17',
+            'download_url': f"https://www.dhakacollege.edu.bd/storage/notices/{i}.pdf",
+            'pdf_hash': f"{i * 7919:064x}",
+            'content_hash': None,
+            'file_type': 'pdf',
+            'first_seen': '2026-10-17T10:00:00',
+            'last_seen': '2026-10-17T10:15:00',
+            'history': [{'timestamp': '2026-10-17T10:15:00', 'field': 'title',
+                         'old': 'পুরাতন শিরোনাম', 'new': 'নতুন শিরোনাম'}] if i % 10 == 0 else [],
+            'was_on_page_1': i < 20,
+            'telegram_message_ids': [1000 + i, 2000 + i],
+        }
+    return {'version': 2, 'notices': notices, 'previous_page_1_ids': list(notices)[:20],
+            'dashboard_message_id': 42, 'page_validators': {}, 'integrity_check': ''}
+
+
+def _sample_log(entries: int = 100) -> list:
+    stats = {'success': True, 'new_notices': 1, 'edited': 0, 'removed': 0, 'total_notices': 300,
+             'http_timings': {'www.dhakacollege.edu.bd': {'requests': 3, 'wait_s': 0.8, 'bytes': 90000}}}
+    return [{'timestamp': '2026-10-17T10:00:00+06:00', 'stats': stats} for _ in range(entries)]
+
+
+def _measure(obj, serializer, path: str, repeat: int):
+    save_t = load_t = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        serializers.dump_file(path, obj, serializer)
+        save_t += time.perf_counter() - start
+
+        start = time.perf_counter()
+        loaded = serializers.load_file(path)
+        load_t += time.perf_counter() - start
+    assert loaded == obj
+    return save_t / repeat, load_t / repeat, os.path.getsize(path)
+
+
+def _report(label: str, obj, repeat: int, workdir: str):
+    print(f"\n{label}")
+    print(f"{'format':<14}{'save ms':>10}{'load ms':>10}{'size KB':>10}{'size':>8}")
+    baseline = None
+    for name, serializer in serializers.SERIALIZERS.items():
+        save_t, load_t, size = _measure(obj, serializer, os.path.join(workdir, name), repeat)
+        baseline = baseline or size
+        print(f"{name:<14}{save_t * 1000:>10.1f}{load_t * 1000:>10.1f}"
+              f"{size / 1024:>10.1f}{size / baseline:>7.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('cache', nargs='?')
+    parser.add_argument('--notices', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cache = serializers.load_file(args.cache) if args.cache else _sample_cache(args.notices)
+    with tempfile.TemporaryDirectory() as workdir:
+        _report(f"notice cache ({len(cache.get('notices', {}))} notices)", cache, args.repeat, workdir)
+        _report("log.json (100 runs)", _sample_log(), args.repeat, workdir)
+    if 'msgpack' not in serializers.SERIALIZERS:
+        print("\n(msgpack not installed; binary format skipped)")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 import math
 import os
 
@@ -7,6 +8,10 @@ import os
 # ---------------------------------------------------------------------------
 LOGO_PATH = "assets/logo.png"
 
+# Bump whenever the look of branded pages changes, so cached renders
+# (media_cache.py) made with the old design are not reused
+BRANDING_VERSION = 1
+
 FACEBOOK_HANDLE = "facebook.com/thedcarchive"
 TELEGRAM_HANDLE = "t.me/thedcarchive_notice"
 SOURCE_SITE = "dhakacollege.edu.bd"
@@ -26,6 +31,13 @@ WATERMARK_SPACING_Y = 290
 FONT_BOLD_PATH = "assets/fonts/Inter-Bold.ttf"
 FONT_REG_PATH = "assets/fonts/Inter-Regular.ttf"
 
+# Branding assets are cached per process: fonts and the logo are loaded once,
+# watermark layers are kept per page size (LRU-bounded, they are full-page RGBA)
+WATERMARK_CACHE_SIZE = 4
+WATERMARK_TILE_STEP = 512          # tile diagonals are rounded up to this step
+FOOTER_CACHE_SIZE = 8
+
+@lru_cache(maxsize=None)
 def _font(path, size):
     try:
         return ImageFont.truetype(path, size)
@@ -35,17 +47,14 @@ def _font(path, size):
         except OSError:
             return ImageFont.load_default()
 
-def _tiled_watermark(size):
-    """Faint repeating diagonal watermark layer, same size as the page.
-    Redesigned to feature an alternating brick pattern with a subtext."""
-    w, h = size
+@lru_cache(maxsize=2)
+def _watermark_tile(diag):
+    """Rotated square tile of the brick-pattern watermark, diag x diag pixels."""
     font_main = _font(FONT_BOLD_PATH, 48)
-    font_sub = _font(FONT_BOLD_PATH, 24)
 
-    diag = int(math.hypot(w, h))
     tile = Image.new("RGBA", (diag, diag), (0, 0, 0, 0))
     tdraw = ImageDraw.Draw(tile)
-    
+
     for row_idx, y in enumerate(range(0, diag, WATERMARK_SPACING_Y)):
         # Offset every other row for a brick-like pattern
         offset_x = (WATERMARK_SPACING_X // 2) if row_idx % 2 == 1 else 0
@@ -54,13 +63,24 @@ def _tiled_watermark(size):
             tdraw.text((x, y), WATERMARK_TEXT, font=font_main,
                        fill=WATERMARK_COLOR + (WATERMARK_OPACITY,), anchor="ma")
 
-                       
-    tile = tile.rotate(WATERMARK_ANGLE, expand=False)
+    return tile.rotate(WATERMARK_ANGLE, expand=False)
 
-    layer = Image.new("RGBA", size, (0, 0, 0, 0))
-    layer.paste(tile, (-(diag - w) // 2, -(diag - h) // 2), tile)
-    return layer
+@lru_cache(maxsize=WATERMARK_CACHE_SIZE)
+def _tiled_watermark(size):
+    """Faint repeating diagonal watermark layer, same size as the page.
+    Redesigned to feature an alternating brick pattern with a subtext.
+
+    Cut from the centre of a shared rotated tile, so pages of slightly
+    different sizes (e.g. after whitespace cropping) reuse one tile."""
+    w, h = size
+    step = WATERMARK_TILE_STEP
+    diag = -(-int(math.hypot(w, h)) // step) * step
+    tile = _watermark_tile(diag)
 
+    left, top = (diag - w) // 2, (diag - h) // 2
+    return tile.crop((left, top, left + w, top + h))
+
+@lru_cache(maxsize=1)
 def _load_logo(max_height):
     if not os.path.exists(LOGO_PATH):
         return None
@@ -74,39 +94,25 @@ def _load_logo(max_height):
     except Exception:
         return None
 
-def add_branding(page_img: Image.Image) -> Image.Image:
-    """
-    page_img: a single rendered notice page, in its original, unmodified
-              colors (do not pre-process/invert it before calling this).
-
-    Returns: original page (untouched) + faint full-page watermark,
-             with a footer bar appended below carrying logo + CTAs.
-    """
-    page_img = page_img.convert("RGBA")
-    w, h = page_img.size
-
-    # 1. Composite the faint watermark directly over the untouched original.
-    watermark = _tiled_watermark((w, h))
-    watermarked = Image.alpha_composite(page_img, watermark)
-
-    # 2. Footer bar appended below — never overlaps the notice content.
-    canvas = Image.new("RGBA", (w, h + BAR_HEIGHT), BG_COLOR + (255,))
-    canvas.paste(watermarked, (0, 0))
-    draw = ImageDraw.Draw(canvas)
+@lru_cache(maxsize=FOOTER_CACHE_SIZE)
+def _footer_bar(width):
+    """Footer bar with logo + CTAs, BAR_HEIGHT tall; identical for every page of a width."""
+    bar = Image.new("RGBA", (width, BAR_HEIGHT), BG_COLOR + (255,))
+    draw = ImageDraw.Draw(bar)
 
     logo = _load_logo(max_height=BAR_HEIGHT - 30)
     text_x = 24
     if logo:
-        canvas.paste(logo, (24, h + (BAR_HEIGHT - logo.height) // 2), logo)
+        bar.paste(logo, (24, (BAR_HEIGHT - logo.height) // 2), logo)
         text_x = 24 + logo.width + 16
 
     font_bold = _font(FONT_BOLD_PATH, 22)
     font_reg = _font(FONT_REG_PATH, 15)
 
-    draw.text((text_x, h + 18), "The DC Archive · Verified",
+    draw.text((text_x, 18), "The DC Archive · Verified",
               font=font_bold, fill=TEXT_COLOR)
     draw.text(
-        (text_x, h + 48),
+        (text_x, 48),
         f"Follow: {FACEBOOK_HANDLE}   |   Subscribe telegram chennel for instant update: {TELEGRAM_HANDLE}",
         font=font_reg, fill=SUBTEXT_COLOR,
     )
@@ -118,7 +124,29 @@ def add_branding(page_img: Image.Image) -> Image.Image:
     except AttributeError:
         text_w = font_reg.getlength(SOURCE_SITE) if hasattr(font_reg, 'getlength') else 150
 
-    draw.text((w - text_w - 24, h + 35), SOURCE_SITE,
+    draw.text((width - text_w - 24, 35), SOURCE_SITE,
               font=font_reg, fill=SUBTEXT_COLOR)
 
+    return bar
+
+def add_branding(page_img: Image.Image) -> Image.Image:
+    """
+    page_img: a single rendered notice page, in its original, unmodified
+              colors (do not pre-process/invert it before calling this).
+
+    Returns: original page (untouched) + faint full-page watermark,
+             with a footer bar appended below carrying logo + CTAs.
+    """
+    page_img = page_img.convert("RGBA")
+    w, h = page_img.size
+
+    # 1. Composite the faint watermark directly over the untouched original.
+    watermark = _tiled_watermark((w, h))
+    watermarked = Image.alpha_composite(page_img, watermark)
+
+    # 2. Footer bar appended below — never overlaps the notice content.
+    canvas = Image.new("RGBA", (w, h + BAR_HEIGHT), BG_COLOR + (255,))
+    canvas.paste(watermarked, (0, 0))
+    canvas.paste(_footer_bar(w), (0, h))
+
     return canvas.convert("RGB")
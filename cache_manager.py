@@ -3,30 +3,117 @@ Versioned Cache Manager for Dhaka College Notice Monitor
 Handles notice caching with integrity checks and page-1 tracking
 """
 
-import os
-import json
-import hashlib
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Set
 
+import os
+import json
+
+from collections.abc import Mapping
+from functools import reduce
+
+from cache_store import (CORRUPTED, JournalStore, LazyNotices, NoticeArchive, RecordDigests,
+                         corrupted_record)
+from notice_ids import content_fingerprint, disambiguated_id, notice_id as stable_notice_id
+from serializers import get_serializer
+
+
+INTEGRITY_SCHEME = 'merkle-v2'
+
+# Hot tier size: notices kept in notice_cache.json; older ones go to the archive
+HOT_SIZE = 300
+# Archive in batches so the snapshot is not rewritten on every run
+ARCHIVE_BATCH = 50
+# Per-notice edit history entries kept
+HISTORY_LIMIT = 20
+# Download URLs whose sniffed file type is remembered
+URL_TYPE_LIMIT = 2000
+# Per-notice Telegram file_ids kept (rendered pages + the PDF)
+MEDIA_FILE_ID_LIMIT = 60
+# An unchanged notice's last_seen is refreshed at most this often, so a run
+# only journals the notices that actually changed
+LAST_SEEN_REFRESH = timedelta(hours=24)
+
+
+def _seen_before(last_seen: Optional[str], cutoff: datetime) -> bool:
+    """True if last_seen (naive ISO time) is older than cutoff, or unreadable."""
+    try:
+        return datetime.fromisoformat(last_seen) < cutoff
+    except (TypeError, ValueError):
+        return True
+
+
+def _merge_records(a: Dict, b: Dict) -> Dict:
+    """
+    One record from two records of the same notice (split by an old-style
+    id change): the most recently seen wins, sent messages and history of
+    both are kept.
+    """
+    newer, older = (a, b) if (a.get('last_seen') or '') >= (b.get('last_seen') or '') else (b, a)
+    merged = dict(newer)
+    merged['first_seen'] = min(filter(None, (a.get('first_seen'), b.get('first_seen'))), default=None)
+    merged['telegram_message_ids'] = list(dict.fromkeys(
+        older.get('telegram_message_ids', []) + newer.get('telegram_message_ids', [])
+    ))
+    if older.get('text_message_ids') or newer.get('text_message_ids'):
+        merged['text_message_ids'] = list(dict.fromkeys(
+            older.get('text_message_ids', []) + newer.get('text_message_ids', [])
+        ))
+    history = sorted(older.get('history', []) + newer.get('history', []),
+                     key=lambda entry: entry.get('timestamp', ''))
+    merged['history'] = history[-HISTORY_LIMIT:]
+    merged['was_on_page_1'] = bool(a.get('was_on_page_1') or b.get('was_on_page_1'))
+    for field in ('message_edits', 'media_file_ids'):
+        if older.get(field) or newer.get(field):
+            merged[field] = {**(older.get(field) or {}), **(newer.get(field) or {})}
+    if not merged.get('removed_message_id') and older.get('removed_message_id'):
+        merged['removed_message_id'] = older['removed_message_id']
+    return merged
+
+
+def _edit_chains(members: List) -> List[List]:
+    """
+    Split (old id, tier, record) entries sharing a stable id into edit
+    chains, oldest chain first. A record seen only after another was last
+    seen continues that record's chain (an edit); records seen at the same
+    time were separate rows linking the same file.
+    """
+    chains: List[List] = []
+    for member in sorted(members, key=lambda m: m[2].get('first_seen') or ''):
+        first_seen = member[2].get('first_seen') or ''
+        for chain in chains:
+            if (chain[-1][2].get('last_seen') or '') <= first_seen:
+                chain.append(member)
+                break
+        else:
+            chains.append([member])
+    return chains
+
 
 class CacheManager:
-    def __init__(self, cache_file: str = 'notice_cache.json'):
+    def __init__(self, cache_file: str = 'notice_cache.json', state_format: Optional[str] = None,
+                 hot_size: int = HOT_SIZE):
         self.cache_file = cache_file
-        self.current_version = 2
-    
-    def _compute_integrity_hash(self, data: Dict) -> str:
-        """Compute SHA-256 hash of cache data for integrity check"""
-        # Remove fields that change on every save
-        data_copy = {k: v for k, v in data.items() if k not in ['integrity_check', 'last_check']}
-        data_str = json.dumps(data_copy, sort_keys=True, ensure_ascii=False)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+        self.current_version = 4
+        # Snapshot + append-only journal; a save only writes the notices touched this run.
+        # state_format picks the snapshot encoding (see serializers.py); loads auto-detect.
+        serializer = get_serializer(state_format)
+        self.store = JournalStore(cache_file, serializer=serializer)
+        # Cold tier, read only when a non-hot notice is needed
+        self.archive = NoticeArchive(os.path.splitext(cache_file)[0] + '_archive.json', serializer)
+        self.hot_size = hot_size
+        self._dirty_ids: Set[str] = set()
+        self._full_save = True   # next save must write a whole snapshot
+        self._restored_ids: Set[str] = set()   # back in the hot set, still in the archive file
+        # Per-record digests + Merkle-style root; see verify_records()
+        self.digests = RecordDigests()
+        self.corrupted_ids: List[str] = []
     
     def _create_empty_cache(self) -> Dict:
         """Create a new empty cache structure"""
         return {
             "version": self.current_version,
-            "notices": {},
+            "notices": LazyNotices(),
             "previous_page_1_ids": [],
             "dashboard_message_id": None,
             "uptime_streak": 0,
@@ -35,28 +122,48 @@ class CacheManager:
             "last_run_date": "",
             "total_new_notices": 0,
             "last_check": None,
-            "integrity_check": ""
+            "page_validators": {},
+            "archived_count": 0,
+            "integrity_check": "",
+            "integrity_scheme": INTEGRITY_SCHEME
         }
     
     def load_cache(self) -> Dict:
         """Load cache from file, with integrity verification and migration"""
+        self._dirty_ids = set()
+        self._full_save = True
+        self._restored_ids = set()
+        self.digests = RecordDigests()
+        self.corrupted_ids = []
+        self.archive.reset()
         try:
-            if not os.path.exists(self.cache_file):
+            if not self.store.exists():
                 print("📦 Creating new cache file")
                 return self._create_empty_cache()
             
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = self.store.load()
             
-            # Migrate from v1 to v2 if needed (this handles schema changes)
+            # Migrate older layouts (v1 list, v2 untiered, v3 content-hash ids) if needed
             if data.get('version', 1) < self.current_version:
                 print(f"📦 Migrating cache from v{data.get('version', 1)} to v{self.current_version}")
                 data = self._migrate_cache(data)
+            else:
+                # A snapshot in the pre-lazy layout is rewritten once
+                self._full_save = self.store.legacy_layout
             
             # Ensure all required fields exist
             if 'uptime_streak' not in data:
                 data['uptime_streak'] = 0
             
+            # Digest tree from the stored digests; record text is checked as it is parsed
+            self.verify_records(data, full=False)
+            if isinstance(data.get('notices'), LazyNotices):
+                data['notices'].on_parse = self._check_on_parse
+            # Last run's page 1 is read by every run: check those records in full now
+            # (the scraped ones are checked by check_notices once they are known)
+            for notice_id in data.get('previous_page_1_ids', []):
+                data['notices'].get(notice_id)
+            
             print(f"✅ Cache loaded: {len(data.get('notices', {}))} notices")
             return data
         
@@ -84,37 +191,338 @@ class CacheManager:
                         'was_on_page_1': True,
                         'telegram_message_ids': []
                     }
-        # Handle v2 format (dict of notices)
-        elif isinstance(old_data.get('notices'), dict):
-            new_cache['notices'] = old_data['notices']
+            # Preserve other fields
+            if 'dashboard_message_id' in old_data:
+                new_cache['dashboard_message_id'] = old_data['dashboard_message_id']
         
-        # Preserve other fields
-        if 'dashboard_message_id' in old_data:
-            new_cache['dashboard_message_id'] = old_data['dashboard_message_id']
+        # Handle v2/v3 format (dict of notices): keep every field; the
+        # first save moves a v2 cache's overflow into the archive
+        elif isinstance(old_data.get('notices'), Mapping):
+            new_cache.update(old_data)
+            new_cache['version'] = self.current_version
+
+        # v4: notices keyed by stable ids (download URL) instead of a hash of
+        # title + date + URL
+        if old_data.get('version', 1) < 4:
+            self._rekey_notices(new_cache)
         
         return new_cache
+
+    def _rekey_notices(self, data: Dict):
+        """
+        Re-key hot and archived records to stable ids. Records that were
+        split by a title/date edit (old ids differing, same download URL, one
+        seen after the other) are merged into one; rows that were on the page
+        at the same time stay separate, and all but the oldest get
+        disambiguated ids as the scraper gives them. previous_page_1_ids is
+        remapped.
+        """
+        groups: Dict[str, List] = {}
+        for tier, records in (('hot', data.get('notices', {})),
+                              ('archive', self.archive.notices() if self.archive.exists() else {})):
+            for old_id, record in list(records.items()):
+                base_id = stable_notice_id(record.get('download_url'), record.get('title', ''),
+                                           record.get('date', ''))
+                groups.setdefault(base_id, []).append((old_id, tier, record))
+
+        mapping: Dict[str, str] = {}
+        hot: Dict[str, Dict] = {}
+        archived: Dict[str, Dict] = {}
+        for base_id, members in groups.items():
+            for i, chain in enumerate(_edit_chains(members)):
+                record = reduce(_merge_records, [r for _, _, r in chain])
+                new_id = base_id if i == 0 else disambiguated_id(
+                    base_id, content_fingerprint(record.get('title', ''), record.get('date', '')))
+                record['id'] = new_id
+                for old_id, _, _ in chain:
+                    mapping[old_id] = new_id
+                tier = hot if any(t == 'hot' for _, t, _ in chain) else archived
+                tier[new_id] = record
+
+        if self.archive.exists():
+            for record in archived.values():
+                record[RecordDigests.DIGEST_FIELD] = RecordDigests.digest(record)
+            self.archive.replace(archived)
+            data['archived_count'] = len(archived)
+
+        for nid, record in hot.items():
+            record[RecordDigests.DIGEST_FIELD] = RecordDigests.digest(record)
+            self.mark_dirty(nid)
+        data['notices'] = LazyNotices(hot)
+        data['previous_page_1_ids'] = list(dict.fromkeys(
+            mapping.get(nid, nid) for nid in data.get('previous_page_1_ids', [])
+        ))
+        # The old root covers the old ids; the next save writes a new one
+        data.pop('integrity_scheme', None)
+        merged = len(mapping) - len(set(mapping.values()))
+        print(f"🔑 Re-keyed {len(mapping)} notices to stable ids ({merged} merged)")
+    
+    def verify_records(self, data: Dict, full: bool = True) -> List[str]:
+        """
+        Check every record against its stored digest and rebuild the digest
+        tree. Returns (and adds to corrupted_ids) the ids whose content no
+        longer matches; each is replaced by its newest intact copy if one is
+        left (see _recover), else kept as it is, and re-signed on the next save.
+        With full=False, records not parsed yet only contribute their stored
+        digest; their text is checked when they are parsed (or scrubbed).
+        """
+        notices = data.get('notices', {})
+        lazy = isinstance(notices, LazyNotices)
+        corrupted, unsigned = [], 0
+        
+        for notice_id in list(notices.keys()):
+            raw = notices.raw(notice_id) if lazy else None
+            if raw is not None:
+                # Not parsed yet: a matching digest of the stored text is enough
+                if full:
+                    stored, text = RecordDigests.split_signed(raw)
+                    intact = stored is not None and stored == RecordDigests.digest_text(text)
+                else:
+                    stored = RecordDigests.signed_digest(raw)
+                    intact = stored is not None
+                if intact:
+                    self.digests.set(notice_id, stored)
+                    continue
+            
+            record = notices.get(notice_id)
+            if not isinstance(record, dict):
+                # Nothing usable left in the record: keep the id, marked corrupted
+                notices[notice_id] = corrupted_record(notice_id)
+                corrupted.append(notice_id)
+                self.mark_dirty(notice_id)
+                continue
+            
+            stored = record.get(RecordDigests.DIGEST_FIELD)
+            if stored is None:
+                unsigned += 1          # written before per-record digests
+            elif stored != RecordDigests.digest(record):
+                corrupted.append(notice_id)
+                recovered = self._recover(notice_id)
+                if recovered is not None:
+                    print(f"🩹 Notice {notice_id} restored from an intact earlier copy")
+                    notices[notice_id] = recovered
+            else:
+                self.digests.set(notice_id, stored)
+                continue
+            self.mark_dirty(notice_id)
+        
+        if unsigned:
+            print(f"🔏 Signing {unsigned} cached notices without a digest")
+            self._full_save = True
+        if corrupted:
+            print(f"⚠️ Cache integrity: {len(corrupted)} corrupted notice(s): {', '.join(corrupted)}")
+            self.corrupted_ids.extend(corrupted)
+        elif (not unsigned and data.get('integrity_scheme') == INTEGRITY_SCHEME
+                and data.get('integrity_check') != self.digests.root()):
+            # Digests disagree with the stored root: records added, dropped or altered by hand
+            print("⚠️ Cache integrity: root hash mismatch (cache edited outside the cache manager)")
+        
+        return corrupted
     
+    def _scrub(self, notices: LazyNotices):
+        """Verify every unparsed record; corrupted ones are parsed (reported) and re-signed."""
+        for notice_id in list(notices.keys()):
+            raw = notices.raw(notice_id)
+            if raw is None:
+                continue
+            stored, text = RecordDigests.split_signed(raw)
+            if stored is not None and stored == RecordDigests.digest_text(text):
+                continue
+            record = notices[notice_id]
+            record[RecordDigests.DIGEST_FIELD] = RecordDigests.digest(record)
+            self.digests.set(notice_id, record[RecordDigests.DIGEST_FIELD])
+    
+    def check_notices(self, scraped: List[Dict], cache_data: Dict) -> List[str]:
+        """
+        Read (and so verify, see _check_on_parse) the hot records of the
+        scraped notices before change detection looks at them; last run's
+        page 1 was checked by load_cache. A scraped notice whose record could
+        not be read or recovered is re-created from the scrape, so it is not
+        reported as NEW or EDITED; its sent message ids are lost. Returns the
+        ids re-created that way.
+        """
+        notices = cache_data.get('notices', {})
+        previous = set(cache_data.get('previous_page_1_ids', []))
+        recreated = []
+        for notice in scraped:
+            record = notices.get(notice['id'])
+            if record is None or record.get('status') != CORRUPTED:
+                continue
+            del notices[notice['id']]
+            self.update_notice(notice, cache_data, was_on_page_1=notice['id'] in previous)
+            recreated.append(notice['id'])
+        if recreated:
+            print(f"🩹 Re-created {len(recreated)} unreadable notice(s) from this scrape: {', '.join(recreated)}")
+        return recreated
+    
+    def notice_fingerprint(self, notice_id: str, cache_data: Dict) -> Optional[str]:
+        """Title/date fingerprint of a hot notice's record, or None if it has no readable one."""
+        record = cache_data.get('notices', {}).get(notice_id)
+        if record is None or record.get('status') == CORRUPTED:
+            return None
+        return content_fingerprint(record.get('title', ''), record.get('date', ''))
+    
+    def _check_on_parse(self, notice_id: str, text: bytes) -> Optional[Dict]:
+        """
+        LazyNotices hook: verify a record's text the first time it is read.
+        A damaged record is replaced by its newest intact copy (journal,
+        snapshot or archive); without one it is kept as it parses, or as a
+        corrupted_record() placeholder. Either way it stays listed,
+        reported in corrupted_ids, and is rewritten by the next save.
+        """
+        stored, canonical = RecordDigests.split_signed(text)
+        if stored is None or stored == RecordDigests.digest_text(canonical):
+            return None
+        print(f"⚠️ Cache integrity: notice {notice_id} corrupted")
+        self.corrupted_ids.append(notice_id)
+        self.mark_dirty(notice_id)
+        self._full_save = True   # the damaged line must not survive in the snapshot
+        
+        record = self._recover(notice_id)
+        if record is not None:
+            print(f"🩹 Notice {notice_id} restored from an intact earlier copy")
+            return record
+        try:
+            return json.loads(text)
+        except ValueError:
+            print(f"⚠️ Cache integrity: notice {notice_id} unreadable, kept as corrupted")
+            return corrupted_record(notice_id)
+    
+    def _recover(self, notice_id: str) -> Optional[Dict]:
+        """Newest copy of a record whose digest still matches, or None."""
+        for text in self.store.record_copies(notice_id):
+            stored, canonical = RecordDigests.split_signed(text)
+            if stored is not None and stored == RecordDigests.digest_text(canonical):
+                return json.loads(text)
+        record = self.archive.get(notice_id)
+        if record and record.get(RecordDigests.DIGEST_FIELD) == RecordDigests.digest(record):
+            return record
+        return None
+    
+    def mark_dirty(self, notice_id: str):
+        """Flag a notice record as changed so the next save writes it."""
+        self._dirty_ids.add(notice_id)
+
     def save_cache(self, data: Dict) -> bool:
-        """Save cache to file with integrity hash"""
+        """
+        Save cache: normally one journal line with the top-level fields and the
+        notices touched this run; a full snapshot after a migration, on first
+        save, or when the journal is due for compaction. Touched records get a
+        fresh digest and the integrity root is updated from those alone.
+        """
         try:
-            # Update integrity check
-            data['integrity_check'] = self._compute_integrity_hash(data)
             data['version'] = self.current_version
             data['last_check'] = datetime.now(timezone(timedelta(hours=6))).isoformat()
+            notices = data.get('notices', {})
+            
+            # Re-sign only the records touched since the last save
+            for notice_id in self._dirty_ids:
+                record = notices.get(notice_id)
+                if record is None:
+                    self.digests.discard(notice_id)
+                    continue
+                record[RecordDigests.DIGEST_FIELD] = RecordDigests.digest(record)
+                self.digests.set(notice_id, record[RecordDigests.DIGEST_FIELD])
+            self._archive_cold_notices(data)
+            
+            full = self._full_save or self.store.needs_compaction()
+            if full and isinstance(notices, LazyNotices):
+                # Unparsed records are copied into the snapshot verbatim: check them first
+                self._scrub(notices)
             
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            data['integrity_scheme'] = INTEGRITY_SCHEME
+            data['integrity_check'] = self.digests.root()
             
-            print(f"✅ Cache saved: {len(data.get('notices', {}))} notices")
+            if full:
+                self.store.write_snapshot(data)
+                print(f"✅ Cache saved: {len(notices)} notices (full snapshot)")
+            else:
+                meta = {k: v for k, v in data.items() if k != 'notices'}
+                touched = {nid: notices[nid] for nid in self._dirty_ids if nid in notices}
+                self.store.append(meta, touched)
+                print(f"✅ Cache saved: {len(notices)} notices ({len(touched)} journaled)")
+            
+            if self._restored_ids:
+                self.archive.remove(self._restored_ids)
+                self._restored_ids = set()
+            
+            self._dirty_ids = set()
+            self._full_save = False
             return True
         
         except Exception as e:
             print(f"❌ Error saving cache: {e}")
             return False
     
+    # ── Hot / cold tiers ──────────────────────────────────────────────────────
+    
+    def _archive_cold_notices(self, data: Dict) -> int:
+        """
+        Once the hot set outgrows hot_size by ARCHIVE_BATCH, move notices to the
+        archive: removed ones first, then the least recently seen. Notices that
+        were on page 1 last run always stay hot.
+        """
+        notices = data.get('notices', {})
+        if len(notices) <= self.hot_size + ARCHIVE_BATCH:
+            return 0
+        
+        protected = set(data.get('previous_page_1_ids', []))
+        candidates = sorted(
+            (nid for nid in notices if nid not in protected),
+            key=lambda nid: (notices[nid].get('status') != 'removed', notices[nid].get('last_seen') or ''),
+        )
+        cold_ids = candidates[:len(notices) - self.hot_size]
+        
+        self.archive.add({nid: notices[nid] for nid in cold_ids})
+        self._restored_ids.difference_update(cold_ids)
+        for nid in cold_ids:
+            del notices[nid]
+            self.digests.discard(nid)
+        data['archived_count'] = self._archived_count()
+        self._full_save = True   # the journal can't express removals
+        print(f"🗄️ Archived {len(cold_ids)} notices ({len(notices)} hot, {data['archived_count']} archived)")
+        return len(cold_ids)
+    
+    def _archived_count(self) -> int:
+        """Notices only in the archive (restored ones are counted as hot)."""
+        return len(self.archive.notices()) - len(self._restored_ids)
+    
+    def restore_archived(self, notice_ids, cache_data: Dict) -> int:
+        """
+        Bring archived notices among notice_ids back into the hot set, so a
+        notice that reappears is not mistaken for a new one. Restored records
+        leave the archive, so each notice lives in exactly one tier. The
+        archive is only read if some id is unknown to the hot set.
+        """
+        notices = cache_data.get('notices', {})
+        missing = [nid for nid in notice_ids if nid not in notices]
+        if not missing or not self.archive.exists():
+            return 0
+        
+        restored = []
+        for nid in missing:
+            record = self.archive.get(nid)
+            if record is None:
+                continue
+            stored = record.get(RecordDigests.DIGEST_FIELD)
+            if stored and stored != RecordDigests.digest(record):
+                print(f"⚠️ Cache integrity: archived notice {nid} corrupted")
+            notices[nid] = record
+            self.mark_dirty(nid)
+            restored.append(nid)
+        if restored:
+            # Dropped from the archive once save_cache has written the hot copies
+            self._restored_ids.update(restored)
+            cache_data['archived_count'] = self._archived_count()
+            print(f"🗄️ Restored {len(restored)} notices from the archive")
+        return len(restored)
+    
     def get_notice(self, notice_id: str, cache_data: Dict) -> Optional[Dict]:
-        """Get a specific notice from cache"""
-        return cache_data.get('notices', {}).get(notice_id)
+        """Get a specific notice from cache (hot set first, then the archive)"""
+        notice = cache_data.get('notices', {}).get(notice_id)
+        if notice is None:
+            notice = self.archive.get(notice_id)
+        return notice
     
     def update_notice(self, notice: Dict, cache_data: Dict, 
                       pdf_hash: Optional[str] = None, 
@@ -125,8 +533,10 @@ class CacheManager:
         notices = cache_data.get('notices', {})
         
         if notice_id in notices:
-            # Update existing notice
+            # Update existing notice; journaled only if something changed
             cached = notices[notice_id]
+            before = dict(cached)
+            now = datetime.now()
             
             # Track history for changes
             history_entry = None
@@ -146,15 +556,22 @@ class CacheManager:
                 }
             
             if history_entry:
-                cached.setdefault('history', []).append(history_entry)
+                history = cached.setdefault('history', [])
+                history.append(history_entry)
+                del history[:-HISTORY_LIMIT]
             
             # Update fields
             cached['title'] = notice['title']
             cached['date'] = notice['date']
             cached['serial'] = notice['serial']
             cached['download_url'] = notice['download_url']
-            cached['last_seen'] = datetime.now().isoformat()
+            if _seen_before(cached.get('last_seen'), now - LAST_SEEN_REFRESH):
+                cached['last_seen'] = now.isoformat()
             cached['was_on_page_1'] = was_on_page_1
+            # Listed again: no longer removed
+            if cached.get('status') == 'removed':
+                del cached['status']
+                cached.pop('removed_at', None)
             
             if pdf_hash:
                 cached['pdf_hash'] = pdf_hash
@@ -162,6 +579,8 @@ class CacheManager:
                 cached['file_type'] = file_type
             
             notices[notice_id] = cached
+            if history_entry or cached != before:
+                self.mark_dirty(notice_id)
         else:
             # Add new notice
             notices[notice_id] = {
@@ -179,6 +598,7 @@ class CacheManager:
                 'was_on_page_1': was_on_page_1,
                 'telegram_message_ids': []
             }
+            self.mark_dirty(notice_id)
         
         cache_data['notices'] = notices
         return cache_data
@@ -192,6 +612,34 @@ class CacheManager:
         """Get the previous page 1 notice IDs as a set"""
         return set(cache_data.get('previous_page_1_ids', []))
     
+    def set_page_validators(self, validators: Dict[str, Dict], cache_data: Dict) -> Dict:
+        """Store per-page ETag / Last-Modified / body hash for conditional fetches"""
+        cache_data['page_validators'] = validators
+        return cache_data
+
+    def get_page_validators(self, cache_data: Dict) -> Dict[str, Dict]:
+        """Get per-page conditional-fetch validators from the last run"""
+        return dict(cache_data.get('page_validators', {}))
+
+    def set_table_layouts(self, layouts: Dict[str, Dict], cache_data: Dict) -> Dict:
+        """Store the scraper's learned notice-table paths (per layout fingerprint)"""
+        cache_data['table_layouts'] = layouts
+        return cache_data
+
+    def get_table_layouts(self, cache_data: Dict) -> Dict[str, Dict]:
+        """Learned notice-table paths keyed by page layout fingerprint"""
+        return dict(cache_data.get('table_layouts', {}))
+
+    def set_url_file_types(self, url_types: Dict[str, str], cache_data: Dict) -> Dict:
+        """Store file types sniffed from downloads, newest last, capped ('unknown' is never kept)"""
+        known = [(url, t) for url, t in url_types.items() if t and t != 'unknown']
+        cache_data['url_file_types'] = dict(known[-URL_TYPE_LIMIT:])
+        return cache_data
+
+    def get_url_file_types(self, cache_data: Dict) -> Dict[str, str]:
+        """Download URL → sniffed file type ('pdf' or 'image')"""
+        return {url: t for url, t in cache_data.get('url_file_types', {}).items() if t and t != 'unknown'}
+
     def set_dashboard_message_id(self, message_id: int, cache_data: Dict) -> Dict:
         """Store the dashboard message ID"""
         cache_data['dashboard_message_id'] = message_id
@@ -210,6 +658,7 @@ class CacheManager:
         if notice_id in cache_data.get('notices', {}):
             cache_data['notices'][notice_id]['status'] = 'removed'
             cache_data['notices'][notice_id]['removed_at'] = datetime.now().isoformat()
+            self.mark_dirty(notice_id)
         return cache_data
     
     def increment_uptime_streak(self, cache_data: Dict) -> Dict:
@@ -237,14 +686,49 @@ class CacheManager:
         cache_data['total_new_notices'] = cache_data.get('total_new_notices', 0) + count
         return cache_data
 
-    def append_telegram_message_ids(self, notice_id: str, message_ids: List[int], cache_data: Dict) -> Dict:
-        """Append sent Telegram message IDs to a notice's record"""
+    def append_telegram_message_ids(self, notice_id: str, message_ids: List[int], cache_data: Dict,
+                                    text_ids: Optional[List[int]] = None) -> Dict:
+        """Append sent Telegram message IDs to a notice's record; text_ids are the ones sent as text"""
         notice = cache_data.get('notices', {}).get(notice_id)
         if notice is not None:
             existing = notice.get('telegram_message_ids', [])
             existing.extend(message_ids)
             notice['telegram_message_ids'] = existing
+            if text_ids:
+                notice['text_message_ids'] = notice.get('text_message_ids', []) + list(text_ids)
+            cache_data['notices'][notice_id] = notice
+            self.mark_dirty(notice_id)
+        return cache_data
+
+    def get_media_file_ids(self, notice_id: str, cache_data: Dict) -> Dict[str, str]:
+        """Copy of a notice's media hash → Telegram file_id map (hot set or archive)"""
+        notice = self.get_notice(notice_id, cache_data) or {}
+        return dict(notice.get('media_file_ids') or {})
+
+    def set_media_file_ids(self, notice_id: str, file_ids: Dict[str, str], cache_data: Dict) -> Dict:
+        """Store Telegram file_ids for a notice's media, newest last, capped"""
+        notice = cache_data.get('notices', {}).get(notice_id)
+        if notice is not None and file_ids != notice.get('media_file_ids'):
+            items = list(file_ids.items())[-MEDIA_FILE_ID_LIMIT:]
+            notice['media_file_ids'] = dict(items)
+            cache_data['notices'][notice_id] = notice
+            self.mark_dirty(notice_id)
+        return cache_data
+
+    def get_message_edits(self, notice_id: str, cache_data: Dict) -> Dict[str, str]:
+        """Copy of a notice's message ID → label edit status map (hot set or archive)"""
+        notice = self.get_notice(notice_id, cache_data) or {}
+        return dict(notice.get('message_edits') or {})
+
+    def set_message_edits(self, notice_id: str, statuses: Dict[int, str], cache_data: Dict) -> Dict:
+        """Record the outcome of label edits on a notice's sent messages"""
+        notice = cache_data.get('notices', {}).get(notice_id)
+        if notice is not None and statuses:
+            edits = notice.get('message_edits') or {}
+            edits.update({str(msg_id): status for msg_id, status in statuses.items()})
+            notice['message_edits'] = edits
             cache_data['notices'][notice_id] = notice
+            self.mark_dirty(notice_id)
         return cache_data
 
     def set_removed_message_id(self, notice_id: str, message_id: int, cache_data: Dict) -> Dict:
@@ -253,6 +737,7 @@ class CacheManager:
         if notice is not None:
             notice['removed_message_id'] = message_id
             cache_data['notices'][notice_id] = notice
+            self.mark_dirty(notice_id)
         return cache_data
 
 
@@ -0,0 +1,462 @@
+"""
+Cache Store for Dhaka College Notice Monitor
+Journaled, append-only storage backend behind CacheManager
+"""
+
+import os
+import json
+import zlib
+import hashlib
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import serializers
+
+
+class JournalStore:
+    """
+    Notice cache on disk as a snapshot plus an append-only journal.
+
+      notice_cache.json     full cache, one notice per line (dump_notice_file), in the
+                            serializer's encoding; any supported one is read back
+      notice_cache.journal  one entry per save, in the snapshot's line layout:
+                                {"meta":{...},"notices":{
+                                "<id>":{record},
+                                ...
+                                }}
+                            holding only the records touched in that run
+
+    A save appends one entry, so its cost depends on what changed, not on how
+    many notices the archive holds. Loading replays the journal over the
+    snapshot the way the snapshot itself is read: each record line is only
+    indexed, and parsed when the record is first used. Every compact_every
+    saves the two are folded into a fresh snapshot and the journal starts
+    empty again.
+    """
+
+    def __init__(self, snapshot_file: str, journal_file: Optional[str] = None,
+                 compact_every: int = 96, serializer=None):
+        self.snapshot_file = snapshot_file
+        self.serializer    = serializer or serializers.get_serializer()
+        self.journal_file  = journal_file or os.path.splitext(snapshot_file)[0] + '.journal'
+        self.compact_every = compact_every
+        self.journal_entries = 0
+        self.journal_damaged = False
+        self.legacy_layout = False
+
+    def exists(self) -> bool:
+        return os.path.exists(self.snapshot_file) or os.path.exists(self.journal_file)
+
+    # ── Load ──────────────────────────────────────────────────────────────────
+
+    def load(self) -> Dict:
+        """Snapshot with the journal replayed on top. Raises if the snapshot is unreadable."""
+        data: Dict = {}
+        if os.path.exists(self.snapshot_file):
+            data, lazy = load_notice_file(self.snapshot_file)
+            self.legacy_layout = not lazy
+
+        self.journal_entries = 0
+        self.journal_damaged = False
+        notices = data.get('notices')
+        for meta, records in self._journal_entries():
+            data.update(meta)
+            if records:
+                if not isinstance(notices, LazyNotices):
+                    notices = data['notices'] = LazyNotices(notices)
+                notices.update_raw(records)
+            self.journal_entries += 1
+
+        return data
+
+    def _journal_entries(self) -> Iterator[Tuple[Dict, Dict[str, bytes]]]:
+        """
+        Complete journal entries in order, as (meta, {id: record text}).
+        Record lines are indexed, not parsed. An entry cut short by an
+        interrupted save ends the journal (journal_damaged is set); everything
+        before it is good. One-line entries from older saves are read too.
+        """
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, 'rb') as f:
+            meta, records = None, {}
+            for line_no, line in enumerate(f, 1):
+                line = line.rstrip(b'\n')
+                if meta is not None:
+                    if line == b'}}':
+                        yield meta, records
+                        meta, records = None, {}
+                    elif line.startswith(b'"'):
+                        notice_id, text = split_record_line(line)
+                        records[notice_id] = text
+                    else:
+                        break
+                    continue
+                if not line.strip():
+                    continue
+                try:
+                    if line.endswith(_NOTICES_OPEN):
+                        meta = json.loads(line[:-len(_NOTICES_OPEN)].rstrip(b',') + b'}').get('meta', {})
+                        continue
+                    entry = json.loads(line)
+                except ValueError:
+                    break
+                yield entry.get('meta', {}), {nid: RecordDigests.signed_text(record)
+                                              for nid, record in (entry.get('notices') or {}).items()
+                                              if isinstance(record, dict)}
+            else:
+                if meta is None:
+                    return
+        # Torn write from an interrupted save
+        print(f"⚠️ Cache journal damaged at line {line_no}, ignoring the rest")
+        self.journal_damaged = True
+
+    def record_copies(self, notice_id: str) -> List[bytes]:
+        """
+        Every stored copy of one record as signed text, newest first: the
+        journal entries that touched it, then the snapshot's line. Reads the
+        files again, so it is only meant for recovering a damaged record.
+        """
+        copies = [records[notice_id] for _, records in self._journal_entries() if notice_id in records]
+        copies.reverse()
+        if os.path.exists(self.snapshot_file):
+            notices = load_notice_file(self.snapshot_file)[0].get('notices', {})
+            if notice_id in notices:
+                raw = notices.raw(notice_id)
+                copies.append(raw if raw is not None else RecordDigests.signed_text(notices[notice_id]))
+        return copies
+
+    # ── Save ──────────────────────────────────────────────────────────────────
+
+    def needs_compaction(self) -> bool:
+        return (self.journal_damaged
+                or not os.path.exists(self.snapshot_file)
+                or self.journal_entries >= self.compact_every)
+
+    def append(self, meta: Dict, notices: Dict[str, Dict]):
+        """Journal one save: the top-level fields plus the touched notice records."""
+        head = b'{"meta":' + json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode() \
+            + b',' + _NOTICES_OPEN
+        lines = [head] + [record_line(nid, RecordDigests.signed_text(record))
+                          for nid, record in notices.items()] + [b'}}']
+        with open(self.journal_file, 'ab') as f:
+            f.write(b'\n'.join(lines) + b'\n')
+        self.journal_entries += 1
+
+    def write_snapshot(self, data: Dict):
+        """Write the full cache as a new snapshot and empty the journal."""
+        dump_notice_file(self.snapshot_file, data, self.serializer)
+
+        # Truncate rather than delete, so the state commit always finds the file
+        open(self.journal_file, 'w', encoding='utf-8').close()
+        self.journal_entries = 0
+        self.journal_damaged = False
+
+
+class RecordDigests:
+    """
+    Per-notice sha256 digests folded into a two-level Merkle-style root.
+
+    Each record carries its own digest under DIGEST_FIELD. Notice ids are
+    spread over BUCKETS buckets; a bucket hash covers its members' digests and
+    the root covers the bucket hashes. Changing one record only rehashes that
+    record and its bucket, and a mismatch on load names the exact record.
+    """
+
+    DIGEST_FIELD = '_digest'
+    _SIGNED_PREFIX = ('{"' + DIGEST_FIELD + '":"').encode()
+    BUCKETS = 256
+
+    def __init__(self):
+        self._members: List[Dict[str, str]] = [{} for _ in range(self.BUCKETS)]
+        self._bucket_hashes: List[Optional[str]] = [None] * self.BUCKETS
+
+    @classmethod
+    def canonical(cls, record: Dict) -> str:
+        """Canonical JSON text of a record, its own digest field excluded."""
+        body = {k: v for k, v in record.items() if k != cls.DIGEST_FIELD}
+        return json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+
+    @staticmethod
+    def digest_text(text) -> str:
+        """sha256 of canonical text (str or utf-8 bytes)."""
+        return hashlib.sha256(text.encode() if isinstance(text, str) else text).hexdigest()
+
+    @classmethod
+    def digest(cls, record: Dict) -> str:
+        """Digest of a record's content (its own digest field excluded)."""
+        return cls.digest_text(cls.canonical(record))
+
+    @classmethod
+    def signed_text(cls, record: Dict) -> bytes:
+        """Canonical utf-8 text with the stored digest (if any) spliced in as the first key."""
+        text = cls.canonical(record).encode()
+        digest = record.get(cls.DIGEST_FIELD)
+        if not digest:
+            return text
+        return cls._SIGNED_PREFIX + digest.encode() + b'"' + (b',' + text[1:] if text != b'{}' else b'}')
+
+    @classmethod
+    def signed_digest(cls, raw: bytes) -> Optional[str]:
+        """Stored digest at the start of a signed_text, without parsing it."""
+        prefix = cls._SIGNED_PREFIX
+        if not raw.startswith(prefix):
+            return None
+        return raw[len(prefix):raw.find(b'"', len(prefix))].decode('ascii', 'replace')
+
+    @classmethod
+    def split_signed(cls, raw: bytes) -> Tuple[Optional[str], bytes]:
+        """(stored digest, canonical text) of a signed_text; (None, raw) if unsigned."""
+        digest = cls.signed_digest(raw)
+        if digest is None:
+            return None, raw
+        rest = raw[raw.find(b'"', len(cls._SIGNED_PREFIX)) + 1:]
+        return digest, (b'{' + rest[1:] if rest.startswith(b',') else b'{}')
+
+    @classmethod
+    def _bucket(cls, notice_id: str) -> int:
+        return zlib.crc32(notice_id.encode()) % cls.BUCKETS
+
+    def set(self, notice_id: str, digest: str):
+        bucket = self._bucket(notice_id)
+        if self._members[bucket].get(notice_id) != digest:
+            self._members[bucket][notice_id] = digest
+            self._bucket_hashes[bucket] = None
+
+    def discard(self, notice_id: str):
+        bucket = self._bucket(notice_id)
+        if self._members[bucket].pop(notice_id, None) is not None:
+            self._bucket_hashes[bucket] = None
+
+    def root(self) -> str:
+        """Root hash; only buckets changed since the last call are rehashed."""
+        for bucket, members in enumerate(self._members):
+            if self._bucket_hashes[bucket] is None:
+                h = hashlib.sha256()
+                for notice_id in sorted(members):
+                    h.update(f"{notice_id}:{members[notice_id]};".encode())
+                self._bucket_hashes[bucket] = h.hexdigest()
+        return hashlib.sha256("".join(self._bucket_hashes).encode()).hexdigest()
+
+
+class NoticeArchive:
+    """
+    Cold tier of the notice cache: records moved out of the hot cache file.
+
+    The archive is a single file (same serializers as the snapshot) that is
+    only read when something asks for a record that is not hot, e.g. an old
+    notice's Telegram message ids, and only rewritten when more notices are
+    archived.
+    """
+
+    def __init__(self, archive_file: str, serializer=None):
+        self.archive_file = archive_file
+        self.serializer   = serializer or serializers.get_serializer()
+        self._notices: Optional[Dict[str, Dict]] = None
+
+    def exists(self) -> bool:
+        return os.path.exists(self.archive_file)
+
+    def reset(self):
+        """Forget the in-memory copy; the next access reads the file again."""
+        self._notices = None
+
+    def notices(self) -> 'LazyNotices':
+        if self._notices is None:
+            self._notices = LazyNotices()
+            if self.exists():
+                self._notices = load_notice_file(self.archive_file)[0]['notices']
+                print(f"🗄️ Archive loaded: {len(self._notices)} notices")
+        return self._notices
+
+    def get(self, notice_id: str) -> Optional[Dict]:
+        if self._notices is None and not self.exists():
+            return None
+        return self.notices().get(notice_id)
+
+    def add(self, records: Dict[str, Dict]):
+        """Move records into the archive and rewrite it."""
+        if not records:
+            return
+        notices = self.notices()
+        notices.update(records)
+        dump_notice_file(self.archive_file, {'version': 1, 'notices': notices}, self.serializer)
+
+    def remove(self, notice_ids) -> int:
+        """Drop records (e.g. restored to the hot set) and rewrite the archive if any went."""
+        notices = self.notices()
+        gone = [nid for nid in notice_ids if nid in notices]
+        for nid in gone:
+            del notices[nid]
+        if gone:
+            dump_notice_file(self.archive_file, {'version': 1, 'notices': notices}, self.serializer)
+        return len(gone)
+
+    def replace(self, records: Dict[str, Dict]):
+        """Rewrite the archive with exactly records (used when notices are re-keyed)."""
+        self._notices = LazyNotices(records)
+        dump_notice_file(self.archive_file, {'version': 1, 'notices': self._notices}, self.serializer)
+
+
+# Status of a placeholder for a record that could not be read or recovered
+CORRUPTED = 'corrupted'
+
+
+def corrupted_record(notice_id: str) -> Dict:
+    """Placeholder that keeps an unreadable notice's id (and its slot) in the cache."""
+    return {'id': notice_id, 'status': CORRUPTED, 'telegram_message_ids': []}
+
+
+class LazyNotices(MutableMapping):
+    """
+    Notice records by id, decoded on first access.
+
+    Loaded from the one-notice-per-line layout (see dump_notice_file), it
+    holds each record's utf-8 JSON text until the record is first read;
+    keys() is the underlying dict view, so id set operations never parse a
+    record. A signed record's text starts with its digest, so it can be
+    verified without parsing (see RecordDigests.split_signed);
+    on_parse(id, text), if set, is called with each record's text just
+    before it is parsed and may return a record to use instead (e.g. one
+    recovered from an older copy). An id never disappears on read: a record
+    whose text no longer parses reads as a corrupted_record() placeholder,
+    so keys() always matches what can be read.
+    """
+
+    def __init__(self, entries: Optional[Dict[str, Any]] = None):
+        self._entries: Dict[str, Any] = dict(entries or {})      # id -> bytes or record
+        self.on_parse = None
+
+    def __getitem__(self, notice_id: str) -> Dict:
+        value = self._entries[notice_id]
+        if isinstance(value, bytes):
+            record = self.on_parse(notice_id, value) if self.on_parse else None
+            if record is None:
+                try:
+                    record = json.loads(value)
+                except ValueError:
+                    print(f"⚠️ Cache integrity: notice {notice_id} unreadable, kept as corrupted")
+                    record = corrupted_record(notice_id)
+            value = self._entries[notice_id] = record
+        return value
+
+    def __setitem__(self, notice_id: str, record: Dict):
+        self._entries[notice_id] = record
+
+    def __delitem__(self, notice_id: str):
+        del self._entries[notice_id]
+
+    def __contains__(self, notice_id) -> bool:
+        return notice_id in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def keys(self):
+        return self._entries.keys()
+
+    def raw(self, notice_id: str) -> Optional[bytes]:
+        """Stored text of a record not parsed yet, else None."""
+        value = self._entries[notice_id]
+        return value if isinstance(value, bytes) else None
+
+    def materialized(self) -> int:
+        return sum(1 for v in self._entries.values() if not isinstance(v, bytes))
+
+    def update_raw(self, entries: Dict[str, bytes]):
+        """Add or replace records by their stored text, to be parsed on first access."""
+        self._entries.update(entries)
+
+    def record_lines(self) -> Iterator[bytes]:
+        """One '"id":{record}' line per notice; unparsed records are written back verbatim."""
+        for notice_id, value in self._entries.items():
+            yield record_line(notice_id, value if isinstance(value, bytes) else RecordDigests.signed_text(value))
+
+
+def record_line(notice_id: str, text: bytes) -> bytes:
+    """'"id":{record}' line of the snapshot and journal layout."""
+    return json.dumps(notice_id, ensure_ascii=False).encode() + b':' + text
+
+
+def split_record_line(line: bytes) -> Tuple[str, bytes]:
+    """(notice id, record text) of a record_line, a trailing comma allowed."""
+    end = line.index(b'":')
+    notice_id = line[1:end].decode()
+    if '\\' in notice_id:
+        notice_id, end = json.JSONDecoder().raw_decode(line.decode())
+        end = len(line.decode()[:end].encode()) - 1
+    return notice_id, line[end + 2:].rstrip(b',\n')
+
+
+_NOTICES_OPEN = b'"notices":{'
+
+
+def dump_notice_file(path: str, data: Dict, serializer=None):
+    """
+    Write a cache dict with one notice per line:
+
+        {"version":3,...,"notices":{
+        "<id>":{"_digest":"...",...},
+        ...
+        }}
+
+    It is still a plain JSON document with the usual layout, but a loader
+    can index it line by line without parsing records (load_notice_file).
+    Serializers without a text form (msgpack) get the plain dict instead.
+    """
+    serializer = serializer or serializers.get_serializer()
+    notices = data.get('notices', {})
+    if not isinstance(notices, LazyNotices):
+        notices = LazyNotices(notices)
+    meta = {k: v for k, v in data.items() if k != 'notices'}
+
+    if not hasattr(serializer, 'open_stream'):
+        serializers.dump_file(path, {**meta, 'notices': {nid: notices[nid] for nid in notices}},
+                              serializer)
+        return
+
+    head = json.dumps(meta, ensure_ascii=False, separators=(',', ':')).encode()
+    head = (head[:-1] + b',' if meta else b'{') + _NOTICES_OPEN
+
+    tmp = path + '.tmp'
+    with serializer.open_stream(tmp, 'wb') as f:
+        f.write(head)
+        sep = b'\n'
+        for line in notices.record_lines():
+            f.write(sep + line)
+            sep = b',\n'
+        f.write(b'\n}}\n')
+    os.replace(tmp, path)
+
+
+def load_notice_file(path: str) -> Tuple[Dict, bool]:
+    """
+    Read a cache dict written by dump_notice_file (or any older layout).
+    Returns (data, lazy); data['notices'] is always a LazyNotices, and lazy
+    tells whether the file was in the line layout.
+    """
+    serializer = serializers.detect_file(path)
+    if not hasattr(serializer, 'open_stream'):
+        data, lazy = serializers.load_file(path), False
+    else:
+        with serializer.open_stream(path, 'rb') as f:
+            head = f.readline().rstrip(b'\n')
+            if not head.endswith(_NOTICES_OPEN):
+                data, lazy = json.loads(head + f.read()), False
+            else:
+                data, lazy = json.loads(head[:-len(_NOTICES_OPEN)].rstrip(b',') + b'}'), True
+                entries = {}
+                # Binary lines split on b'\n' only; U+2028 inside a title is not a break
+                for line in f:
+                    if not line.startswith(b'"'):
+                        continue          # closing braces
+                    notice_id, text = split_record_line(line)
+                    entries[notice_id] = text
+                data['notices'] = LazyNotices(entries)
+
+    if isinstance(data.get('notices'), dict):
+        data['notices'] = LazyNotices(data['notices'])
+    return data, lazy
@@ -51,24 +51,24 @@ class ChangeDetector:
             pdf_hashes: Optional dict of notice_id -> pdf_hash
         
         Returns:
-            List of ChangeEvent objects
+            List of ChangeEvent objects: REMOVED_FROM_PAGE_1 in previous
+            page 1 order, then NEW, then EDITED / PDF_REPLACED in scrape order
         """
         changes = []
         pdf_hashes = pdf_hashes or {}
         
-        # Get ID sets
+        # Get ID sets; keys() never parses a lazily loaded record
         current_ids = {n['id'] for n in current_notices}
         current_page_1_ids = {n['id'] for n in page_1_notices}
         cached_ids = set(cache_data.get('notices', {}).keys())
-        previous_page_1_ids = set(cache_data.get('previous_page_1_ids', []))
         
-        # Create lookup dicts
+        # Create lookup dicts; ids in scrape order, a repeated id keeps its last row
         current_lookup = {n['id']: n for n in current_notices}
         cached_notices = cache_data.get('notices', {})
         
         # 1. Detect REMOVED_FROM_PAGE_1
         # Notice was on page 1 before, now not on any page
-        for notice_id in previous_page_1_ids:
+        for notice_id in dict.fromkeys(cache_data.get('previous_page_1_ids', [])):
             if notice_id not in current_page_1_ids:
                 if notice_id not in current_ids:
                     # Was on page 1, now completely gone
@@ -82,8 +82,9 @@ class ChangeDetector:
                     print(f"🗑️ REMOVED_FROM_PAGE_1: {old_notice.get('title', 'Unknown')[:50]}")
         
         # 2. Detect NEW notices
-        for notice_id in current_ids - cached_ids:
-            notice = current_lookup[notice_id]
+        for notice_id, notice in current_lookup.items():
+            if notice_id in cached_ids:
+                continue
             changes.append(ChangeEvent(
                 change_type=ChangeType.NEW,
                 notice_id=notice_id,
@@ -92,8 +93,10 @@ class ChangeDetector:
             print(f"🆕 NEW: {notice['title'][:50]}")
         
         # 3. Detect EDITED and PDF_REPLACED
-        for notice_id in current_ids & cached_ids:
-            current_notice = current_lookup[notice_id]
+        # Only the records of notices still listed are read from the cache
+        for notice_id, current_notice in current_lookup.items():
+            if notice_id not in cached_ids:
+                continue
             cached_notice = cached_notices[notice_id]
             
             # Check for title/date edits
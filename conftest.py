@@ -0,0 +1,138 @@
+"""
+conftest.py
+───────────
+Shared test helpers: scraped-notice and cached-record factories (import
+them from conftest), fixtures for a throwaway cache file, and a local
+notice board server. No test needs network or Telegram access, except
+test_telegram_scenarios.py, which talks to the real bot.
+"""
+
+import hashlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from cache_manager import CacheManager
+from http_client import HttpClient
+from scraper import NoticeScraper
+
+
+NOTICE_URL = "https://www.dhakacollege.edu.bd/storage/notices/{}.pdf"
+
+
+def make_notice(n: int, title: Optional[str] = None, **fields) -> Dict:
+    """A notice as the scraper returns it; fields override the defaults."""
+    notice = {'id': f"n{n}", 'serial': str(n), 'title': title or f"Notice {n}", 'date': '01-10-2026',
+              'download_url': NOTICE_URL.format(n)}
+    notice.update(fields)
+    return notice
+
+
+def make_record(notice: Dict, last_seen: str, message_ids: List[int]) -> Dict:
+    """A cache record for a notice, as an older cache version stored it."""
+    return dict(notice, pdf_hash=None, content_hash=None, file_type='pdf',
+                first_seen=last_seen, last_seen=last_seen, history=[],
+                was_on_page_1=True, telegram_message_ids=list(message_ids))
+
+
+@pytest.fixture
+def cache_file(tmp_path) -> str:
+    return str(tmp_path / 'notice_cache.json')
+
+
+@pytest.fixture
+def seed(cache_file) -> Callable[..., CacheManager]:
+    """
+    Save notices to cache_file as one run would, each with a sent message
+    (serial × 10). on_page_1 also lists them as page 1, which keeps them hot.
+    """
+    def seed(notices: List[Dict], on_page_1: bool = False, **options) -> CacheManager:
+        manager = CacheManager(cache_file, **options)
+        data = manager.load_cache()
+        for n in notices:
+            manager.update_notice(n, data, was_on_page_1=on_page_1)
+            manager.append_telegram_message_ids(n['id'], [int(n['serial']) * 10], data)
+        if on_page_1:
+            data['previous_page_1_ids'] = [n['id'] for n in notices]
+        assert manager.save_cache(data)
+        return manager
+    return seed
+
+
+# ─── Notice board server ──────────────────────────────────────────────────────
+
+PER_PAGE = 3
+
+
+def page_html(titles) -> bytes:
+    rows = "".join(
+        f'<tr class="hover:bg-gray-50"><td>{i}</td><td>{t}</td><td>01-10-2026</td><td>View</td>'
+        f'<td><a href="/storage/notices/{t}.pdf">Download</a></td></tr>'
+        for i, t in enumerate(titles, 1))
+    return ('<html><body><main><section>'
+            '<div class="mt-6 flex flex-col gap-4 md:mt-8 md:gap-6 lg:mt-10 lg:gap-8">'
+            f'<div><table><tbody>{rows}</tbody></table></div></div>'
+            '</section></main></body></html>').encode()
+
+
+class _BoardHandler(BaseHTTPRequestHandler):
+    """
+    Serves the notice board from server.titles, PER_PAGE rows a page, with
+    an ETag. Each reply waits server.delay seconds; pages in server.broken
+    answer 500.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        srv = self.server
+        page = int(parse_qs(urlsplit(self.path).query).get('page', ['1'])[0])
+        time.sleep(srv.delay)
+        if page in srv.broken:
+            srv.requests.append((page, 'If-None-Match' in self.headers, 500))
+            self.send_error(500)
+            return
+        body = page_html(srv.titles[(page - 1) * PER_PAGE:page * PER_PAGE])
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        conditional = 'If-None-Match' in self.headers
+
+        if srv.etags and self.headers.get('If-None-Match') == etag:
+            srv.requests.append((page, conditional, 304))
+            self.send_response(304)
+            self.end_headers()
+            return
+        srv.requests.append((page, conditional, 200))
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        if srv.etags:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def board():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _BoardHandler)
+    srv.titles = [f"Notice {n}" for n in range(1, 3 * PER_PAGE + 1)]
+    srv.etags = True
+    srv.delay = 0.0
+    srv.broken = set()
+    srv.requests = []
+    srv.url = f"http://127.0.0.1:{srv.server_port}/en/notice"
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield srv
+    srv.shutdown()
+
+
+def board_scraper(board) -> NoticeScraper:
+    """A scraper reading the local board instead of the college site."""
+    scraper = NoticeScraper(http=HttpClient())
+    scraper.base_url = board.url
+    return scraper
@@ -5,19 +5,322 @@ Handles PDF downloading, rendering to images, and branding overlay
 
 import os
 import io
+import re
 import time
+import shutil
 import hashlib
+import tempfile
+import weakref
+import threading
 import requests
-from typing import Dict, List, Optional, Tuple
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 from PIL import Image, ImageDraw, ImageFont, ImageOps, ImageFilter
 import fitz  # PyMuPDF
 import numpy as np
 from branding import add_branding
+from image_encoder import PHOTO_BYTE_BUDGET, encode_for_telegram
+from http_client import HttpClient, get_shared_client
+from media_cache import MediaCache, PageStream
+
+
+# Render processes per run, shared by every notice being sent at once
+RENDER_POOL_MAX = 4
+
+
+# ─── Page pipeline (module level so process-pool workers can run it) ──────────
+
+def render_page(page: "fitz.Page", dpi: int, max_width: int,
+                fit_width: bool = True) -> Image.Image:
+    """
+    Render one PDF page to a PIL Image at dpi, no wider than max_width.
+
+    The image is built straight from the pixmap's raw RGB samples (no PNG
+    encode/decode in between, and no intermediate bytes copy). With fit_width, pages wider than max_width at
+    this dpi are rendered at max_width directly instead of being downscaled.
+    """
+    zoom = dpi / 72
+    if fit_width and page.rect.width * zoom > max_width:
+        zoom = max_width / page.rect.width
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+
+    # samples_mv is a view of the pixmap (pix.samples would copy it first);
+    # Pillow copies RGB data once, then the pixmap is released right away
+    img = Image.frombuffer("RGB", (pix.width, pix.height), pix.samples_mv,
+                           "raw", "RGB", pix.stride, 1)
+    del pix
+
+    # Resize if too wide (rounding at fit_width, or fit_width off)
+    if img.width > max_width:
+        ratio = max_width / img.width
+        new_height = int(img.height * ratio)
+        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
+    return img
+
+
+def crop_whitespace(img: Image.Image, threshold=245, padding=20) -> Image.Image:
+    """Remove white borders while preserving content."""
+    img_array = np.array(img.convert("RGB"))
+    # Find rows/cols that are NOT pure white
+    mask = np.any(img_array < threshold, axis=2)
+    rows = np.any(mask, axis=1)
+    cols = np.any(mask, axis=0)
+    if not rows.any():
+        return img
+    rmin, rmax = np.where(rows)[0][[0, -1]]
+    cmin, cmax = np.where(cols)[0][[0, -1]]
+    # Add padding back
+    h, w = img_array.shape[:2]
+    rmin = max(0, rmin - padding)
+    rmax = min(h, rmax + padding)
+    cmin = max(0, cmin - padding)
+    cmax = min(w, cmax + padding)
+    return img.crop((cmin, rmin, cmax, rmax))
+
+
+def encode_image(img: Image.Image, format: str = 'auto') -> bytes:
+    """
+    Encode a PIL Image to bytes. 'auto' picks PNG, palette PNG or JPEG per
+    page for Telegram (see image_encoder); 'PNG'/'JPEG' force a format.
+    """
+    if format == 'auto':
+        return encode_for_telegram(img)
+    buffer = io.BytesIO()
+    if format.upper() == 'JPEG':
+        img = img.convert('RGB')
+    img.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def open_pdf(source: Union[str, bytes]) -> "fitz.Document":
+    """Open a PDF from a file path (nothing copied into memory) or from bytes."""
+    if isinstance(source, (bytes, bytearray)):
+        return fitz.open(stream=source, filetype="pdf")
+    return fitz.open(source, filetype="pdf")
+
+
+def _pdf_page_count(pdf_source: Union[str, bytes]) -> int:
+    """Worker: number of pages in the document."""
+    with open_pdf(pdf_source) as doc:
+        return len(doc)
+
+
+def _render_page_range(pdf_source: Union[str, bytes], start: int, stop: int,
+                       dpi: int, max_width: int, format: str,
+                       fit_width: bool = True) -> List[bytes]:
+    """
+    Worker: open the document from the shared file (or bytes), then render,
+    crop, brand and encode pages [start, stop). Returns encoded pages in page order.
+    """
+    doc = open_pdf(pdf_source)
+    try:
+        pages = []
+        for page_num in range(start, stop):
+            img = render_page(doc[page_num], dpi, max_width, fit_width)
+            img = add_branding(crop_whitespace(img))
+            pages.append(encode_image(img, format))
+        return pages
+    finally:
+        doc.close()
+
+
+# Leading bytes kept from every download for type sniffing; the PDF header
+# may sit anywhere in the first 1024 bytes
+SNIFF_BYTES = 1024
+
+_IMAGE_MAGIC = (
+    b'\xff\xd8\xff',           # JPEG
+    b'\x89PNG\r\n\x1a\n',      # PNG
+    b'GIF87a', b'GIF89a',
+    b'BM',                      # BMP
+    b'II*\x00', b'MM\x00*',     # TIFF
+)
+
+
+# Sniffed types worth remembering across runs (see ContentProcessor.url_types)
+KNOWN_FILE_TYPES = ('pdf', 'image')
+
+
+def sniff_file_type(head: bytes, content_type: str = '') -> str:
+    """
+    'pdf', 'image' or 'unknown' from a file's first bytes (magic numbers);
+    the Content-Type header is only used when the bytes are not recognised.
+    """
+    if b'%PDF-' in head[:SNIFF_BYTES]:
+        return 'pdf'
+    if head.startswith(_IMAGE_MAGIC) or (head[:4] == b'RIFF' and head[8:12] == b'WEBP'):
+        return 'image'
+    content_type = content_type.lower()
+    if 'pdf' in content_type:
+        return 'pdf'
+    if content_type.startswith('image/'):
+        return 'image'
+    return 'unknown'
+
+
+class DownloadTooLarge(Exception):
+    """Raised when a download exceeds ContentProcessor.max_download_bytes."""
+
+
+class StoredFile:
+    """
+    A downloaded file on disk: path, sha256, size and the file type sniffed
+    from its first bytes. Bytes are read only on demand.
+    """
+
+    def __init__(self, path: str, sha256: str, size: int, file_type: str = 'unknown'):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.file_type = file_type
+
+    def open(self):
+        return open(self.path, 'rb')
+
+    def read_bytes(self) -> bytes:
+        with self.open() as f:
+            return f.read()
+
+
+def _encoded(response: requests.Response) -> bool:
+    """True if the body has a Content-Encoding (gzip, deflate...) that requests decodes."""
+    return response.headers.get('Content-Encoding', 'identity').strip().lower() not in ('', 'identity')
+
+
+class _PartialDownload:
+    """Bytes of one download received so far, so a stalled transfer can resume."""
+
+    def __init__(self, dest: str):
+        self.dest = dest
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.total: Optional[int] = None
+        self.validator: Optional[str] = None
+        self.resumable = False
+        self.head = b''
+        self.content_type = ''
+
+    def start(self, response: requests.Response):
+        """Begin (or restart) from byte zero with a full 200 response."""
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.head = b''
+        self.content_type = response.headers.get('Content-Type', '')
+        length = response.headers.get('Content-Length')
+        # An encoded body's Content-Length and byte ranges count encoded bytes,
+        # not the decoded ones written to dest: no length check, no resume
+        self.total = int(length) if length and length.isdigit() and not _encoded(response) else None
+        # If-Range needs a strong ETag, else Last-Modified
+        etag = response.headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            self.validator = etag
+        else:
+            self.validator = response.headers.get('Last-Modified')
+        self.resumable = (
+            response.headers.get('Accept-Ranges', '').lower() == 'bytes'
+            and self.total is not None and self.validator is not None
+        )
+
+    def update(self, chunk: bytes):
+        """Account for a chunk written to dest."""
+        if len(self.head) < SNIFF_BYTES:
+            self.head += chunk[:SNIFF_BYTES - len(self.head)]
+        self.digest.update(chunk)
+        self.size += len(chunk)
+
+    @property
+    def file_type(self) -> str:
+        return sniff_file_type(self.head, self.content_type)
+
+    def range_headers(self) -> Dict[str, str]:
+        if not (self.resumable and 0 < self.size < self.total):
+            return {}
+        return {'Range': f'bytes={self.size}-', 'If-Range': self.validator}
+
+    def continues_with(self, response: requests.Response) -> bool:
+        """True if response is a 206 carrying exactly bytes size..total-1 of the same file."""
+        if response.status_code != 206 or _encoded(response):
+            return False
+        match = re.match(r'bytes (\d+)-(\d+)/(\d+|\*)', response.headers.get('Content-Range', ''))
+        if not match:
+            return False
+        first, last, total = match.groups()
+        return (int(first) == self.size and int(last) == self.total - 1
+                and total in (str(self.total), '*'))
+
+
+class ContentStore:
+    """
+    Per-run store of downloaded files, keyed by URL and by sha256.
+    Lets run(), process_notice_media() and the PDF fallback share a single
+    download of each file instead of fetching it again at every step.
+
+    Files are streamed to a private temp directory, so a large PDF is never
+    held in memory just to be kept around; the directory is removed on clear().
+    Safe to share between the Telegram dispatcher's worker threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._dir: Optional[str] = None
+        self._file_by_url: Dict[str, StoredFile] = {}
+        self._file_by_hash: Dict[str, StoredFile] = {}
+        self._failed_urls: set = set()
+
+    def new_temp_path(self) -> str:
+        """Path for a download in progress inside the store's directory."""
+        with self._lock:
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix='dc_media_')
+                # Also clean up if the process exits without clear()
+                self._finalizer = weakref.finalize(self, shutil.rmtree, self._dir, True)
+        fd, path = tempfile.mkstemp(dir=self._dir, suffix='.part')
+        os.close(fd)
+        return path
+
+    def get(self, url: str) -> Optional[StoredFile]:
+        """Return the file for a URL already fetched this run, else None."""
+        return self._file_by_url.get(url)
+
+    def put(self, url: str, path: str, sha256: str, size: int,
+            file_type: str = 'unknown') -> StoredFile:
+        """Register a finished download under its URL and sha256."""
+        with self._lock:
+            existing = self._file_by_hash.get(sha256)
+            if existing is not None:
+                # Identical files behind different URLs share one copy
+                os.remove(path)
+                stored = existing
+            else:
+                stored = StoredFile(path, sha256, size, file_type)
+                self._file_by_hash[sha256] = stored
+            self._file_by_url[url] = stored
+            return stored
+
+    def mark_failed(self, url: str):
+        """Remember a URL whose download already failed this run."""
+        self._failed_urls.add(url)
+
+    def has_failed(self, url: str) -> bool:
+        return url in self._failed_urls
+
+    def clear(self):
+        self._file_by_url.clear()
+        self._file_by_hash.clear()
+        self._failed_urls.clear()
+        if self._dir is not None:
+            self._finalizer()
+            self._dir = None
 
 
 class ContentProcessor:
-    def __init__(self, logo_path: str = 'assets/logo.png'):
+    def __init__(self, logo_path: str = 'assets/logo.png', http: Optional[HttpClient] = None,
+                 render_workers: Optional[int] = None,
+                 media_cache: Optional[MediaCache] = None):
         self.logo_path = logo_path
+        self.http = http or get_shared_client()
         self.branding_name = "Archived by The DC Archive"
         self.facebook_link = "https://www.facebook.com/thedcarchive"
         self.telegram_link = "https://t.me/thedcarchive_notice"
@@ -25,6 +328,16 @@ class ContentProcessor:
         self.timeout = (10, 60)
         self.max_width = 1920
         self.dpi = 150
+        # Render wide pages at max_width directly instead of downscaling afterwards
+        self.render_to_width = True
+        # Processes used to render/brand PDF pages in parallel; one pool of
+        # this size serves the whole run (see render_pool)
+        self.render_workers = render_workers or min(os.cpu_count() or 1, RENDER_POOL_MAX)
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._render_pool_lock = threading.Lock()
+        # Downloads are streamed to disk; anything larger than this is refused
+        self.max_download_bytes = 200 * 1024 * 1024
+        self.download_chunk_size = 256 * 1024
         self._ua_headers = {
             'User-Agent': (
                 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
@@ -37,12 +350,54 @@ class ContentProcessor:
         self.overlay_bg_color = (0, 0, 0, 180)  # Semi-transparent black
         self.text_color = (255, 255, 255)        # White
         self.accent_color = (99, 102, 241)        # Indigo
+
+        # Downloads shared by every step of a run (see reset_store)
+        self.store = ContentStore()
+        # URL → file type sniffed from downloaded bytes; kept across runs in
+        # the notice cache (see CacheManager.get_url_file_types)
+        self.url_types: Dict[str, str] = {}
+        # Rendered pages kept across runs, keyed by file hash + render params
+        # (set to None to always render)
+        self.media_cache = media_cache if media_cache is not None else MediaCache()
+
+    def reset_store(self):
+        """Drop all downloads kept from the previous run."""
+        self.store.clear()
+
+    def render_pool(self) -> ProcessPoolExecutor:
+        """
+        The run's render processes, created on first use and shared by every
+        notice. Workers are spawned, never forked: sends run on dispatcher
+        threads, and forking a threaded process can copy a held lock.
+        """
+        with self._render_pool_lock:
+            if self._render_pool is None:
+                self._render_pool = ProcessPoolExecutor(
+                    max_workers=self.render_workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._render_pool
+
+    def shutdown_render_pool(self):
+        """Stop the render processes (end of run)."""
+        with self._render_pool_lock:
+            pool, self._render_pool = self._render_pool, None
+        if pool is not None:
+            pool.shutdown()
     
     def detect_file_type(self, url: str) -> Optional[str]:
-        """Detect file type from URL or HEAD request"""
+        """
+        Detect file type from the URL's type remembered from an earlier
+        download (url_types), its extension, or else by downloading it and
+        sniffing the first bytes. The download is kept in the per-run store
+        for rendering, so no request is spent only on detection, and a URL
+        that fails is not requested again this run.
+        """
         if not url:
             return None
 
+        known = self.url_types.get(url)
+        if known:
+            return known
+
         # Check URL extension
         url_lower = url.lower()
         if url_lower.endswith('.pdf'):
@@ -50,91 +405,168 @@ class ContentProcessor:
         elif any(url_lower.endswith(ext) for ext in ['.jpg', '.jpeg', '.png', '.gif', '.webp']):
             return 'image'
 
-        # Try HEAD request
-        try:
-            response = requests.head(
-                url, headers=self._ua_headers, timeout=self.timeout, allow_redirects=True
-            )
-            content_type = response.headers.get('Content-Type', '').lower()
-            if 'pdf' in content_type:
-                return 'pdf'
-            elif 'image' in content_type:
-                return 'image'
-        except Exception:
-            pass
+        stored = self.fetch(url)
+        return stored.file_type if stored else 'unknown'
 
-        return 'unknown'
+    def _stream_to_file(self, url: str, part: "_PartialDownload"):
+        """
+        Stream one GET of url into part.dest, hashing as it goes.
+
+        If part already holds bytes from a stalled attempt and the server
+        supports ranges, only the rest is requested (Range + If-Range). A reply
+        that does not continue exactly at part.size — a 200, or a Content-Range
+        for another offset or length — restarts the file from byte zero.
+        The body is requested unencoded; a server that gzips it anyway is
+        accepted without the length check or resume (see _PartialDownload.start).
+        Raises DownloadTooLarge past max_download_bytes.
+        """
+        range_headers = part.range_headers()
+        # Ask for the bytes as stored, so Content-Length and ranges match what is written
+        response = self.http.get(
+            url, headers={**self._ua_headers, 'Accept-Encoding': 'identity', **range_headers},
+            timeout=self.timeout, stream=True
+        )
+        start = time.perf_counter()
+        received = 0
+        with response:
+            response.raise_for_status()
+
+            if range_headers and part.continues_with(response):
+                print(f"  Resuming download at byte {part.size}")
+                mode = 'ab'
+            else:
+                if range_headers:
+                    print("  Server did not resume the range, restarting from byte 0")
+                part.start(response)
+                if (part.total or 0) > self.max_download_bytes:
+                    raise DownloadTooLarge(f"{part.total} bytes > limit {self.max_download_bytes}")
+                mode = 'wb'
+
+            with open(part.dest, mode) as f:
+                for chunk in response.iter_content(chunk_size=self.download_chunk_size):
+                    if part.size + len(chunk) > self.max_download_bytes:
+                        raise DownloadTooLarge(f"more than {self.max_download_bytes} bytes")
+                    f.write(chunk)
+                    part.update(chunk)
+                    received += len(chunk)
+
+        self.http.record_transfer(url, time.perf_counter() - start, received)
+        if part.total is not None and part.size != part.total:
+            raise requests.exceptions.ConnectionError(
+                f"Download ended at byte {part.size} of {part.total}"
+            )
 
-    def _download_with_retry(self, url: str, retries: int = 3, backoff: int = 2) -> bytes:
+    def _download_with_retry(self, url: str, dest: str,
+                             retries: int = 3, backoff: int = 2) -> "_PartialDownload":
         """
-        Download a URL with retry logic.
+        Download a URL into dest with retry logic. Returns the finished
+        download (sha256 digest, size, sniffed file_type).
+        A retry resumes from the last received byte when the server allows it;
+        otherwise the whole file is fetched again.
         Raises the last exception if all attempts fail.
         """
+        part = _PartialDownload(dest)
         last_exc = None
         for attempt in range(retries):
             try:
-                response = requests.get(
-                    url, headers=self._ua_headers, timeout=self.timeout
-                )
-                response.raise_for_status()
-                return response.content
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                wait = backoff ** attempt
-                print(f"  Attempt {attempt + 1}/{retries} failed ({type(e).__name__}). Retrying in {wait}s...")
+                self._stream_to_file(url, part)
+                return part
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError,
+                    requests.exceptions.ChunkedEncodingError) as e:
                 last_exc = e
+                if attempt + 1 == retries:
+                    break
+                wait = backoff ** attempt
+                resume = f", resuming at byte {part.size}" if part.range_headers() else ""
+                print(f"  Attempt {attempt + 1}/{retries} failed ({type(e).__name__}). "
+                      f"Retrying in {wait}s{resume}...")
                 time.sleep(wait)
             except requests.exceptions.RequestException as e:
                 # Non-transient error (e.g. 404) — no point retrying
                 raise e
         raise last_exc
-    
-    def download_file(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
-        """Download file and return (bytes, sha256-hash). Returns (None, None) on failure."""
+
+    def fetch(self, url: str) -> Optional[StoredFile]:
+        """
+        Download url to the per-run store and return it (None on failure).
+        Each URL is fetched at most once per run; repeat calls are served from the store.
+        """
+        stored = self.store.get(url)
+        if stored is not None:
+            return stored
+        if self.store.has_failed(url):
+            return None
+
+        path = self.store.new_temp_path()
         try:
-            content = self._download_with_retry(url)
-            file_hash = hashlib.sha256(content).hexdigest()
-            return content, file_hash
+            part = self._download_with_retry(url, path)
+            stored = self.store.put(url, path, part.digest.hexdigest(), part.size, part.file_type)
+            # Only files recognised from real bytes are remembered; failures and
+            # 'unknown' (often a transient HTML error page) are checked again next run
+            if stored.file_type in KNOWN_FILE_TYPES:
+                self.url_types[url] = stored.file_type
+            return stored
         except Exception as e:
             print(f"Download failed after retries for {url}: {e}")
+            self.store.mark_failed(url)
+            if os.path.exists(path):
+                os.remove(path)
+            return None
+    
+    def download_file(self, url: str) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Download file and return (bytes, sha256-hash). Returns (None, None) on failure.
+        Prefer fetch() when the bytes are not needed in memory.
+        """
+        stored = self.fetch(url)
+        if stored is None:
             return None, None
+        return stored.read_bytes(), stored.sha256
     
-    def render_pdf_to_images(self, pdf_bytes: bytes) -> List[Image.Image]:
-        """Render all pages of a PDF to PIL Images"""
-        images = []
-        
+    def render_pdf_pages(self, pdf_source: Union[str, bytes], format: str = 'auto') -> PageStream:
+        """
+        Render, crop, brand and encode every page of a PDF, given as a file
+        path (preferred: workers open the file, nothing is copied) or bytes.
+
+        All MuPDF work, the page count included, runs in the shared
+        render_pool: PyMuPDF is not thread-safe, and sends run on several
+        dispatcher threads. The page count is read up front; pages are
+        rendered as the stream is iterated (see _render_pages).
+        """
+        pool = self.render_pool()
         try:
-            # Open PDF from bytes
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            
-            for page_num in range(len(doc)):
-                page = doc[page_num]
-                
-                # Calculate zoom for desired DPI
-                zoom = self.dpi / 72
-                mat = fitz.Matrix(zoom, zoom)
-                
-                # Render page to pixmap
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Convert to PIL Image
-                img_data = pix.tobytes("png")
-                img = Image.open(io.BytesIO(img_data))
-                
-                # Resize if too wide
-                if img.width > self.max_width:
-                    ratio = self.max_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize((self.max_width, new_height), Image.Resampling.LANCZOS)
-                
-                images.append(img)
-            
-            doc.close()
-            print(f"✅ Rendered {len(images)} pages from PDF")
-        
+            page_count = pool.submit(_pdf_page_count, pdf_source).result()
+        except Exception as e:
+            print(f"❌ Error opening PDF: {e}")
+            return PageStream(0, [])
+        return PageStream(page_count, self._render_pages(pool, pdf_source, page_count, format))
+
+    def _render_pages(self, pool: ProcessPoolExecutor, pdf_source: Union[str, bytes],
+                      page_count: int, format: str) -> Iterator[bytes]:
+        """
+        Yield encoded pages in page order, each rendered by a pool worker
+        that opens the same document. At most render_workers pages are in
+        flight, so only those are held encoded at once. A page that fails
+        ends the stream.
+        """
+        pending = deque()
+        next_page = 0
+        try:
+            while pending or next_page < page_count:
+                while next_page < page_count and len(pending) < self.render_workers:
+                    pending.append(pool.submit(
+                        _render_page_range, pdf_source, next_page, next_page + 1,
+                        self.dpi, self.max_width, format, self.render_to_width,
+                    ))
+                    next_page += 1
+                yield from pending.popleft().result()
+            print(f"✅ Rendered {page_count} pages from PDF "
+                  f"({min(self.render_workers, page_count)} worker(s))")
         except Exception as e:
             print(f"❌ Error rendering PDF: {e}")
-        
-        return images
+        finally:
+            for future in pending:
+                future.cancel()
     
     def load_logo(self) -> Optional[Image.Image]:
         """Load the branding logo"""
@@ -153,84 +585,82 @@ class ContentProcessor:
     
     def smart_crop_whitespace(self, img: Image.Image, threshold=245, padding=20) -> Image.Image:
         """Remove white borders while preserving content."""
-        img_array = np.array(img.convert("RGB"))
-        # Find rows/cols that are NOT pure white
-        mask = np.any(img_array < threshold, axis=2)
-        rows = np.any(mask, axis=1)
-        cols = np.any(mask, axis=0)
-        if not rows.any():
-            return img
-        rmin, rmax = np.where(rows)[0][[0, -1]]
-        cmin, cmax = np.where(cols)[0][[0, -1]]
-        # Add padding back
-        h, w = img_array.shape[:2]
-        rmin = max(0, rmin - padding)
-        rmax = min(h, rmax + padding)
-        cmin = max(0, cmin - padding)
-        cmax = min(w, cmax + padding)
-        return img.crop((cmin, rmin, cmax, rmax))
-
-
-
+        return crop_whitespace(img, threshold, padding)
     
-    def process_notice_media(self, notice: Dict) -> Tuple[List[Image.Image], Optional[str], str]:
+    def process_notice_media(self, notice: Dict) -> Tuple[PageStream, Optional[str], str]:
         """
         Process a notice's media (PDF or image)
         
         Returns:
-            (images, pdf_hash, file_type)
+            (encoded branded page images, pdf_hash, file_type); the pages are
+            rendered (and cached) as the stream is iterated
         """
         download_url = notice.get('download_url', '')
         
         if not download_url:
-            return [], None, 'none'
+            return PageStream(0, []), None, 'none'
         
-        # Detect file type
+        # Detect file type (remembered, from the extension, or sniffed from the download itself)
         file_type = self.detect_file_type(download_url)
+        stored = self.fetch(download_url) if file_type in ('pdf', 'image') else None
+        if stored and stored.file_type != 'unknown':
+            # The bytes win over a misleading extension
+            file_type = stored.file_type
         
         if file_type == 'pdf':
-            # Download and render PDF
-            pdf_bytes, pdf_hash = self.download_file(download_url)
-            
-            if pdf_bytes:
-                images = self.render_pdf_to_images(pdf_bytes)
-                
-                # Apply smart crop then brand each page individually
-                final_images = []
-                for img in images:
-                    img = self.smart_crop_whitespace(img)
-                    final_images.append(add_branding(img))
+            # Render the downloaded PDF
+            if stored:
+                cached = self._cached_pages(stored, 'pdf')
+                if cached is not None:
+                    return cached, stored.sha256, 'pdf'
+
+                # Crop + brand each page individually, in the render workers
+                pages = self._cache_pages(stored, 'pdf', self.render_pdf_pages(stored.path))
                 
-                return final_images, pdf_hash, 'pdf'
+                return pages, stored.sha256, 'pdf'
         
         elif file_type == 'image':
-            # Download image directly
-            img_bytes, img_hash = self.download_file(download_url)
-            
-            if img_bytes:
+            # Use the downloaded image directly
+            if stored:
+                cached = self._cached_pages(stored, 'image')
+                if cached is not None:
+                    return cached, stored.sha256, 'image'
+
                 try:
-                    img = Image.open(io.BytesIO(img_bytes))
+                    img = Image.open(stored.path)
                     
                     # Process image
                     branded = add_branding(img)
+                    pages = self._cache_pages(stored, 'image', PageStream(1, [encode_image(branded)]))
                     
-                    return [branded], img_hash, 'image'
+                    return pages, stored.sha256, 'image'
                 except Exception as e:
                     print(f"❌ Error processing image: {e}")
         
-        return [], None, 'unknown'
-    
-    def images_to_bytes(self, images: List[Image.Image], format: str = 'PNG') -> List[bytes]:
-        """Convert PIL Images to bytes"""
-        result = []
-        for img in images:
-            buffer = io.BytesIO()
-            # Convert to RGB for JPEG, keep RGBA for PNG
-            if format.upper() == 'JPEG':
-                img = img.convert('RGB')
-            img.save(buffer, format=format)
-            result.append(buffer.getvalue())
-        return result
+        return PageStream(0, []), None, 'unknown'
+
+    def _media_key(self, stored: StoredFile, file_type: str) -> str:
+        return MediaCache.make_key(
+            stored.sha256, file_type=file_type, dpi=self.dpi,
+            max_width=self.max_width, fit_width=self.render_to_width, format='auto',
+            budget=PHOTO_BYTE_BUDGET,
+        )
+
+    def _cached_pages(self, stored: StoredFile, file_type: str) -> Optional[PageStream]:
+        """Pages rendered from this exact file in an earlier run, if still cached."""
+        if not self.media_cache:
+            return None
+        pages = self.media_cache.get(self._media_key(stored, file_type))
+        if pages is not None:
+            print(f"♻️ Reusing {len(pages)} cached page(s), no rendering needed")
+        return pages
+
+    def _cache_pages(self, stored: StoredFile, file_type: str, pages: PageStream) -> PageStream:
+        """pages, stored in the media cache as they are iterated."""
+        if not self.media_cache or not len(pages):
+            return pages
+        key = self._media_key(stored, file_type)
+        return PageStream(len(pages), self.media_cache.record(key, pages, len(pages)))
 
 
 if __name__ == "__main__":
@@ -94,8 +94,8 @@ class DashboardManager:
         now = datetime.now(timezone(timedelta(hours=6)))
         today_str = now.strftime('%Y-%m-%d')
         
-        # Count notices
-        total_notices = len(cache_data.get('notices', {}))
+        # Count notices (hot set + archive)
+        total_notices = len(cache_data.get('notices', {})) + cache_data.get('archived_count', 0)
         page_1_count = len(page_1_notices)
         
         # Count today's changes
@@ -0,0 +1,248 @@
+"""
+Shared HTTP Client for Dhaka College Notice Monitor
+One keep-alive, connection-pooled client used by the scraper, content processor
+and Telegram utils, with per-host retry policies, timeouts and timing stats
+"""
+
+import time
+import threading
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+COLLEGE_HOST  = "www.dhakacollege.edu.bd"
+TELEGRAM_HOST = "api.telegram.org"
+
+# (connect timeout, read timeout) per host; anything else uses DEFAULT_TIMEOUT
+DEFAULT_TIMEOUT: Timeout = (10, 60)
+HOST_TIMEOUTS: Dict[str, Timeout] = {
+    COLLEGE_HOST:  (10, 10),
+    TELEGRAM_HOST: (10, 60),
+}
+
+
+def _default_retry_policies() -> Dict[str, Retry]:
+    """
+    Transport-level retries per host. Only failures that happen before a
+    request reaches the server (connect errors) are retried for Telegram, so a
+    sendPhoto is never posted twice. Media downloads keep their own retry loop
+    in ContentProcessor, so the default policy only covers connect errors.
+    """
+    return {
+        COLLEGE_HOST: Retry(
+            total=2, connect=2, read=1, backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504), allowed_methods=frozenset({'GET', 'HEAD'}),
+            raise_on_status=False,
+        ),
+        TELEGRAM_HOST: Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5),
+        '*': Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.5),
+    }
+
+
+class _HostStats:
+    """Per-host counters; all times in seconds."""
+
+    def __init__(self):
+        self.requests = 0
+        self.connections = 0      # new TCP(+TLS) handshakes
+        self.connect_time = 0.0   # time spent in those handshakes
+        self.wait_time = 0.0      # request sent → response headers (includes handshakes)
+        self.transfer_time = 0.0  # response headers → body fully read
+        self.bytes = 0
+
+    def as_dict(self) -> Dict:
+        return {
+            'requests':      self.requests,
+            'connections':   self.connections,
+            'connect_s':     round(self.connect_time, 3),
+            'wait_s':        round(self.wait_time, 3),
+            'transfer_s':    round(self.transfer_time, 3),
+            'bytes':         self.bytes,
+        }
+
+
+class _TimingRecorder:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostStats] = {}
+
+    def _host(self, host: str) -> _HostStats:
+        if host not in self._hosts:
+            self._hosts[host] = _HostStats()
+        return self._hosts[host]
+
+    def record_connect(self, host: str, seconds: float):
+        with self._lock:
+            stats = self._host(host)
+            stats.connections += 1
+            stats.connect_time += seconds
+
+    def record_request(self, host: str, wait: float, transfer: float, size: int):
+        with self._lock:
+            stats = self._host(host)
+            stats.requests += 1
+            stats.wait_time += wait
+            stats.transfer_time += transfer
+            stats.bytes += size
+
+    def record_transfer(self, host: str, seconds: float, size: int):
+        with self._lock:
+            stats = self._host(host)
+            stats.transfer_time += seconds
+            stats.bytes += size
+
+    def report(self) -> Dict[str, Dict]:
+        with self._lock:
+            return {host: stats.as_dict() for host, stats in self._hosts.items()}
+
+    def reset(self):
+        with self._lock:
+            self._hosts.clear()
+
+
+def _timed_pool(pool_cls, recorder: _TimingRecorder):
+    """Subclass a urllib3 pool so every new connection reports its handshake time."""
+    base_conn = pool_cls.ConnectionCls
+
+    class _TimedConnection(base_conn):
+        def connect(self):
+            start = time.perf_counter()
+            super().connect()
+            recorder.record_connect(self.host, time.perf_counter() - start)
+
+    return type(f"Timed{pool_cls.__name__}", (pool_cls,), {'ConnectionCls': _TimedConnection})
+
+
+class _TimedAdapter(HTTPAdapter):
+    def __init__(self, recorder: _TimingRecorder, **kwargs):
+        self._recorder = recorder
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http':  _timed_pool(HTTPConnectionPool, self._recorder),
+            'https': _timed_pool(HTTPSConnectionPool, self._recorder),
+        }
+
+
+class HttpClient:
+    """
+    Thin wrapper over one requests.Session:
+      - keep-alive connection pool per host (pool_maxsize connections each)
+      - per-host retry/backoff policy ('*' is the fallback policy)
+      - per-host default timeouts (an explicit timeout= still wins)
+      - handshake / wait / transfer timings per host, see timing_report()
+    """
+
+    def __init__(self, pool_maxsize: int = 10,
+                 retry_policies: Optional[Dict[str, Retry]] = None,
+                 timeouts: Optional[Dict[str, Timeout]] = None,
+                 default_timeout: Timeout = DEFAULT_TIMEOUT):
+        self.pool_maxsize    = pool_maxsize
+        self.retry_policies  = {**_default_retry_policies(), **(retry_policies or {})}
+        self.timeouts        = {**HOST_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        self._recorder       = _TimingRecorder()
+
+        self.session = requests.Session()
+        self._mount('*', 'https://')
+        self._mount('*', 'http://')
+        for host in self.retry_policies:
+            if host != '*':
+                self._mount(host, f"https://{host}")
+                self._mount(host, f"http://{host}")
+
+    def _mount(self, host: str, prefix: str):
+        adapter = _TimedAdapter(
+            self._recorder,
+            pool_connections=10,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=self.retry_policies[host],
+        )
+        self.session.mount(prefix, adapter)
+
+    # ── Requests ──────────────────────────────────────────────────────────────
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlsplit(url).hostname or ''
+        kwargs.setdefault('timeout', self.timeouts.get(host, self.default_timeout))
+
+        start    = time.perf_counter()
+        response = self.session.request(method, url, **kwargs)
+        wait     = response.elapsed.total_seconds()
+
+        # Streamed bodies are read later by the caller; only headers are timed here
+        if kwargs.get('stream'):
+            self._recorder.record_request(host, wait, 0.0, 0)
+        else:
+            transfer = max(time.perf_counter() - start - wait, 0.0)
+            self._recorder.record_request(host, wait, transfer, len(response.content))
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        kwargs.setdefault('allow_redirects', True)
+        return self.request('HEAD', url, **kwargs)
+
+    def record_transfer(self, url: str, seconds: float, size: int):
+        """Report the body read of a stream=True request, once the caller finished it."""
+        self._recorder.record_transfer(urlsplit(url).hostname or '', seconds, size)
+
+    # ── Timings ───────────────────────────────────────────────────────────────
+
+    def timing_report(self) -> Dict[str, Dict]:
+        """Per-host timing stats since creation (or the last reset_timings)."""
+        return self._recorder.report()
+
+    def reset_timings(self):
+        self._recorder.reset()
+
+    def print_timings(self):
+        report = self.timing_report()
+        if not report:
+            return
+        print("HTTP timings:")
+        for host, t in sorted(report.items()):
+            print(
+                f"  {host}: {t['requests']} req, {t['connections']} handshakes "
+                f"({t['connect_s']}s), wait {t['wait_s']}s, "
+                f"transfer {t['transfer_s']}s, {t['bytes'] // 1024} KB"
+            )
+
+    def close(self):
+        self.session.close()
+
+
+_shared_client: Optional[HttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_client() -> HttpClient:
+    """Process-wide client, created on first use."""
+    global _shared_client
+    with _shared_lock:
+        if _shared_client is None:
+            _shared_client = HttpClient()
+        return _shared_client
+
+
+if __name__ == "__main__":
+    # Test HTTP client
+    client = get_shared_client()
+    for _ in range(2):
+        resp = client.get("https://www.dhakacollege.edu.bd/en/notice")
+        print(f"Status: {resp.status_code}")
+    client.print_timings()
@@ -0,0 +1,128 @@
+"""
+Image Encoder for Dhaka College Notice Monitor
+Picks a per-page encoding for Telegram photo uploads within a byte budget
+"""
+
+import io
+from typing import List, Tuple
+
+from PIL import Image
+
+
+# Telegram sendPhoto limits: at most 10 MB, width + height at most 10000,
+# aspect ratio at most 20
+PHOTO_MAX_BYTES = 10 * 1024 * 1024
+PHOTO_MAX_SIDES = 10000
+PHOTO_MAX_RATIO = 20
+
+# Telegram recompresses every photo anyway; bytes past this only slow uploads
+PHOTO_BYTE_BUDGET = 1024 * 1024
+
+# A page is line art (rendered text/tables) when this share of it is paper
+# white or ink dark; scans and photos have grey paper and mid-tones everywhere
+LINE_ART_SHARE = 0.90
+
+# Encodings tried in order until one fits the budget
+_LADDERS = {
+    'line-art': [('PNG', None), ('PNG', 64), ('JPEG', 90), ('JPEG', 80)],
+    'scan':     [('JPEG', 88), ('JPEG', 80), ('JPEG', 70), ('JPEG', 60)],
+}
+# Downscale steps when nothing on the ladder fits; pages are not shrunk for
+# the budget below MIN_LONG_SIDE (small print stops being readable), only to
+# get under PHOTO_MAX_BYTES
+_SHRINK = 0.8
+MIN_LONG_SIDE = 1280
+
+
+def classify(img: Image.Image) -> str:
+    """'line-art' for rendered text pages, 'scan' for scanned or photographic ones."""
+    gray = img.convert('L')
+    step = max(1, max(gray.size) // 512)
+    if step > 1:
+        # Nearest-neighbour keeps the real pixel values (no blended edges)
+        gray = gray.resize((gray.width // step, gray.height // step), Image.Resampling.NEAREST)
+    hist  = gray.histogram()
+    total = gray.width * gray.height
+    flat  = sum(hist[:64]) + sum(hist[235:])
+    return 'line-art' if flat >= LINE_ART_SHARE * total else 'scan'
+
+
+def fit_photo_limits(img: Image.Image) -> Image.Image:
+    """Pad pages narrower than 1:20 with white and shrink to width + height <= 10000."""
+    w, h = img.size
+    if max(w, h) > PHOTO_MAX_RATIO * min(w, h):
+        side = -(-max(w, h) // PHOTO_MAX_RATIO)
+        size = (side, h) if h > w else (w, side)
+        padded = Image.new('RGB', size, (255, 255, 255))
+        padded.paste(img.convert('RGB'), (0, 0))
+        img, (w, h) = padded, size
+    if w + h > PHOTO_MAX_SIDES:
+        scale = PHOTO_MAX_SIDES / (w + h)
+        img = img.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.Resampling.LANCZOS)
+    return img
+
+
+def _encode(img: Image.Image, format: str, setting) -> bytes:
+    buffer = io.BytesIO()
+    if format == 'JPEG':
+        img.convert('RGB').save(buffer, format='JPEG', quality=setting, optimize=True)
+    elif setting:
+        # Palette PNG: few colours, no dithering so text edges stay clean
+        img.convert('RGB').quantize(colors=setting, method=Image.Quantize.FASTOCTREE,
+                                    dither=Image.Dither.NONE).save(buffer, format='PNG')
+    else:
+        img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def encode_for_telegram(img: Image.Image, budget: int = PHOTO_BYTE_BUDGET) -> bytes:
+    """
+    Encode a page for sendPhoto: the first encoding on the page's ladder that
+    fits budget, shrinking the page while none does (down to MIN_LONG_SIDE).
+    Over budget at that size, the smallest encoding is used; it is shrunk
+    further only if it would break PHOTO_MAX_BYTES.
+    """
+    img    = fit_photo_limits(img)
+    ladder = _LADDERS[classify(img)]
+    while True:
+        smallest = None
+        for format, setting in ladder:
+            data = _encode(img, format, setting)
+            if len(data) <= budget:
+                return data
+            if smallest is None or len(data) < len(smallest):
+                smallest = data
+        readable = max(img.size) * _SHRINK >= MIN_LONG_SIDE
+        if (len(smallest) <= PHOTO_MAX_BYTES and not readable) or max(img.size) <= 1:
+            return smallest
+        img = img.resize((max(1, int(img.width * _SHRINK)), max(1, int(img.height * _SHRINK))),
+                         Image.Resampling.LANCZOS)
+
+
+def sniff_image(data: bytes) -> Tuple[str, str]:
+    """(extension, mime type) of encoded image bytes, from their magic number."""
+    if data[:3] == b'\xff\xd8\xff':
+        return 'jpg', 'image/jpeg'
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return 'webp', 'image/webp'
+    return 'png', 'image/png'
+
+
+if __name__ == "__main__":
+    # Encode a text-like page and a noisy scan-like page
+    from PIL import ImageDraw
+
+    text_page = Image.new('RGB', (1920, 2700), (255, 255, 255))
+    draw = ImageDraw.Draw(text_page)
+    for line in range(120):
+        draw.text((80, 40 + line * 22), f"Notice line {line} " * 8, fill=(0, 0, 0))
+    # Grey, grainy paper with a little ink, like a phone scan
+    scan_page = Image.effect_noise((1920, 2700), 25).convert('RGB').point(lambda v: min(255, v + 110))
+    ImageDraw.Draw(scan_page).text((80, 80), "Scanned notice " * 10, fill=(30, 30, 30))
+
+    sizes: List[str] = []
+    for label, page in (('text', text_page), ('scan', scan_page)):
+        data = encode_for_telegram(page)
+        assert len(data) <= PHOTO_BYTE_BUDGET
+        sizes.append(f"{label}: {classify(page)} → {sniff_image(data)[0]} {len(data) // 1024} KB")
+    print("✅ " + "; ".join(sizes))
@@ -0,0 +1,197 @@
+"""
+Media Cache for Dhaka College Notice Monitor
+Content-addressed on-disk cache of rendered, branded notice pages
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from branding import BRANDING_VERSION
+
+
+class PageStream:
+    """
+    Encoded pages of one notice, produced one at a time as they are
+    iterated, so a whole album is never held in memory. len() is the page
+    count, known before any page is produced; iterate once. A stream may
+    end early (a page failed to render, a cache file vanished), so
+    consumers count what they actually got.
+    """
+
+    def __init__(self, count: int, pages: Iterable[bytes]):
+        self.count = count
+        self._pages = iter(pages)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self._pages
+
+
+class MediaCache:
+    """
+    Final encoded page images keyed by the source file's sha256 plus every
+    parameter that changes the output (dpi, max_width, render mode, format,
+    BRANDING_VERSION). A repeat send of the same file is then a disk read.
+
+    Layout:
+        media_cache/index.json          key -> {pages, bytes, last_used}
+        media_cache/<key>/000.bin ...   one file per page, in page order
+
+    The directory is kept across runs in the Actions cache (see the
+    workflow's media cache steps), never in git; least recently used entries
+    are evicted once the total size passes max_bytes. A hit only updates
+    last_used in memory: the index is written when entries are added or
+    dropped, so a run with only cache hits leaves the directory unchanged.
+    """
+
+    def __init__(self, cache_dir: str = 'media_cache', max_bytes: int = 50 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self._index: Optional[Dict[str, Dict]] = None
+        # get/put may run on several dispatcher threads at once
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def make_key(file_hash: str, **params) -> str:
+        """Key for a source file rendered with the given parameters."""
+        parts = [file_hash, f"branding={BRANDING_VERSION}"]
+        parts += [f"{name}={params[name]}" for name in sorted(params)]
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()[:40]
+
+    # ── Index ─────────────────────────────────────────────────────────────────
+
+    def _load_index(self) -> Dict[str, Dict]:
+        if self._index is None:
+            self._index = {}
+            try:
+                if os.path.exists(self.index_file):
+                    with open(self.index_file, 'r', encoding='utf-8') as f:
+                        self._index = json.load(f)
+            except Exception as e:
+                print(f"⚠️ Media cache index unreadable, starting empty: {e}")
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp = self.index_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f, separators=(',', ':'))
+        os.replace(tmp, self.index_file)
+
+    def _page_path(self, key: str, page_num: int) -> str:
+        return os.path.join(self.cache_dir, key, f"{page_num:03d}.bin")
+
+    # ── Get / put ─────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[PageStream]:
+        """Cached pages for key, read from disk as iterated, or None on a miss (or an incomplete entry)."""
+        with self._lock:
+            return self._get(key)
+
+    def _get(self, key: str) -> Optional[PageStream]:
+        index = self._load_index()
+        entry = index.get(key)
+        if entry is None:
+            return None
+
+        paths = [self._page_path(key, page_num) for page_num in range(entry['pages'])]
+        if not all(os.path.exists(path) for path in paths):
+            print(f"⚠️ Media cache entry {key[:12]} incomplete, dropping it")
+            self._remove(key)
+            self._save_index()
+            return None
+
+        # Persisted with the next put; a read alone does not rewrite the index
+        entry['last_used'] = time.time()
+        return PageStream(len(paths), self._read_pages(paths))
+
+    @staticmethod
+    def _read_pages(paths: List[str]) -> Iterator[bytes]:
+        for path in paths:
+            try:
+                with open(path, 'rb') as f:
+                    page = f.read()
+            except OSError as e:
+                print(f"⚠️ Media cache page unreadable: {e}")
+                return
+            yield page
+
+    def put(self, key: str, pages: List[bytes]):
+        """Store pages under key, then evict LRU entries past max_bytes."""
+        for _ in self.record(key, pages, len(pages)):
+            pass
+
+    def record(self, key: str, pages: Iterable[bytes], count: int) -> Iterator[bytes]:
+        """
+        Yield pages while writing each one to disk. Once all count pages
+        have gone through, they are stored under key and LRU entries past
+        max_bytes are evicted. A stream that ends early, or is larger than
+        max_bytes, is not stored. The lock is only taken to store the entry,
+        so sends writing their pages do not wait on each other.
+        """
+        staging = os.path.join(self.cache_dir, f".{key}.{threading.get_ident()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        written, total, keep = 0, 0, True
+        try:
+            for page in pages:
+                total += len(page)
+                keep = keep and total <= self.max_bytes
+                if keep:
+                    try:
+                        os.makedirs(staging, exist_ok=True)
+                        with open(os.path.join(staging, f"{written:03d}.bin"), 'wb') as f:
+                            f.write(page)
+                    except OSError as e:
+                        # The pages still go out; they are just not cached
+                        print(f"⚠️ Could not write media cache: {e}")
+                        keep = False
+                written += 1
+                yield page
+            if keep and 0 < written == count:
+                with self._lock:
+                    self._store(key, staging, written, total)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _store(self, key: str, staging: str, pages: int, total: int):
+        index = self._load_index()
+        self._remove(key)
+        try:
+            os.replace(staging, os.path.join(self.cache_dir, key))
+        except OSError as e:
+            print(f"⚠️ Could not write media cache: {e}")
+            return
+        index[key] = {'pages': pages, 'bytes': total, 'last_used': time.time()}
+        self._evict()
+        self._save_index()
+
+    def _remove(self, key: str):
+        self._load_index().pop(key, None)
+        shutil.rmtree(os.path.join(self.cache_dir, key), ignore_errors=True)
+
+    def _evict(self):
+        index = self._load_index()
+        used = sum(e['bytes'] for e in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_used']):
+            if used <= self.max_bytes:
+                break
+            used -= index[key]['bytes']
+            self._remove(key)
+            print(f"🧹 Media cache evicted {key[:12]}")
+
+    def total_bytes(self) -> int:
+        return sum(e['bytes'] for e in self._load_index().values())
+
+
+if __name__ == "__main__":
+    # Test media cache
+    cache = MediaCache()
+    print(f"Media cache: {len(cache._load_index())} entries, {cache.total_bytes() // 1024} KB")
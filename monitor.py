@@ -6,17 +6,22 @@ Orchestrates all modules for the complete rebrand
 
 import os
 import re
-import json
+import time
+from collections import deque
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional
 
 # Import modules
 from scraper import NoticeScraper
 from cache_manager import CacheManager
+from cache_store import CORRUPTED
 from change_detector import ChangeDetector, ChangeType
 from content_processor import ContentProcessor
-from telegram_utils import TelegramUtils
+from telegram_utils import EDIT_DONE, EDIT_GONE, TelegramUtils
 from dashboard_manager import DashboardManager
+from http_client import HttpClient
+from telegram_dispatcher import TelegramDispatcher
+import serializers
 
 # ─── NOC filter ───────────────────────────────────────────────────────────────
 # Whole-word match for "noc" (case-insensitive) or Bangla "এনওসি"
@@ -29,13 +34,26 @@ def _is_noc_notice(notice: Dict) -> bool:
 
 
 class NoticeMonitor:
-    def __init__(self):
-        self.scraper           = NoticeScraper()
-        self.cache_manager     = CacheManager()
+    def __init__(self, state_format: Optional[str] = None):
+        # log.json / error_state.json / cache snapshot encoding; reads accept any format
+        self.serializer = serializers.get_serializer(state_format)
+
+        # One pooled keep-alive client for the college site, PDF hosts and Telegram
+        self.http              = HttpClient()
+        self.scraper           = NoticeScraper(http=self.http)
+        self.cache_manager     = CacheManager(state_format=self.serializer.name)
         self.change_detector   = ChangeDetector()
-        self.content_processor = ContentProcessor()
-        self.telegram          = TelegramUtils()
+        self.content_processor = ContentProcessor(http=self.http)
+        self.telegram          = TelegramUtils(http=self.http)
         self.dashboard         = DashboardManager(self.telegram)
+        # Notices rendered/uploaded at once; the chat rate limit still applies
+        self.send_workers      = 4
+        # Concurrent label edits per removed notice (see _mark_notice_deleted)
+        self.edit_workers      = 4
+        # Scrape page 1 first and go deeper only when its rows shifted;
+        # every full_scrape_every runs (4 h at 15-minute runs) all pages are read
+        self.incremental_scrape = True
+        self.full_scrape_every  = 16
 
         self.error_file = 'error_state.json'
         self.log_file   = 'log.json'
@@ -46,8 +64,7 @@ class NoticeMonitor:
         """Load error state from file."""
         try:
             if os.path.exists(self.error_file):
-                with open(self.error_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                return serializers.load_file(self.error_file)
         except Exception as e:
             print(f"Error loading error state: {e}")
         return {"last_error": {"type": None, "active": False}}
@@ -55,8 +72,7 @@ class NoticeMonitor:
     def save_error_state(self, data: Dict):
         """Save error state to file."""
         try:
-            with open(self.error_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            serializers.dump_file(self.error_file, data, self.serializer)
         except Exception as e:
             print(f"Error saving error state: {e}")
 
@@ -145,8 +161,7 @@ class NoticeMonitor:
         logs = []
         if os.path.exists(self.log_file):
             try:
-                with open(self.log_file, 'r', encoding='utf-8') as f:
-                    logs = json.load(f)
+                logs = serializers.load_file(self.log_file)
             except Exception:
                 logs = []
 
@@ -154,26 +169,65 @@ class NoticeMonitor:
         if len(logs) > 100:
             logs = logs[-100:]
 
-        with open(self.log_file, 'w', encoding='utf-8') as f:
-            json.dump(logs, f, ensure_ascii=False, indent=2)
+        serializers.dump_file(self.log_file, logs, self.serializer)
 
     # ── Notice processing ──────────────────────────────────────────────────────
 
-    def process_and_send_notice(self, notice: Dict, change_type: ChangeType,
-                                cache_data: Dict) -> bool:
+    def _queue_change(self, dispatcher: TelegramDispatcher, change, cache_data: Dict,
+                      stats: Dict):
         """
-        Process a notice: render images, send to Telegram, track message IDs.
-        Returns True on successful dispatch.
+        Submit one change's send to the dispatcher; returns its future, or
+        None if it was already dispatched this run or could not be queued.
         """
+        notice = change.notice_data
+        # One bad change must not abort the run (and its cache save)
         try:
-            # Dedup guard within a single run
-            if not hasattr(self, '_dispatched_this_run'):
-                self._dispatched_this_run = set()
-            if notice['id'] in self._dispatched_this_run:
-                print(f"Skipping duplicate dispatch for {notice['id']}")
-                return False
-            self._dispatched_this_run.add(notice['id'])
+            if not self._claim_dispatch(change.notice_id):
+                return None
+            print(f"Queueing [{change.change_type.name}]: {notice.get('title', 'Unknown')[:40]}")
+            prev_ids = (self._previous_message_ids(change.notice_id, cache_data)
+                        if change.change_type == ChangeType.REMOVED_FROM_PAGE_1 else {})
+            file_ids = self.cache_manager.get_media_file_ids(change.notice_id, cache_data)
+            return dispatcher.submit(change.notice_id, self._send_notice,
+                                     notice, change.change_type, prev_ids, file_ids)
+        except Exception as e:
+            print(f"Error queueing change for {change.notice_id}: {e}")
+            stats["errors"].append(str(e))
+            return None
+
+    def _claim_dispatch(self, notice_id: str) -> bool:
+        """Dedup guard within a single run."""
+        if not hasattr(self, '_dispatched_this_run'):
+            self._dispatched_this_run = set()
+        if notice_id in self._dispatched_this_run:
+            print(f"Skipping duplicate dispatch for {notice_id}")
+            return False
+        self._dispatched_this_run.add(notice_id)
+        return True
+
+    def _previous_message_ids(self, notice_id: str, cache_data: Dict) -> Dict[int, bool]:
+        """Sent messages of this notice that still need the deleted label → sent as text."""
+        # May come from the archive if the notice has gone cold
+        notice_record = self.cache_manager.get_notice(notice_id, cache_data) or {}
+        edits = self.cache_manager.get_message_edits(notice_id, cache_data)
+        text_ids = set(notice_record.get('text_message_ids', []))
+        return {msg_id: msg_id in text_ids for msg_id in notice_record.get('telegram_message_ids', [])
+                if edits.get(str(msg_id)) not in (EDIT_DONE, EDIT_GONE)}
+
+    def _send_notice(self, notice: Dict, change_type: ChangeType, prev_ids: Dict[int, bool],
+                     file_ids: Optional[Dict[str, str]] = None) -> Dict:
+        """
+        Render and send one notice. Runs on a dispatcher thread, so it never
+        touches cache_data; the returned outcome is applied by
+        _apply_send_outcome on the main thread.
 
+        file_ids is this notice's own copy of its cached media file_ids;
+        ids learned while sending are added to it and returned in the outcome.
+        """
+        file_ids = {} if file_ids is None else file_ids
+        outcome = {"results": [], "removed_msg_id": None, "success": False, "file_ids": file_ids,
+                   "edits": {}, "edit_seconds": 0.0}
+        try:
             download_url = notice.get('download_url', '')
 
             # ── No PDF URL → text-only ────────────────────────────────────────
@@ -182,69 +236,94 @@ class NoticeMonitor:
                 results, _ = self.telegram.send_notice_with_media(
                     notice, change_type.value, [], None
                 )
-                self._record_message_ids(notice['id'], results, cache_data)
-                return len(results) > 0
+                outcome.update(results=results, success=len(results) > 0)
+                return outcome
 
             # ── Download & render ─────────────────────────────────────────────
             print(f"Downloading PDF: {download_url}")
-            images, pdf_hash, file_type = self.content_processor.process_notice_media(notice)
+            image_bytes, pdf_hash, file_type = self.content_processor.process_notice_media(notice)
 
-            # Always get raw PDF bytes (needed for fallback)
-            pdf_bytes, _ = self.content_processor.download_file(download_url)
+            # Downloaded PDF for the fallback — served from the per-run store,
+            # so this does not hit the network again
+            pdf_file = self.content_processor.fetch(download_url)
 
-            image_bytes = self.content_processor.images_to_bytes(images) if images else []
-
-            print(f"Sending {len(image_bytes)} images (PDF fallback available: {bool(pdf_bytes)})")
+            print(f"Sending {len(image_bytes)} images (PDF fallback available: {bool(pdf_file)})")
 
             # ── REMOVED_FROM_PAGE_1 ───────────────────────────────────────────
             if change_type == ChangeType.REMOVED_FROM_PAGE_1:
                 result = self.telegram.send_removed_notification(notice)
                 if result:
                     msg_id = result.get('message_id')
-                    cache_data = self.cache_manager.set_removed_message_id(
-                        notice['id'], msg_id, cache_data
-                    )
+                    outcome["removed_msg_id"] = msg_id
                     # Also edit any previously sent notice messages
-                    self._mark_notice_deleted(notice, cache_data, msg_id)
-                return result is not None
+                    start = time.monotonic()
+                    outcome["edits"] = self._mark_notice_deleted(notice, prev_ids, msg_id)
+                    outcome["edit_seconds"] = time.monotonic() - start
+                outcome["success"] = result is not None
+                return outcome
 
             # ── Normal send ───────────────────────────────────────────────────
-            results, _ = self.telegram.send_notice_with_media(
-                notice, change_type.value, image_bytes, pdf_bytes
-            )
-            self._record_message_ids(notice['id'], results, cache_data)
-            return len(results) > 0
+            # The fallback PDF is streamed from disk, never loaded into memory here
+            if pdf_file:
+                with pdf_file.open() as pdf_fh:
+                    results, _ = self.telegram.send_notice_with_media(
+                        notice, change_type.value, image_bytes, pdf_fh,
+                        file_ids=file_ids, pdf_hash=pdf_file.sha256,
+                    )
+            else:
+                results, _ = self.telegram.send_notice_with_media(
+                    notice, change_type.value, image_bytes, None, file_ids=file_ids
+                )
+            outcome.update(results=results, success=len(results) > 0)
+            return outcome
 
         except Exception as e:
             print(f"Error processing notice {notice.get('id')}: {e}")
             import traceback
             traceback.print_exc()
-            return False
+            return outcome
+
+    def _apply_send_outcome(self, notice_id: str, outcome: Dict, cache_data: Dict) -> bool:
+        """Record a send's message IDs, media file_ids and label edits in the cache (main thread only)."""
+        if outcome.get("removed_msg_id"):
+            self.cache_manager.set_removed_message_id(notice_id, outcome["removed_msg_id"], cache_data)
+        if outcome.get("edits"):
+            self.cache_manager.set_message_edits(notice_id, outcome["edits"], cache_data)
+        self._record_message_ids(notice_id, outcome.get("results", []), cache_data)
+        if outcome.get("file_ids"):
+            self.cache_manager.set_media_file_ids(notice_id, outcome["file_ids"], cache_data)
+        return outcome.get("success", False)
 
     def _record_message_ids(self, notice_id: str, results: List[Dict], cache_data: Dict):
         """Store returned Telegram message IDs in the notice cache entry."""
-        ids = [r.get('message_id') for r in results if r and r.get('message_id')]
-        if ids:
-            self.cache_manager.append_telegram_message_ids(notice_id, ids, cache_data)
+        sent = [r for r in results if r and r.get('message_id')]
+        if sent:
+            # Text messages are labelled with editMessageText (see TelegramUtils.edit_label)
+            self.cache_manager.append_telegram_message_ids(
+                notice_id, [r['message_id'] for r in sent], cache_data,
+                text_ids=[r['message_id'] for r in sent if 'text' in r],
+            )
 
-    def _mark_notice_deleted(self, notice: Dict, cache_data: Dict, removed_msg_id: int):
+    def _mark_notice_deleted(self, notice: Dict, prev_ids: Dict[int, bool], removed_msg_id: int) -> Dict[int, str]:
         """
         Edit all previously sent messages for this notice to add a [DELETED] label,
         then reply to the removed-notice message confirming deletion.
-        """
-        notice_record = cache_data.get('notices', {}).get(notice['id'], {})
-        prev_ids      = notice_record.get('telegram_message_ids', [])
 
-        for msg_id in prev_ids:
-            try:
-                original = (
-                    f"<b>Notice Removed from Front Page</b>\n"
-                    f"<b>{notice.get('title', 'Unknown')}</b>\n"
-                    f"<code>{notice.get('date', 'Unknown')}</code>"
-                )
-                self.telegram.edit_message(msg_id, self.telegram.format_deleted_label(original))
-            except Exception as e:
-                print(f"Could not edit message {msg_id}: {e}")
+        prev_ids (message id → sent as text) excludes messages labelled in
+        earlier runs. The edits overlap, but all go through the chat's rate
+        limiter, so N labels still take about N / CHAT_RATE seconds past the
+        burst; returns {message_id: status}.
+        """
+        original = (
+            f"<b>Notice Removed from Front Page</b>\n"
+            f"<b>{notice.get('title', 'Unknown')}</b>\n"
+            f"<code>{notice.get('date', 'Unknown')}</code>"
+        )
+        label = self.telegram.format_deleted_label(original)
+        statuses = self.telegram.edit_labels(
+            {msg_id: label for msg_id in prev_ids}, self.edit_workers,
+            text_ids={msg_id for msg_id, as_text in prev_ids.items() if as_text},
+        )
 
         # Reply to the removal notification
         if removed_msg_id:
@@ -252,12 +331,27 @@ class NoticeMonitor:
                 removed_msg_id,
                 "This notice has been deleted from the Dhaka College website."
             )
+        return statuses
+
+    @staticmethod
+    def _add_edit_stats(stats: Dict, outcome: Dict):
+        """Fold one notice's label edits into the run's edit stats."""
+        statuses = outcome.get("edits") or {}
+        if not statuses:
+            return
+        edits = stats.setdefault("edits", {"edited": 0, "gone": 0, "failed": 0, "seconds": 0.0})
+        for status in statuses.values():
+            edits[status] = edits.get(status, 0) + 1
+        edits["seconds"] = round(edits["seconds"] + outcome.get("edit_seconds", 0.0), 2)
+        total = edits["edited"] + edits["gone"] + edits["failed"]
+        edits["per_sec"] = round(total / max(edits["seconds"], 0.01), 2)
 
     # ── Main run ──────────────────────────────────────────────────────────────
 
     def run(self) -> Dict:
         """Main execution flow."""
         self._dispatched_this_run = set()
+        self.content_processor.reset_store()
 
         print("=" * 60)
         print(f"The DC Archive — Notice Monitor v2")
@@ -285,17 +379,32 @@ class NoticeMonitor:
 
         # Load cache
         cache_data = self.cache_manager.load_cache()
-
-        # Scrape
+        self.content_processor.url_types = self.cache_manager.get_url_file_types(cache_data)
+
+        # Scrape (conditional: ETag / Last-Modified / body hash from last run)
+        self.scraper.page_validators = self.cache_manager.get_page_validators(cache_data)
+        self.scraper.table_layouts = self.cache_manager.get_table_layouts(cache_data)
+        self.scraper.cached_fingerprint = lambda nid: self.cache_manager.notice_fingerprint(nid, cache_data)
+        previous_page_1_ids = self.cache_manager.get_previous_page_1_ids(cache_data)
+        # Incremental (page 1 first) normally; a full scrape on the first run
+        # and every full_scrape_every runs, to catch edits further down
+        full_scrape = (not self.incremental_scrape or not previous_page_1_ids
+                       or cache_data.get('total_runs', 0) % self.full_scrape_every == 0)
         try:
-            all_notices, page_notices = self.scraper.scrape_all_pages()
+            if full_scrape:
+                all_notices, page_notices = self.scraper.scrape_all_pages()
+            else:
+                all_notices, page_notices = self.scraper.scrape_incremental(previous_page_1_ids)
             stats["pages_scraped"] = len(page_notices)
             stats["total_notices"] = len(all_notices)
 
-            if not all_notices:
-                self.send_error_notification("structure", {"error": "No notices found"})
+            if not all_notices and not self.scraper.all_pages_unchanged:
+                # A page layout never seen before means a redesign, not a broken fetch
+                error_type = "layout" if self.scraper.layout_error else "structure"
+                error = self.scraper.layout_error or "No notices found"
+                self.send_error_notification(error_type, {"error": error})
                 stats["status"] = "error"
-                stats["errors"].append("No notices found")
+                stats["errors"].append(error)
                 return stats
 
         except Exception as e:
@@ -304,6 +413,14 @@ class NoticeMonitor:
             stats["errors"].append(str(e))
             return stats
 
+        if self.scraper.all_pages_unchanged:
+            return self._run_unchanged(cache_data, stats)
+
+        # Archived notices that are back on the scraped pages return to the hot set
+        self.cache_manager.restore_archived([n['id'] for n in all_notices], cache_data)
+        # Verify the records change detection reads before anything parses them
+        self.cache_manager.check_notices(all_notices, cache_data)
+
         # Page 1 IDs
         page_1_notices = page_notices.get(1, [])
         page_1_ids     = {n['id'] for n in page_1_notices}
@@ -334,9 +451,9 @@ class NoticeMonitor:
             file_types[nid] = file_type
             
             if file_type == 'pdf':
-                _, pdf_hash = self.content_processor.download_file(download_url)
-                if pdf_hash:
-                    pdf_hashes[nid] = pdf_hash
+                stored = self.content_processor.fetch(download_url)
+                if stored:
+                    pdf_hashes[nid] = stored.sha256
 
         # Detect changes
         changes = self.change_detector.detect_changes(
@@ -346,61 +463,106 @@ class NoticeMonitor:
         # Send resolved notification if applicable
         self.send_resolved_notification()
 
-        # Process each change
-        new_count        = 0
+        # Process each change: sends run concurrently on the dispatcher (each
+        # notice's messages stay in order); results are applied here, in change order
+        queued_new       = 0
+        held_new         = []
         page_1_ids_set   = set(n['id'] for n in page_1_notices)
+        submitted        = deque()
 
-        for change in changes:
-            notice = change.notice_data
-
-            # ── NOC filter ─────────────────────────────────────────────────────
-            if _is_noc_notice(notice):
-                print(f"[NOC BLOCKED] {notice.get('title', 'Unknown')[:60]}")
-                stats["noc_skipped"] += 1
-                continue
-
-            # Only process NEW notices that were on page 1
-            if change.change_type == ChangeType.NEW:
-                if change.notice_id not in page_1_ids_set:
-                    print(f"Skipping NEW notice not from page 1: {notice.get('title', 'Unknown')[:30]}")
-                    continue
-                if new_count >= 10:
-                    print("Reached limit of 10 new notices per run")
-                    continue
-
-            try:
-                print(f"Processing [{change.change_type.name}]: {notice.get('title', 'Unknown')[:40]}")
-                success = self.process_and_send_notice(notice, change.change_type, cache_data)
-
-                if success:
+        # One capped render pool for all notices, started here on the main thread
+        self.content_processor.render_pool()
+        try:
+            with TelegramDispatcher(self.send_workers) as dispatcher:
+                for change in changes:
+                    notice = change.notice_data
+
+                    # A record that could not be read has nothing to label or resend
+                    if notice.get('status') == CORRUPTED:
+                        print(f"Skipping [{change.change_type.name}] for unreadable notice {change.notice_id}")
+                        continue
+
+                    # ── NOC filter ─────────────────────────────────────────────
+                    if _is_noc_notice(notice):
+                        print(f"[NOC BLOCKED] {notice.get('title', 'Unknown')[:60]}")
+                        stats["noc_skipped"] += 1
+                        continue
+
+                    # Only process NEW notices that were on page 1
                     if change.change_type == ChangeType.NEW:
-                        stats["new_count"] += 1
-                        new_count += 1
-                    elif change.change_type == ChangeType.EDITED:
-                        stats["edited_count"] += 1
-                    elif change.change_type == ChangeType.PDF_REPLACED:
-                        stats["pdf_replaced_count"] += 1
-                    elif change.change_type == ChangeType.REMOVED_FROM_PAGE_1:
-                        stats["removed_count"] += 1
-
-            except Exception as e:
-                print(f"Error sending change notification: {e}")
-                stats["errors"].append(str(e))
-
-        # Update cache
-        for notice in all_notices:
-            nid = notice['id']
-            was_on_page_1 = nid in page_1_ids
-            ftype = file_types.get(nid, 'unknown') if not _is_noc_notice(notice) else 'unknown'
-            
-            cache_data = self.cache_manager.update_notice(
-                notice, cache_data,
-                pdf_hash=pdf_hashes.get(nid),
-                file_type=ftype,
-                was_on_page_1=was_on_page_1,
-            )
+                        if change.notice_id not in page_1_ids_set:
+                            print(f"Skipping NEW notice not from page 1: {notice.get('title', 'Unknown')[:30]}")
+                            continue
+                        if queued_new >= 10:
+                            # Sent only if a queued NEW fails: the limit counts sends
+                            print(f"Reached limit of 10 new notices per run, holding: "
+                                  f"{notice.get('title', 'Unknown')[:30]}")
+                            held_new.append(change)
+                            continue
+
+                    future = self._queue_change(dispatcher, change, cache_data, stats)
+                    if future is not None:
+                        submitted.append((change, future))
+                        if change.change_type == ChangeType.NEW:
+                            queued_new += 1
+
+                # Update cache while the sends run, so NEW notices have a record
+                # for their message IDs and file_ids by the time results arrive
+                for notice in all_notices:
+                    nid = notice['id']
+                    was_on_page_1 = nid in page_1_ids
+                    ftype = file_types.get(nid, 'unknown') if not _is_noc_notice(notice) else 'unknown'
+
+                    cache_data = self.cache_manager.update_notice(
+                        notice, cache_data,
+                        pdf_hash=pdf_hashes.get(nid),
+                        file_type=ftype,
+                        was_on_page_1=was_on_page_1,
+                    )
+
+                while submitted:
+                    change, future = submitted.popleft()
+                    try:
+                        outcome = future.result()
+                        success = self._apply_send_outcome(change.notice_id, outcome, cache_data)
+                        self._add_edit_stats(stats, outcome)
+
+                        if success:
+                            if change.change_type == ChangeType.NEW:
+                                stats["new_count"] += 1
+                            elif change.change_type == ChangeType.EDITED:
+                                stats["edited_count"] += 1
+                            elif change.change_type == ChangeType.PDF_REPLACED:
+                                stats["pdf_replaced_count"] += 1
+                            elif change.change_type == ChangeType.REMOVED_FROM_PAGE_1:
+                                stats["removed_count"] += 1
+
+                    except Exception as e:
+                        print(f"Error sending change notification: {e}")
+                        stats["errors"].append(str(e))
+                        success = False
+
+                    # A failed NEW send frees its slot for a held one
+                    if change.change_type == ChangeType.NEW and not success:
+                        while held_new:
+                            held = held_new.pop(0)
+                            future = self._queue_change(dispatcher, held, cache_data, stats)
+                            if future is not None:
+                                submitted.append((held, future))
+                                break
+        finally:
+            self.content_processor.shutdown_render_pool()
+
+        # Notices gone from the site are the first to be archived
+        for change in changes:
+            if (change.change_type == ChangeType.REMOVED_FROM_PAGE_1
+                    and change.notice_data.get('status') != CORRUPTED):
+                cache_data = self.cache_manager.mark_notice_removed(change.notice_id, cache_data)
 
         cache_data = self.cache_manager.set_previous_page_1_ids(list(page_1_ids), cache_data)
+        cache_data = self.cache_manager.set_page_validators(self.scraper.page_validators, cache_data)
+        cache_data = self.cache_manager.set_url_file_types(self.content_processor.url_types, cache_data)
+        cache_data = self.cache_manager.set_table_layouts(self.scraper.table_layouts, cache_data)
         cache_data = self.cache_manager.increment_uptime_streak(cache_data)
         cache_data = self.cache_manager.record_run(cache_data)
         if stats["new_count"] > 0:
@@ -418,27 +580,65 @@ class NoticeMonitor:
         # Save cache
         self.cache_manager.save_cache(cache_data)
 
-        # Log run
+        return self._finish_run(stats)
+
+    def _run_unchanged(self, cache_data: Dict, stats: Dict) -> Dict:
+        """
+        Fast path for a run where every scraped page is unchanged since the
+        last run: no parsing, no change detection, no notice updates. Only the
+        run counters, dashboard and conditional-fetch validators are refreshed.
+        """
+        stats["pages_scraped"]  = self.scraper.pages_checked
+        stats["total_notices"]  = len(cache_data.get('notices', {}))
+        stats["page_unchanged"] = True
+
+        self.send_resolved_notification()
+
+        cache_data = self.cache_manager.set_page_validators(self.scraper.page_validators, cache_data)
+        cache_data = self.cache_manager.increment_uptime_streak(cache_data)
+        cache_data = self.cache_manager.record_run(cache_data)
+
+        dashboard_stats = self.dashboard.calculate_stats(
+            cache_data, [], [], stats["pages_scraped"], self.load_error_state()
+        )
+        message_id = self.dashboard.create_or_update_dashboard(cache_data, dashboard_stats)
+        if message_id:
+            cache_data = self.cache_manager.set_dashboard_message_id(message_id, cache_data)
+
+        self.cache_manager.save_cache(cache_data)
+
+        return self._finish_run(stats)
+
+    def _finish_run(self, stats: Dict) -> Dict:
+        """Log a successful run, with per-host HTTP timings, and print the summary."""
         stats["status"] = "success"
+        stats["http_timings"] = self.http.timing_report()
         self.log_run(stats)
+        self._print_summary(stats)
+        return stats
 
-        # Print summary
+    def _print_summary(self, stats: Dict):
         print("\n" + "=" * 60)
         print("RUN SUMMARY")
         print("=" * 60)
         print(f"Status:          {stats['status']}")
         print(f"Pages scraped:   {stats['pages_scraped']}")
+        if stats.get('page_unchanged'):
+            print("Pages unchanged: yes (parse skipped)")
         print(f"Total notices:   {stats['total_notices']}")
         print(f"New:             {stats['new_count']}")
         print(f"Edited:          {stats['edited_count']}")
         print(f"PDF replaced:    {stats['pdf_replaced_count']}")
         print(f"Removed pg1:     {stats['removed_count']}")
         print(f"NOC blocked:     {stats['noc_skipped']}")
+        if stats.get('edits'):
+            edits = stats['edits']
+            print(f"Label edits:     {edits['edited']} edited, {edits['gone']} gone, "
+                  f"{edits['failed']} failed ({edits['per_sec']}/s)")
         if stats['errors']:
             print(f"Errors:          {len(stats['errors'])}")
         print("=" * 60)
-
-        return stats
+        self.http.print_timings()
 
 
 if __name__ == "__main__":
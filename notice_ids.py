@@ -0,0 +1,57 @@
+"""
+Notice IDs for Dhaka College Notice Monitor
+Stable ids from a notice's download URL, with a content fingerprint for the rest
+"""
+
+import hashlib
+from typing import Optional
+from urllib.parse import unquote, urlsplit
+
+
+def _hex(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def url_key(download_url: Optional[str]) -> Optional[str]:
+    """
+    The part of a download URL that identifies the file on the server: the
+    decoded path (plus query), so http/https, host aliases and percent
+    encoding do not change it. None without a usable path.
+    """
+    if not download_url:
+        return None
+    parts = urlsplit(download_url)
+    path = unquote(parts.path).rstrip('/')
+    if not path:
+        return None
+    return f"{path}?{parts.query}" if parts.query else path
+
+
+def content_fingerprint(title: str, date: str) -> str:
+    """Short fingerprint of a row's visible content (title and date)."""
+    return hashlib.blake2b(f"{title}\x1f{date}".encode('utf-8'), digest_size=8).hexdigest()
+
+
+def notice_id(download_url: Optional[str], title: str, date: str) -> str:
+    """
+    Id of a notice row: from its download URL when it has one, so an edited
+    title or date keeps the id (and is reported as EDITED); rows without a
+    link fall back to their content fingerprint.
+    """
+    key = url_key(download_url)
+    if key:
+        return _hex(f"url:{key}")
+    return _hex(f"row:{content_fingerprint(title, date)}")
+
+
+def disambiguated_id(base_id: str, fingerprint: str) -> str:
+    """Id for a second, different row that links the same file as base_id."""
+    return _hex(f"{base_id}#{fingerprint}")
+
+
+if __name__ == "__main__":
+    a = notice_id("https://www.dhakacollege.edu.bd/storage/notices/101.pdf", "Exam routine", "01-10-2026")
+    b = notice_id("http://dhakacollege.edu.bd/storage/notices/101.pdf", "Exam routine (revised)", "02-10-2026")
+    c = notice_id("", "Exam routine", "01-10-2026")
+    assert a == b and a != c
+    print(f"✅ url id {a}, row id {c}")
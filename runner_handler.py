@@ -1,9 +1,10 @@
 import os
-import json
 import urllib.request
 import urllib.parse
 import html  # Added for safe HTML escaping
 
+import serializers
+
 # Configuration
 ERROR_FILE = 'error_state.json'
 TOKEN = os.environ.get('TELEGRAM_TOKEN')
@@ -12,16 +13,14 @@ CHAT_ID = os.environ.get('TELEGRAM_CHAT_ID')
 def load_error_state():
     if os.path.exists(ERROR_FILE):
         try:
-            with open(ERROR_FILE, 'r') as f:
-                return json.load(f)
+            return serializers.load_file(ERROR_FILE)
         except:
             pass
     return {"last_error": {}, "previous_error": {}}
 
 def save_error_state(data):
     try:
-        with open(ERROR_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        serializers.dump_file(ERROR_FILE, data)
     except Exception as e:
         print(f"Failed to save error state: {e}")
 
@@ -1,34 +1,160 @@
 """
 Multi-page scraper for Dhaka College Notice Board
-Scrapes up to 3 pages to detect page-1 notice removals
+Scrapes up to max_pages pages (3 by default) to detect page-1 notice removals
 """
 
 import requests
 from bs4 import BeautifulSoup
 import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from http_client import HttpClient, get_shared_client
+from notice_ids import content_fingerprint, disambiguated_id, notice_id
+
+try:
+    from lxml import html as lxml_html  # fast path; BeautifulSoup is the fallback
+except ImportError:
+    lxml_html = None
+
+
+SITE_ROOT = "https://www.dhakacollege.edu.bd"
+
+# CSS selector for the notice table body (BeautifulSoup engine)
+TBODY_SELECTOR = ("body > main > section > div.mt-6.flex.flex-col.gap-4.md\\:mt-8.md\\:gap-6"
+                  ".lg\\:mt-10.lg\\:gap-8 > div > table > tbody")
+ROW_CLASS = 'hover:bg-gray-50'
+
+
+def _xpath_class(*names: str) -> str:
+    """XPath predicate: the element's class attribute contains every name."""
+    return " and ".join(f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')" for name in names)
+
+
+# The same path as TBODY_SELECTOR, for the lxml engine
+TBODY_XPATH = (
+    "/html/body/main/section/div[" + _xpath_class(
+        'mt-6', 'flex', 'flex-col', 'gap-4', 'md:mt-8', 'md:gap-6', 'lg:mt-10', 'lg:gap-8') +
+    "]/div/table/tbody"
+)
+
+# Learned notice-table paths kept, one per page layout fingerprint
+LAYOUT_LIMIT = 8
+# Levels below <body> that make up a page's layout fingerprint: enough for the
+# page wrappers, not the notice rows or menu entries
+SKELETON_DEPTH = 3
+
+
+def _row_xpath(row_class: str) -> str:
+    return f".//tr[{_xpath_class(row_class)}]"
+
+
+def layout_fingerprint(doc) -> str:
+    """
+    Structural fingerprint of a parsed page: tags and classes of the top
+    SKELETON_DEPTH levels under <body>. Notice content does not change it;
+    a redesign of the page wrappers does.
+    """
+    parts = []
+
+    def walk(element, depth):
+        for child in element:
+            if not isinstance(child.tag, str):
+                continue    # comments, processing instructions
+            classes = ".".join(sorted((child.get('class') or '').split()))
+            parts.append(f"{depth}:{child.tag}.{classes}")
+            if depth < SKELETON_DEPTH:
+                walk(child, depth + 1)
+
+    body = doc.find('body')
+    walk(body if body is not None else doc, 1)
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+
+
+def _lxml_text(element) -> str:
+    """Text of an element as BeautifulSoup's get_text(strip=True) gives it."""
+    return "".join(piece.strip() for piece in element.itertext())
 
 
 class NoticeScraper:
-    def __init__(self):
+    def __init__(self, max_pages: int = 3, concurrent: bool = True,
+                 http: Optional[HttpClient] = None):
         self.base_url = "https://www.dhakacollege.edu.bd/en/notice"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
         self.timeout = 10
-        self.max_pages = 3
-    
-    def fetch_page(self, page_num: int = 1) -> Optional[str]:
-        """Fetch a specific page of the notice board"""
+        self.max_pages = max_pages
+        # Fetch all pages in parallel instead of one round trip after another
+        self.concurrent = concurrent
+        # HTML parser: 'lxml' (fast, notice table only) or 'bs4' (html.parser)
+        self.engine = 'lxml' if lxml_html is not None else 'bs4'
+
+        # Notice-table path learned per page layout fingerprint (lxml engine):
+        # {fingerprint: {'path', 'row_class'}}. Loaded from / saved to the
+        # cache by the monitor. layout_error is set when a page with an
+        # unseen layout has no notice table (a redesign, not a bad fetch).
+        self.table_layouts: Dict[str, Dict] = {}
+        self.layout_error: Optional[str] = None
+
+        # notice id -> title/date fingerprint of its cached record, or None if
+        # not cached; set by the monitor so rows sharing a download URL keep
+        # their ids (see _dedupe)
+        self.cached_fingerprint: Optional[Callable[[str], Optional[str]]] = None
+
+        # Shared keep-alive client; its per-host pool (pool_maxsize) bounds how
+        # many pages of a concurrent scrape get their own connection
+        self.http = http or get_shared_client()
+
+        # Conditional-GET state per page ("1", "2", ...): etag, last_modified
+        # and body_hash from the last run. Loaded from / saved to the cache by
+        # the monitor.
+        self.page_validators: Dict[str, Dict] = {}
+        self.unchanged_pages: Set[int] = set()      # 304 or same body as last run
+        self.not_modified_pages: Set[int] = set()   # 304 only (no body received)
+        self.all_pages_unchanged = False
+        self.pages_checked = 0                      # pages requested by the last scrape
+
+    def fetch_page(self, page_num: int = 1, conditional: bool = True) -> Optional[str]:
+        """
+        Fetch a specific page of the notice board.
+
+        With conditional=True the stored ETag / Last-Modified are sent; a 304
+        reply returns None and marks the page in not_modified_pages. A 200 whose
+        body hashes the same as last run marks the page in unchanged_pages.
+        """
         try:
             if page_num == 1:
                 url = self.base_url
             else:
                 url = f"{self.base_url}?page={page_num}"
-            
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+
+            key = str(page_num)
+            validators = self.page_validators.get(key, {})
+            headers = dict(self.headers)
+            if conditional:
+                if validators.get('etag'):
+                    headers['If-None-Match'] = validators['etag']
+                if validators.get('last_modified'):
+                    headers['If-Modified-Since'] = validators['last_modified']
+
+            response = self.http.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == 304:
+                print(f"📄 Page {page_num} not modified (304)")
+                self.not_modified_pages.add(page_num)
+                self.unchanged_pages.add(page_num)
+                return None
             response.raise_for_status()
+
+            body_hash = hashlib.sha256(response.content).hexdigest()
+            if validators.get('body_hash') == body_hash:
+                self.unchanged_pages.add(page_num)
+            self.page_validators[key] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'body_hash': body_hash,
+            }
             return response.text
         except requests.exceptions.Timeout:
             print(f"❌ Timeout fetching page {page_num}")
@@ -38,83 +164,192 @@ class NoticeScraper:
             return None
     
     def parse_notices(self, html_content: str) -> List[Dict]:
-        """Parse notices from HTML content"""
+        """
+        Parse notices from HTML content. The lxml engine reads only the
+        notice table; BeautifulSoup is used when lxml is unavailable, fails,
+        or finds no rows.
+        """
         if not html_content:
             return []
-        
+
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            notices = []
-            
-            # Primary selector
-            tbody = soup.select_one("body > main > section > div.mt-6.flex.flex-col.gap-4.md\\:mt-8.md\\:gap-6.lg\\:mt-10.lg\\:gap-8 > div > table > tbody")
-            rows = []
-            
-            if tbody:
-                rows = tbody.find_all('tr', class_='hover:bg-gray-50')
-            
-            # Fallback: look for any table with rows containing 4+ tds
-            if not rows:
-                for table in soup.find_all("table"):
-                    for tr in table.find_all("tr"):
-                        tds = tr.find_all("td")
-                        if len(tds) >= 4:
-                            rows = table.find_all("tr")
-                            break
-                    if rows:
-                        print(f"Used fallback parser for page")
-                        break
-            
+            rows = self._rows_lxml(html_content) if self.engine == 'lxml' else None
             if not rows:
-                return []
-            
-            for row in rows:
-                cells = row.find_all('td')
-                if len(cells) >= 5:
-                    serial = cells[0].get_text(strip=True)
-                    title = cells[1].get_text(strip=True)
-                    date = cells[2].get_text(strip=True)
-                    download_link = ""
-                    
-                    # The link is in the 'Action' column which is now the 5th column (index 4) or last column
-                    link_element = cells[-1].find('a')
-                    if link_element and link_element.get('href'):
-                        download_link = link_element.get('href')
-                        # Handle relative URLs
-                        if download_link.startswith('/'):
-                            download_link = f"https://www.dhakacollege.edu.bd{download_link}"
-                    
-                    # Generate unique ID
-                    notice_id = hashlib.md5(f"{title}{date}{download_link}".encode()).hexdigest()
-                    
-                    notice = {
-                        "id": notice_id,
-                        "serial": serial,
-                        "title": title,
-                        "date": date,
-                        "download_url": download_link,
-                        "timestamp": datetime.now(timezone(timedelta(hours=6))).isoformat()
-                    }
-                    notices.append(notice)
-            
-            return notices
-        
+                rows = self._rows_bs4(html_content)
+            return [self._make_notice(*row) for row in rows]
+
         except Exception as e:
             print(f"❌ Error parsing notices: {e}")
             return []
-    
+
+    def _rows_lxml(self, html_content: str) -> Optional[List[Tuple[str, str, str, str]]]:
+        """(serial, title, date, href) per notice row via lxml; None if lxml fails."""
+        if lxml_html is None:
+            return None
+        try:
+            doc = lxml_html.document_fromstring(html_content)
+        except (ValueError, TypeError) as e:
+            print(f"⚠️ lxml could not parse page ({e}), using BeautifulSoup")
+            return None
+
+        # Learned path for this layout first: one lookup, then the rows
+        fingerprint = layout_fingerprint(doc)
+        known_layout = fingerprint in self.table_layouts
+        rows = self._learned_rows(doc, self.table_layouts[fingerprint]) if known_layout else []
+
+        if not rows:
+            rows, layout = self._discover_rows(doc)
+            if layout:
+                if self.table_layouts and not known_layout:
+                    print(f"🧭 Page layout changed ({fingerprint}), learned notice table at {layout['path']}")
+                self._learn_layout(fingerprint, layout)
+            elif self.table_layouts and not known_layout:
+                self.layout_error = f"Page layout changed ({fingerprint}), notice table not found"
+
+        parsed = []
+        for row in rows:
+            cells = row.findall('.//td')
+            if len(cells) >= 5:
+                link = cells[-1].find('.//a')
+                parsed.append((_lxml_text(cells[0]), _lxml_text(cells[1]), _lxml_text(cells[2]),
+                               link.get('href') if link is not None else None))
+        return parsed
+
+    def _learned_rows(self, doc, layout: Dict) -> list:
+        """Rows under the learned table path, or [] if it no longer matches."""
+        found = doc.xpath(layout['path'])
+        if not found:
+            return []
+        if layout.get('row_class'):
+            return found[0].xpath(_row_xpath(layout['row_class']))
+        return list(found[0].iter('tr'))
+
+    def _discover_rows(self, doc) -> Tuple[list, Optional[Dict]]:
+        """Find the notice rows by selector, then by table scan; returns (rows, layout to learn)."""
+        # Primary path
+        tbodies = doc.xpath(TBODY_XPATH)
+        if tbodies:
+            rows = tbodies[0].xpath(_row_xpath(ROW_CLASS))
+            if rows:
+                return rows, {'path': doc.getroottree().getpath(tbodies[0]), 'row_class': ROW_CLASS}
+
+        # Fallback: look for any table with rows containing 4+ tds
+        for table in doc.iter('table'):
+            if any(len(tr.findall('.//td')) >= 4 for tr in table.iter('tr')):
+                print("Used fallback parser for page")
+                return list(table.iter('tr')), {'path': doc.getroottree().getpath(table), 'row_class': None}
+        return [], None
+
+    def _learn_layout(self, fingerprint: str, layout: Dict):
+        self.table_layouts.pop(fingerprint, None)
+        self.table_layouts[fingerprint] = layout
+        while len(self.table_layouts) > LAYOUT_LIMIT:
+            del self.table_layouts[next(iter(self.table_layouts))]
+
+    def _rows_bs4(self, html_content: str) -> List[Tuple[str, str, str, str]]:
+        """(serial, title, date, href) per notice row via BeautifulSoup's html.parser."""
+        soup = BeautifulSoup(html_content, 'html.parser')
+
+        # Primary selector
+        tbody = soup.select_one(TBODY_SELECTOR)
+        rows = []
+
+        if tbody:
+            rows = tbody.find_all('tr', class_=ROW_CLASS)
+
+        # Fallback: look for any table with rows containing 4+ tds
+        if not rows:
+            for table in soup.find_all("table"):
+                for tr in table.find_all("tr"):
+                    tds = tr.find_all("td")
+                    if len(tds) >= 4:
+                        rows = table.find_all("tr")
+                        break
+                if rows:
+                    print("Used fallback parser for page")
+                    break
+
+        parsed = []
+        for row in rows:
+            cells = row.find_all('td')
+            if len(cells) >= 5:
+                # The link is in the 'Action' column which is now the 5th column (index 4) or last column
+                link_element = cells[-1].find('a')
+                parsed.append((cells[0].get_text(strip=True), cells[1].get_text(strip=True),
+                               cells[2].get_text(strip=True),
+                               link_element.get('href') if link_element else None))
+        return parsed
+
+    def _make_notice(self, serial: str, title: str, date: str, href: Optional[str]) -> Dict:
+        """Notice dict for one parsed table row."""
+        download_link = ""
+        if href:
+            download_link = href
+            # Handle relative URLs
+            if download_link.startswith('/'):
+                download_link = f"{SITE_ROOT}{download_link}"
+
+        # Stable ID from the download URL (see notice_ids.py); the fingerprint
+        # tells apart different rows that link the same file
+        return {
+            "id": notice_id(download_link, title, date),
+            "fingerprint": content_fingerprint(title, date),
+            "serial": serial,
+            "title": title,
+            "date": date,
+            "download_url": download_link,
+            "timestamp": datetime.now(timezone(timedelta(hours=6))).isoformat()
+        }
+
+    def _fetch_pages(self, page_nums: List[int], conditional: bool = True) -> List[Optional[str]]:
+        """Fetch several pages, in parallel when concurrent mode is on. Results keep page order."""
+        if not self.concurrent or len(page_nums) < 2:
+            fetched = []
+            for page_num in page_nums:
+                html_content = self.fetch_page(page_num, conditional)
+                fetched.append(html_content)
+                # A failed page ends the scrape, so don't fetch past it
+                if not html_content and page_num not in self.not_modified_pages:
+                    break
+            return fetched
+
+        print(f"📄 Fetching pages {page_nums[0]}-{page_nums[-1]} concurrently...")
+        with ThreadPoolExecutor(max_workers=len(page_nums)) as pool:
+            return list(pool.map(lambda n: self.fetch_page(n, conditional), page_nums))
+
     def scrape_all_pages(self) -> Tuple[List[Dict], Dict[int, List[Dict]]]:
         """
         Scrape all pages up to max_pages
         Returns: (all_notices, page_notices_dict)
+
+        When every page is unchanged since the last run (304 or identical body),
+        nothing is parsed: all_pages_unchanged is set and ([], {}) is returned.
         """
         all_notices = []
         page_notices = {}
-        
-        for page_num in range(1, self.max_pages + 1):
+        self._reset_scrape_state()
+
+        page_nums = list(range(1, self.max_pages + 1))
+        fetched = self._fetch_pages(page_nums)
+        self.pages_checked = len(fetched)
+
+        if self.page_validators and self.unchanged_pages.issuperset(page_nums):
+            print("📄 All pages unchanged since last run, skipping parse")
+            self.all_pages_unchanged = True
+            return [], {}
+
+        # Something changed: pages answered with 304 carry no body, fetch them in full
+        refetch = [n for n in page_nums[:len(fetched)] if n in self.not_modified_pages]
+        if refetch:
+            for page_num, html_content in zip(refetch, self._fetch_pages(refetch, conditional=False)):
+                fetched[page_num - 1] = html_content
+
+        for page_num in page_nums:
             print(f"📄 Scraping page {page_num}...")
-            html_content = self.fetch_page(page_num)
-            
+            html_content = fetched[page_num - 1] if page_num <= len(fetched) else None
+
+            # The first failed or empty page ends the scrape, even if later
+            # pages were already fetched
             if not html_content:
                 print(f"⚠️ Could not fetch page {page_num}, stopping")
                 break
@@ -129,20 +364,127 @@ class NoticeScraper:
             all_notices.extend(notices)
             print(f"✅ Page {page_num}: {len(notices)} notices found")
         
-        # Deduplicate by ID (keep first occurrence)
-        seen_ids = set()
-        unique_notices = []
+        return self._dedupe(all_notices), page_notices
+
+    def scrape_incremental(self, known_page_1_ids: Set[str]) -> Tuple[List[Dict], Dict[int, List[Dict]]]:
+        """
+        Scrape page 1, and deeper pages only when page 1's rows shifted.
+        Returns: (notices, page_notices_dict) for the pages fetched.
+
+        New notices only ever appear at the top of page 1. Deeper pages are
+        needed only to tell whether a notice that left page 1 (known_page_1_ids
+        = page 1 of the last run) was pushed down or removed, so pages 2..
+        max_pages are fetched one at a time until every missing notice is
+        found. When page 1 is unchanged (304 or same body) nothing is parsed,
+        all_pages_unchanged is set and ([], {}) is returned after one request.
+        """
+        self._reset_scrape_state()
+        print("📄 Scraping page 1 (incremental)...")
+        html_content = self.fetch_page(1)
+        self.pages_checked = 1
+
+        if 1 in self.unchanged_pages:
+            print("📄 Page 1 unchanged since last run, skipping parse")
+            self.all_pages_unchanged = True
+            return [], {}
+
+        notices = self.parse_notices(html_content) if html_content else []
+        if not notices:
+            print("⚠️ No notices on page 1")
+            return [], {}
+        print(f"✅ Page 1: {len(notices)} notices found")
+
+        page_notices = {1: notices}
+        all_notices = list(notices)
+        missing = set(known_page_1_ids) - self._candidate_ids(notices)
+
+        page_num = 2
+        while missing and page_num <= self.max_pages:
+            print(f"📄 {len(missing)} notice(s) left page 1, checking page {page_num}...")
+            # The rows are needed, so a 304 would only cost another round trip
+            html_content = self.fetch_page(page_num, conditional=False)
+            self.pages_checked += 1
+            notices = self.parse_notices(html_content) if html_content else []
+            if not notices:
+                print(f"📄 Page {page_num} has no notices, stopping")
+                break
+            page_notices[page_num] = notices
+            all_notices.extend(notices)
+            missing -= self._candidate_ids(notices)
+            print(f"✅ Page {page_num}: {len(notices)} notices found")
+            page_num += 1
+
+        return self._dedupe(all_notices), page_notices
+
+    def _reset_scrape_state(self):
+        self.unchanged_pages = set()
+        self.not_modified_pages = set()
+        self.all_pages_unchanged = False
+        self.layout_error = None
+        self.pages_checked = 0
+
+    def _dedupe(self, all_notices: List[Dict]) -> List[Dict]:
+        """
+        Deduplicate by ID (keep first occurrence). Different rows that link the
+        same file get ids of their own, decided by the cache, not by position:
+        a row whose disambiguated id is already cached keeps it; of the rest,
+        the row matching the cached record's title/date keeps the base id,
+        else the lowest one on the page (the oldest; new rows appear at the
+        top of page 1). The other rows get disambiguated ids.
+        """
+        rows_by_base: Dict[str, List[Dict]] = {}
         for notice in all_notices:
+            rows = rows_by_base.setdefault(notice['id'], [])
+            if all(row.get('fingerprint') != notice.get('fingerprint') for row in rows):
+                rows.append(notice)
+
+        assigned: Dict[Tuple[str, Optional[str]], str] = {}
+        for base_id, rows in rows_by_base.items():
+            assigned.update(self._assign_ids(base_id, rows))
+
+        unique_notices, seen_ids = [], set()
+        for notice in all_notices:
+            # Repeated rows (the same row on two pages) get the same id
+            notice['id'] = assigned.get((notice['id'], notice.get('fingerprint')), notice['id'])
             if notice['id'] not in seen_ids:
                 seen_ids.add(notice['id'])
                 unique_notices.append(notice)
-        
+
         print(f"📊 Total unique notices: {len(unique_notices)}")
-        return unique_notices, page_notices
+        return unique_notices
+
+    def _assign_ids(self, base_id: str, rows: List[Dict]) -> Dict[Tuple[str, Optional[str]], str]:
+        """Ids for the distinct rows (page order) sharing base_id, keyed by (base id, fingerprint)."""
+        known = self.cached_fingerprint or (lambda notice_id: None)
+        ids, rest = {}, []
+        for row in rows:
+            own_id = disambiguated_id(base_id, row.get('fingerprint'))
+            if known(own_id) is not None:
+                ids[(base_id, row.get('fingerprint'))] = own_id
+            else:
+                rest.append(row)
+        if not rest:
+            return ids
+
+        base_fingerprint = known(base_id)
+        keeper = next((row for row in rest if row.get('fingerprint') == base_fingerprint), rest[-1])
+        for row in rest:
+            ids[(base_id, row.get('fingerprint'))] = (
+                base_id if row is keeper else disambiguated_id(base_id, row.get('fingerprint')))
+        return ids
+
+    @staticmethod
+    def _candidate_ids(notices: List[Dict]) -> Set[str]:
+        """Every id the rows could get from _dedupe (base or disambiguated)."""
+        ids = set()
+        for notice in notices:
+            ids.add(notice['id'])
+            ids.add(disambiguated_id(notice['id'], notice.get('fingerprint')))
+        return ids
     
     def get_page_1_notices(self) -> List[Dict]:
         """Get only page 1 notices (for quick checks)"""
-        html_content = self.fetch_page(1)
+        html_content = self.fetch_page(1, conditional=False)
         if html_content:
             return self.parse_notices(html_content)
         return []
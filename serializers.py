@@ -0,0 +1,132 @@
+"""
+State Serializers for Dhaka College Notice Monitor
+Pluggable on-disk encodings for notice_cache.json, log.json and error_state.json
+"""
+
+import os
+import gzip
+import json
+from typing import Any, Dict
+
+try:
+    import msgpack  # optional: only used when installed
+except ImportError:
+    msgpack = None
+
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Encoding used for new writes; STATE_FORMAT overrides it (e.g. in the workflow)
+DEFAULT_FORMAT = os.environ.get('STATE_FORMAT', 'json-compact')
+
+
+class JsonSerializer:
+    """Plain JSON. indent=2 is the original human-readable layout."""
+
+    def __init__(self, name: str, indent=None):
+        self.name = name
+        self.indent = indent
+
+    def dumps(self, obj: Any) -> bytes:
+        if self.indent:
+            text = json.dumps(obj, ensure_ascii=False, indent=self.indent)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, separators=(',', ':'))
+        return text.encode('utf-8')
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw.decode('utf-8'))
+
+    def open_stream(self, path: str, mode: str = 'rb'):
+        """Binary file object for streaming already-serialized JSON text."""
+        return open(path, mode)
+
+
+class GzipJsonSerializer(JsonSerializer):
+    """Minified JSON, gzip-compressed (mtime pinned so equal data gives equal bytes)."""
+
+    def __init__(self, name: str = 'json-gz', level: int = 6):
+        super().__init__(name)
+        self.level = level
+
+    def open_stream(self, path: str, mode: str = 'rb'):
+        return gzip.GzipFile(path, mode, compresslevel=self.level, mtime=0)
+
+    def dumps(self, obj: Any) -> bytes:
+        return gzip.compress(super().dumps(obj), compresslevel=self.level, mtime=0)
+
+    def loads(self, raw: bytes) -> Any:
+        return super().loads(gzip.decompress(raw))
+
+
+class MsgpackSerializer:
+    """Binary msgpack; available only when the msgpack package is installed."""
+
+    name = 'msgpack'
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, raw: bytes) -> Any:
+        return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+
+
+SERIALIZERS: Dict[str, Any] = {
+    'json':         JsonSerializer('json', indent=2),
+    'json-compact': JsonSerializer('json-compact'),
+    'json-gz':      GzipJsonSerializer(),
+}
+if msgpack is not None:
+    SERIALIZERS['msgpack'] = MsgpackSerializer()
+
+
+def get_serializer(name: str = None):
+    """Serializer by name; unknown or unavailable names fall back to json-compact."""
+    name = name or DEFAULT_FORMAT
+    if name not in SERIALIZERS:
+        print(f"⚠️ State format '{name}' not available, using json-compact")
+        name = 'json-compact'
+    return SERIALIZERS[name]
+
+
+def detect(raw: bytes):
+    """Serializer that can read raw, judged from its first bytes."""
+    if raw[:2] == GZIP_MAGIC:
+        return SERIALIZERS['json-gz']
+    head = raw.lstrip()[:1]
+    if head in (b'{', b'[', b'"') or not head:
+        return SERIALIZERS['json-compact']
+    if 'msgpack' in SERIALIZERS:
+        return SERIALIZERS['msgpack']
+    raise ValueError("state file is not JSON/gzip and msgpack is not installed")
+
+
+def detect_file(path: str):
+    """Serializer for the file at path, judged from its first bytes."""
+    with open(path, 'rb') as f:
+        return detect(f.read(64))
+
+
+def load_file(path: str) -> Any:
+    """Read a state file in whichever supported format it was written."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return detect(raw).loads(raw)
+
+
+def dump_file(path: str, obj: Any, serializer=None):
+    """Write a state file atomically (temp file + rename)."""
+    serializer = serializer or get_serializer()
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(serializer.dumps(obj))
+    os.replace(tmp, path)
+
+
+if __name__ == "__main__":
+    # Round-trip every available format
+    sample = {"notices": {"a1": {"title": "পরীক্ষার নোটিশ", "ids": [1, 2]}}, "n": None}
+    for name, ser in SERIALIZERS.items():
+        raw = ser.dumps(sample)
+        assert detect(raw).loads(raw) == sample
+        print(f"✅ {name}: {len(raw)} bytes")
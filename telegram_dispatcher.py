@@ -0,0 +1,129 @@
+"""
+Telegram Dispatcher for Dhaka College Notice Monitor
+Concurrent send queue with a shared per-chat rate limit and per-notice ordering
+"""
+
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Tuple
+
+
+# Telegram asks bots to stay near one message per second in a single chat;
+# short bursts are tolerated, longer ones get 429 + retry_after
+CHAT_RATE  = 1.0     # requests per second, sustained
+CHAT_BURST = 3       # requests allowed back to back
+
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread sending to one chat. pause() holds
+    all senders back until a 429's retry_after has passed.
+    """
+
+    def __init__(self, rate: float = CHAT_RATE, burst: int = CHAT_BURST):
+        self.rate  = rate
+        self.burst = burst
+        self._tokens       = float(burst)
+        self._updated      = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until one request may be sent."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens  = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Stop all senders for seconds (Telegram's retry_after)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+_Job = Tuple[Future, Callable, tuple, dict]
+
+
+class TelegramDispatcher:
+    """
+    Runs send jobs on a small thread pool. Jobs that share a key (a notice
+    id) run one after another in submission order, so a notice's album,
+    fallback PDF and follow-ups stay in order; different notices overlap.
+
+    submit() returns a Future; the caller applies results (cache updates,
+    stats) on its own thread, so nothing shared is mutated by the workers.
+    """
+
+    def __init__(self, max_workers: int = 4):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='tg-send')
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Deque[_Job]] = {}
+
+    def submit(self, key: str, fn: Callable, *args, **kwargs) -> Future:
+        future: Future = Future()
+        job = (future, fn, args, kwargs)
+        with self._lock:
+            if key in self._pending:
+                # A job for this key is running; this one follows it
+                self._pending[key].append(job)
+                return future
+            self._pending[key] = deque()
+        self._pool.submit(self._run, key, job)
+        return future
+
+    def _run(self, key: str, job: _Job):
+        while True:
+            future, fn, args, kwargs = job
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args, **kwargs))
+                except BaseException as e:
+                    future.set_exception(e)
+            with self._lock:
+                queue = self._pending[key]
+                if not queue:
+                    del self._pending[key]
+                    return
+                job = queue.popleft()
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        return False
+
+
+if __name__ == "__main__":
+    # Test ordering and rate limiting with a fake send
+    limiter = RateLimiter(rate=5, burst=2)
+    log = []
+
+    def send(key, n):
+        limiter.acquire()
+        time.sleep(0.05)
+        log.append((key, n))
+        return n
+
+    start = time.monotonic()
+    with TelegramDispatcher(max_workers=3) as dispatcher:
+        futures = [dispatcher.submit(k, send, k, n) for n in range(3) for k in 'abc']
+        results = [f.result() for f in futures]
+
+    for key in 'abc':
+        assert [n for k, n in log if k == key] == [0, 1, 2]
+    print(f"✅ 9 sends in {time.monotonic() - start:.2f}s, per-key order kept")
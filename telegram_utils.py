@@ -6,10 +6,16 @@ Handles media groups, documents, and dashboard editing.
 import os
 import re
 import json
-import requests
-from typing import Dict, List, Optional, Tuple
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime, timezone, timedelta
 
+from http_client import HttpClient, get_shared_client
+from image_encoder import sniff_image
+from telegram_dispatcher import RateLimiter
+
 
 # ─── Constants ────────────────────────────────────────────────────────────────
 
@@ -26,6 +32,11 @@ _CHANNEL  = "https://t.me/thedcarchive_notice"
 _GITHUB   = "https://github.com/iqtidar314/Dhaka-College-Notice-Update"
 _DISCUSSION = "https://t.me/DcNoticeChat"
 
+# Outcomes of edit_label
+EDIT_DONE   = "edited"     # label applied (or already there)
+EDIT_GONE   = "gone"       # message deleted or too old to edit; never retried
+EDIT_FAILED = "failed"     # anything else; retried on the next removal
+
 # Characters allowed in a PDF filename:
 # Bangla (U+0980–U+09FF), ASCII letters/digits, space, hyphen, underscore, dot
 _SAFE_FILENAME_RE = re.compile(
@@ -58,36 +69,80 @@ def _link_footer() -> str:
     return "".join(parts)
 
 
+def _rewind_files(files: Optional[Dict]):
+    """Seek streamed uploads (file objects) back to the start before a retry."""
+    for value in (files or {}).values():
+        content = value[1] if isinstance(value, tuple) else value
+        if hasattr(content, 'seek'):
+            content.seek(0)
+
+
+def media_hash(content: bytes) -> str:
+    """Key under which a piece of uploaded media's Telegram file_id is kept."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def sent_file_id(message: Optional[Dict], kind: str) -> Optional[str]:
+    """file_id Telegram assigned to the photo (largest size) or document in a sent message."""
+    try:
+        if kind == 'photo':
+            return message['photo'][-1]['file_id']
+        return message[kind]['file_id']
+    except (KeyError, IndexError, TypeError):
+        return None
 
 
 # ─── TelegramUtils ────────────────────────────────────────────────────────────
 
 class TelegramUtils:
-    def __init__(self):
+    def __init__(self, http: Optional[HttpClient] = None):
         self.token   = os.getenv('TELEGRAM_TOKEN')
         self.chat_id = os.getenv('TELEGRAM_CHAT_ID')
         self.api_base = f"https://api.telegram.org/bot{self.token}"
+        self.http     = http or get_shared_client()
+        # Shared by every thread sending to this chat; 429s pause all of them
+        self.rate_limiter = RateLimiter()
+        self.max_rate_limit_retries = 3
 
     # ── Core request ──────────────────────────────────────────────────────────
 
     def _make_request(self, method: str, data: Dict, files: Dict = None) -> Optional[Dict]:
-        """Make a request to the Telegram Bot API."""
+        """
+        Make a request to the Telegram Bot API. Waits for the chat's rate
+        limiter first; a 429 pauses every sender for retry_after and retries.
+        """
+        return self._request(method, data, files)[0]
+
+    def _request(self, method: str, data: Dict,
+                 files: Dict = None) -> Tuple[Optional[Dict], Optional[str]]:
+        """_make_request that also returns Telegram's error description (None on success)."""
         try:
             url = f"{self.api_base}/{method}"
-            response = requests.post(url, data=data, files=files, timeout=60)
-            result = response.json()
-            if result.get('ok'):
-                return result.get('result')
-            print(f"Telegram API error ({method}): {result.get('description')}")
-            print(f"  Response: {result}")
-            return None
+            for attempt in range(self.max_rate_limit_retries + 1):
+                self.rate_limiter.acquire()
+                response = self.http.post(url, data=data, files=files)
+                result = response.json()
+                if result.get('ok'):
+                    return result.get('result'), None
+
+                retry_after = (result.get('parameters') or {}).get('retry_after')
+                if (result.get('error_code') == 429 and retry_after
+                        and attempt < self.max_rate_limit_retries):
+                    print(f"⏳ Telegram rate limit ({method}), retrying in {retry_after}s")
+                    self.rate_limiter.pause(retry_after)
+                    _rewind_files(files)
+                    continue
+
+                print(f"Telegram API error ({method}): {result.get('description')}")
+                print(f"  Response: {result}")
+                return None, result.get('description') or 'unknown error'
         except Exception as e:
             print(f"Error calling {method}: {e}")
             try:
                 print(f"  Response text: {response.text}")
             except Exception:
                 pass
-            return None
+            return None, str(e)
 
     # ── Caption helpers ───────────────────────────────────────────────────────
 
@@ -179,73 +234,118 @@ class TelegramUtils:
 
     # ── Send methods ──────────────────────────────────────────────────────────
 
-    def send_photo(self, photo_bytes: bytes, caption: str,
+    def send_photo(self, photo, caption: str,
                    disable_notification: bool = False) -> Optional[Dict]:
-        """Send a single photo with caption (no inline keyboard)."""
+        """
+        Send a single photo with caption (no inline keyboard).
+        photo is encoded image bytes (PNG or JPEG, see image_encoder), or a str
+        file_id of a photo Telegram already has.
+        """
         data = {
             "chat_id": self.chat_id,
             "caption": caption,   # already safe-truncated by build_*_caption
             "parse_mode": "HTML",
             "disable_notification": disable_notification,
         }
-        files  = {"photo": ("notice.png", photo_bytes, "image/png")}
+        if isinstance(photo, str):
+            data["photo"] = photo
+            files = None
+        else:
+            ext, mime = sniff_image(photo)
+            files = {"photo": (f"notice.{ext}", photo, mime)}
         result = self._make_request("sendPhoto", data, files)
         if result:
             print(f"Photo sent: message_id={result.get('message_id')}")
         return result
 
-    def send_media_group(self, images: List[bytes], notice: Dict, change_type: str,
-                         disable_notification: bool = False) -> Tuple[Optional[List[Dict]], bool]:
+    def send_media_group(self, images: Iterable[bytes], notice: Dict, change_type: str,
+                         disable_notification: bool = False,
+                         file_ids: Optional[Dict[str, str]] = None) -> Tuple[Optional[List[Dict]], bool]:
         """
         Send images as media group albums (max 10 per group).
+        images is a list or a PageStream: len() is the page count, and only
+        one group's pages are taken from it at a time.
+
+        file_ids maps media_hash(image) → Telegram file_id; images found there
+        are referenced instead of uploaded, and ids of newly uploaded images
+        are added to it.
 
         Returns:
             (results_list, all_sent)
             all_sent is True only when every group was delivered successfully.
         """
-        if not images:
+        if not len(images):
             return None, False
 
         results     = []
         total_parts = (len(images) + 9) // 10
         all_sent    = True
+        pages       = iter(images)
 
         for i in range(0, len(images), 10):
-            group  = images[i:i + 10]
+            group  = list(islice(pages, 10))
             part   = (i // 10) + 1
+            if len(group) < min(10, len(images) - i):
+                # The stream ended early (a page failed to render)
+                print(f"Media group FAILED: Part {part}/{total_parts} missing pages")
+                all_sent = False
+                break
             caption = self.build_album_caption(notice, change_type, part, total_parts)
 
-            media = []
-            files = {}
-            for idx, img_bytes in enumerate(group):
-                media.append({
-                    "type":       "photo",
-                    "media":      f"attach://photo{idx}",
-                    "caption":    caption[:1024] if idx == 0 else "",
-                    "parse_mode": "HTML",
-                })
-                files[f"photo{idx}"] = (f"page_{i + idx}.png", img_bytes, "image/png")
-
-            data = {
-                "chat_id":              self.chat_id,
-                "media":                json.dumps(media),
-                "disable_notification": disable_notification,
-            }
-
-            result = self._make_request("sendMediaGroup", data, files)
+            hashes = [media_hash(img) for img in group] if file_ids is not None else []
+            known  = [file_ids.get(h) for h in hashes] if hashes else [None] * len(group)
+
+            result = self._send_album(group, known, caption, i, disable_notification)
+            if result is None and any(known):
+                # A stored file_id may have expired; upload the bytes instead
+                print(f"Cached file_ids rejected, re-uploading Part {part}/{total_parts}")
+                result = self._send_album(group, [None] * len(group), caption, i,
+                                          disable_notification)
+
             if result:
                 print(f"Media group sent: {len(group)} images (Part {part}/{total_parts})")
                 results.extend(result)
+                # Album messages come back in the order the media were given
+                for h, message in zip(hashes, result):
+                    file_id = sent_file_id(message, 'photo')
+                    if file_id:
+                        file_ids[h] = file_id
             else:
                 print(f"Media group FAILED: Part {part}/{total_parts}")
                 all_sent = False
 
         return (results if results else None), all_sent
 
-    def send_document(self, file_bytes: bytes, filename: str,
+    def _send_album(self, group: List[bytes], known: List[Optional[str]], caption: str,
+                    first_index: int, disable_notification: bool) -> Optional[List[Dict]]:
+        """One sendMediaGroup call; images with a known file_id are not uploaded."""
+        media = []
+        files = {}
+        for idx, (img_bytes, file_id) in enumerate(zip(group, known)):
+            media.append({
+                "type":       "photo",
+                "media":      file_id or f"attach://photo{idx}",
+                "caption":    caption[:1024] if idx == 0 else "",
+                "parse_mode": "HTML",
+            })
+            if not file_id:
+                ext, mime = sniff_image(img_bytes)
+                files[f"photo{idx}"] = (f"page_{first_index + idx}.{ext}", img_bytes, mime)
+
+        data = {
+            "chat_id":              self.chat_id,
+            "media":                json.dumps(media),
+            "disable_notification": disable_notification,
+        }
+        return self._make_request("sendMediaGroup", data, files or None)
+
+    def send_document(self, file_bytes, filename: str,
                       caption: str = None,
                       disable_notification: bool = True) -> Optional[Dict]:
-        """Send a PDF document."""
+        """
+        Send a PDF document: bytes, a binary file object opened for reading,
+        or a str file_id of a document Telegram already has.
+        """
         data = {
             "chat_id":                    self.chat_id,
             "caption":                    caption[:1024] if caption else None,
@@ -253,7 +353,11 @@ class TelegramUtils:
             "disable_notification":       disable_notification,
             "disable_content_type_detection": True,
         }
-        files  = {"document": (filename, file_bytes, "application/pdf")}
+        if isinstance(file_bytes, str):
+            data["document"] = file_bytes
+            files = None
+        else:
+            files = {"document": (filename, file_bytes, "application/pdf")}
         result = self._make_request("sendDocument", data, files)
         if result:
             print(f"Document sent: {filename}")
@@ -288,6 +392,59 @@ class TelegramUtils:
             print(f"Message edited: {message_id}")
         return result
 
+    def edit_label(self, message_id: int, text: str, as_text: bool = False) -> str:
+        """
+        Replace a sent message's caption (photos, albums, documents) or, for
+        text messages, its text. The caption edit is tried first unless
+        as_text says the message was sent as text; whichever Telegram rejects
+        for the message's kind is followed by the other. Returns an EDIT_* status.
+        """
+        caption_edit = ("editMessageCaption", {
+            "chat_id":    self.chat_id,
+            "message_id": message_id,
+            "caption":    text[:self._CAPTION_LIMIT],
+            "parse_mode": "HTML",
+        }, 'no caption')
+        text_edit = ("editMessageText", {
+            "chat_id":                  self.chat_id,
+            "message_id":               message_id,
+            "text":                     text,
+            "parse_mode":               "HTML",
+            "disable_web_page_preview": True,
+        }, 'no text')
+        first, second = (text_edit, caption_edit) if as_text else (caption_edit, text_edit)
+        result, error = self._request(first[0], first[1])
+        if error and first[2] in error.lower():
+            result, error = self._request(second[0], second[1])
+        if result:
+            print(f"Message edited: {message_id}")
+            return EDIT_DONE
+        error = (error or '').lower()
+        if 'not modified' in error:
+            # Already carries this label (e.g. edited by an earlier run)
+            return EDIT_DONE
+        if 'not found' in error or "can't be edited" in error:
+            return EDIT_GONE
+        return EDIT_FAILED
+
+    def edit_labels(self, labels: Dict[int, str], max_workers: int = 4,
+                    text_ids=()) -> Dict[int, str]:
+        """
+        Apply edit_label to many messages at once; text_ids were sent as
+        text messages. Requests overlap on a small pool but still go through
+        the chat's rate limiter, which bounds the rate past its burst.
+
+        Returns:
+            {message_id: EDIT_* status}
+        """
+        if not labels:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(labels)),
+                                thread_name_prefix='tg-edit') as pool:
+            futures = {msg_id: pool.submit(self.edit_label, msg_id, text, msg_id in text_ids)
+                       for msg_id, text in labels.items()}
+            return {msg_id: future.result() for msg_id, future in futures.items()}
+
     def reply_to_message(self, reply_to_message_id: int, text: str,
                          disable_notification: bool = False) -> Optional[Dict]:
         """Send a message as a reply to another message."""
@@ -320,10 +477,19 @@ class TelegramUtils:
     # ── High-level notice sender ───────────────────────────────────────────────
 
     def send_notice_with_media(self, notice: Dict, change_type: str,
-                               images: List[bytes],
-                               pdf_bytes: bytes = None) -> Tuple[List[Dict], bool]:
+                               images: Iterable[bytes],
+                               pdf_bytes=None,
+                               file_ids: Optional[Dict[str, str]] = None,
+                               pdf_hash: Optional[str] = None) -> Tuple[List[Dict], bool]:
         """
         Send a complete notice notification.
+        images is a list or a PageStream of encoded pages (see send_media_group).
+        pdf_bytes may be bytes or a binary file object (streamed from disk).
+
+        file_ids (media hash → Telegram file_id, see media_hash; the PDF is
+        keyed by pdf_hash) lets media Telegram already has be re-sent by
+        reference instead of re-uploaded. Ids learned from this send are
+        added to it in place.
 
         PDF delivery policy:
           - 0 images              → always send PDF (if available)
@@ -338,14 +504,21 @@ class TelegramUtils:
 
         if len(images) == 1:
             caption     = self.build_notice_caption(notice, change_type)
-            photo_result = self.send_photo(images[0], caption=caption)
+            image       = next(iter(images), None)
+            photo_result = None
+            if image is not None:
+                photo_result = self._send_known_or_upload(
+                    lambda photo: self.send_photo(photo, caption=caption),
+                    image, media_hash(image) if file_ids is not None else None,
+                    file_ids, 'photo',
+                )
             if photo_result:
                 results.append(photo_result)
                 images_all_sent = True
 
         elif len(images) > 1:
             media_results, images_all_sent = self.send_media_group(
-                images, notice, change_type
+                images, notice, change_type, file_ids=file_ids
             )
             if media_results:
                 results.extend(media_results)
@@ -365,7 +538,11 @@ class TelegramUtils:
         if should_send_pdf:
             title     = notice.get('title', '')
             safe_name = sanitise_filename(title) + ".pdf"
-            doc_result = self.send_document(pdf_bytes, safe_name)
+            doc_result = self._send_known_or_upload(
+                lambda document: self.send_document(document, safe_name),
+                pdf_bytes, pdf_hash if file_ids is not None else None,
+                file_ids, 'document',
+            )
             if doc_result:
                 results.append(doc_result)
                 pdf_sent = True
@@ -406,6 +583,24 @@ class TelegramUtils:
 
         return results, images_all_sent
 
+    def _send_known_or_upload(self, send, content, key: Optional[str],
+                              file_ids: Optional[Dict[str, str]], kind: str) -> Optional[Dict]:
+        """
+        send(file_id) when key has a stored file_id, else (or if Telegram
+        rejects the id) send(content); records the file_id of an upload.
+        """
+        known = file_ids.get(key) if key else None
+        if known:
+            result = send(known)
+            if result:
+                return result
+            print(f"Cached {kind} file_id rejected, re-uploading")
+        result = send(content)
+        file_id = sent_file_id(result, kind)
+        if key and file_id:
+            file_ids[key] = file_id
+        return result
+
     def send_removed_notification(self, notice: Dict) -> Optional[Dict]:
         """Send a removed-from-front-page notification."""
         caption = self.format_removed_caption(notice)
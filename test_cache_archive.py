@@ -0,0 +1,72 @@
+"""
+test_cache_archive.py
+─────────────────────
+Hot/cold tiers: notices restored from the archive leave it once the hot
+copies are saved, so every notice lives in exactly one tier and the
+dashboard's hot + archived total counts each notice once. Notices removed
+from the site are the first to go cold.
+"""
+
+from cache_manager import ARCHIVE_BATCH, CacheManager
+from conftest import make_notice
+
+
+HOT_SIZE = 5
+COUNT = HOT_SIZE + ARCHIVE_BATCH + 3
+
+
+def _tiers(cache_file: str):
+    manager = CacheManager(cache_file, hot_size=HOT_SIZE)
+    data = manager.load_cache()
+    return manager, data, set(data['notices'].keys()), set(manager.archive.notices().keys())
+
+
+def test_restored_notices_leave_the_archive(cache_file, seed):
+    seed([make_notice(n) for n in range(COUNT)], hot_size=HOT_SIZE)
+    manager, data, hot, archived = _tiers(cache_file)
+    assert len(hot) == HOT_SIZE and len(archived) == COUNT - HOT_SIZE
+
+    back = sorted(archived)[:2]
+    assert manager.restore_archived(back, data) == 2
+    assert len(data['notices']) + data['archived_count'] == COUNT
+    assert manager.save_cache(data)
+
+    manager, data, hot, archived = _tiers(cache_file)
+    assert set(back) <= hot and not set(back) & archived
+    assert len(hot) + data['archived_count'] == len(hot | archived) == COUNT
+
+
+def test_restore_without_save_keeps_the_archive_copy(cache_file, seed):
+    seed([make_notice(n) for n in range(COUNT)], hot_size=HOT_SIZE)
+    manager, data, _, archived = _tiers(cache_file)
+    back = sorted(archived)[:1]
+    manager.restore_archived(back, data)
+
+    # The run died before save_cache: the notice must still be somewhere
+    _, _, hot, archived = _tiers(cache_file)
+    assert set(back) <= archived and not set(back) & hot
+
+
+def test_removed_notices_are_archived_first(cache_file):
+    manager = CacheManager(cache_file, hot_size=HOT_SIZE)
+    data = manager.load_cache()
+    for n in range(HOT_SIZE + ARCHIVE_BATCH):
+        manager.update_notice(make_notice(n), data)
+    # The most recently seen notice is gone from the site
+    newest = f"n{HOT_SIZE + ARCHIVE_BATCH - 1}"
+    manager.mark_notice_removed(newest, data)
+    manager.update_notice(make_notice(HOT_SIZE + ARCHIVE_BATCH), data)
+    assert manager.save_cache(data)
+
+    _, _, hot, archived = _tiers(cache_file)
+    assert newest in archived and newest not in hot
+
+
+def test_notice_listed_again_is_no_longer_removed():
+    manager = CacheManager('notice_cache.json')   # nothing is read or written
+    data = {'notices': {}}
+    manager.update_notice(make_notice(1), data)
+    manager.mark_notice_removed('n1', data)
+    assert data['notices']['n1']['status'] == 'removed'
+    manager.update_notice(make_notice(1), data)
+    assert 'status' not in data['notices']['n1'] and 'removed_at' not in data['notices']['n1']
@@ -0,0 +1,81 @@
+"""
+test_cache_integrity.py
+───────────────────────
+Corrupted cache records: an id stays listed whatever its text holds, a
+scraped notice whose record cannot be read is not reported as NEW, and a
+damaged record is recovered from an intact older copy when there is one.
+"""
+
+from cache_manager import CacheManager
+from cache_store import CORRUPTED
+from change_detector import ChangeDetector
+from conftest import make_notice
+
+
+def _damage(cache_file: str, notice_id: str):
+    """Cut a record's line short after its digest, so it no longer parses."""
+    with open(cache_file, 'rb') as f:
+        lines = f.read().split(b'\n')
+    prefix = f'"{notice_id}":'.encode()
+    for i, line in enumerate(lines):
+        if line.startswith(prefix):
+            lines[i] = line[:line.index(b'"title"')] + b'"ti'
+    with open(cache_file, 'wb') as f:
+        f.write(b'\n'.join(lines))
+
+
+def test_unreadable_record_is_not_reported_as_new(cache_file, seed):
+    notices = [make_notice(1), make_notice(2)]
+    seed(notices, on_page_1=True)
+    _damage(cache_file, 'n2')
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    assert 'n2' in data['notices'].keys()
+    manager.check_notices(notices, data)
+    assert data['notices']['n2']['title'] == 'Notice 2'
+
+    changes = ChangeDetector().detect_changes(notices, notices, data)
+    assert changes == []
+    assert manager.save_cache(data)
+
+
+def test_unreadable_record_gone_from_the_page_stays_listed(cache_file, seed):
+    seed([make_notice(1), make_notice(2)], on_page_1=True)
+    _damage(cache_file, 'n2')
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    manager.check_notices([make_notice(1)], data)
+    changes = ChangeDetector().detect_changes([make_notice(1)], [make_notice(1)], data)
+    # Reported as removed, with a placeholder the monitor will not send
+    assert [(c.change_type.name, c.notice_data.get('status')) for c in changes] == \
+        [('REMOVED_FROM_PAGE_1', CORRUPTED)]
+    assert 'n2' in data['notices']
+
+
+def test_damaged_record_recovered_from_an_older_copy(cache_file, seed):
+    seed([make_notice(1), make_notice(2)], on_page_1=True)
+
+    # A later run journals an edit; that journal copy is then damaged
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    manager.update_notice(make_notice(2, 'Notice 2 (revised)'), data, was_on_page_1=True)
+    assert manager.save_cache(data)
+    journal = manager.store.journal_file
+    with open(journal, 'rb') as f:
+        text = f.read()
+    with open(journal, 'wb') as f:
+        f.write(text.replace(b'Notice 2 (revised)', b'Notice 2 (r3vised)'))
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    # Checked at load (it was on page 1), restored from the snapshot copy
+    assert manager.corrupted_ids == ['n2']
+    record = data['notices']['n2']
+    assert record['title'] == 'Notice 2' and record['telegram_message_ids'] == [20]
+    assert manager.save_cache(data)
+
+    reloaded = CacheManager(cache_file)
+    data = reloaded.load_cache()
+    assert not reloaded.corrupted_ids and data['notices']['n2']['title'] == 'Notice 2'
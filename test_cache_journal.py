@@ -0,0 +1,71 @@
+"""
+test_cache_journal.py
+─────────────────────
+Journaled saves: a run that only sees unchanged notices journals none of
+them, journal records are indexed at load and parsed on first use like the
+snapshot's, and a save cut short leaves everything before it readable.
+"""
+
+from cache_manager import CacheManager
+from cache_store import JournalStore
+from conftest import make_notice
+
+
+def _journal_records(manager: CacheManager):
+    return [records for _, records in manager.store._journal_entries()]
+
+
+def test_unchanged_notices_are_not_journaled(cache_file, seed):
+    seed([make_notice(n) for n in range(5)], on_page_1=True)     # first save: full snapshot
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    for n in range(5):
+        manager.update_notice(make_notice(n, 'Notice 0 (revised)' if n == 0 else None), data,
+                              was_on_page_1=True)
+    assert manager.save_cache(data)
+    assert [sorted(records) for records in _journal_records(manager)] == [['n0']]
+
+
+def test_journal_records_are_parsed_on_first_use(cache_file, seed):
+    manager = seed([make_notice(1)])
+    for title in ('Notice 1 (a)', 'Notice 1 (b)'):
+        data = manager.load_cache()
+        manager.update_notice(make_notice(1, title), data)
+        manager.update_notice(make_notice(2, title), data)
+        assert manager.save_cache(data)
+
+    store = JournalStore(cache_file)
+    notices = store.load()['notices']
+    assert store.journal_entries == 2 and notices.materialized() == 0
+    assert notices['n1']['title'] == notices['n2']['title'] == 'Notice 1 (b)'
+
+    data = CacheManager(cache_file).load_cache()
+    assert data['notices']['n1']['title'] == 'Notice 1 (b)'
+
+
+def test_torn_journal_entry_is_ignored(cache_file, seed):
+    manager = seed([make_notice(1)])
+    data = manager.load_cache()
+    manager.update_notice(make_notice(1, 'Kept'), data)
+    assert manager.save_cache(data)
+    data = manager.load_cache()
+    manager.update_notice(make_notice(1, 'Lost'), data)
+    manager.update_notice(make_notice(2), data)
+    assert manager.save_cache(data)
+
+    # The last save was interrupted after its first record line
+    journal = manager.store.journal_file
+    with open(journal, 'rb') as f:
+        lines = f.read().split(b'\n')
+    with open(journal, 'wb') as f:
+        f.write(b'\n'.join(lines[:-3]) + b'\n')
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    assert manager.store.journal_damaged
+    assert data['notices']['n1']['title'] == 'Kept' and 'n2' not in data['notices']
+    assert manager.save_cache(data)          # compacts the damaged journal away
+    reloaded = CacheManager(cache_file)
+    assert reloaded.load_cache()['notices']['n1']['title'] == 'Kept'
+    assert not reloaded.store.journal_damaged
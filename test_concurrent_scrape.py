@@ -0,0 +1,38 @@
+"""
+test_concurrent_scrape.py
+─────────────────────────
+Local-server tests for NoticeScraper.scrape_all_pages: pages are fetched
+concurrently but parsed in page order, and a page that fails ends the
+scrape; fetched one at a time, nothing past it is requested.
+"""
+
+import time
+
+from conftest import PER_PAGE, board_scraper
+
+
+def test_pages_are_fetched_together_and_kept_in_order(board):
+    board.delay = 0.3
+    scraper = board_scraper(board)
+    start = time.monotonic()
+    notices, page_notices = scraper.scrape_all_pages()
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 2 * board.delay                   # not three round trips in a row
+    assert sorted(page_notices) == [1, 2, 3]
+    assert [n['title'] for n in notices] == board.titles
+
+
+def test_failed_page_ends_the_scrape(board):
+    board.broken = {2}
+    notices, page_notices = board_scraper(board).scrape_all_pages()
+    assert sorted(page_notices) == [1] and len(notices) == PER_PAGE
+
+
+def test_one_at_a_time_stops_fetching_at_a_failed_page(board):
+    board.broken = {2}
+    scraper = board_scraper(board)
+    scraper.concurrent = False
+    _, page_notices = scraper.scrape_all_pages()
+    assert sorted(page_notices) == [1]
+    assert [page for page, _, _ in board.requests] == [1, 2]
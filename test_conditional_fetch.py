@@ -0,0 +1,88 @@
+"""
+test_conditional_fetch.py
+─────────────────────────
+Local-server tests for the unchanged-page fast path: pages answered with
+304 (or with the same body as last run) are not parsed, a run that finds
+every page unchanged skips change detection and notice updates, and when
+one page did change the 304 pages are fetched again in full.
+"""
+
+import pytest
+
+from cache_manager import CacheManager
+from conftest import PER_PAGE, board_scraper
+from monitor import NoticeMonitor
+
+
+def _not_parsed(html_content):
+    raise AssertionError("an unchanged page was parsed")
+
+
+def test_unmodified_pages_are_not_parsed(board):
+    scraper = board_scraper(board)
+    notices, _ = scraper.scrape_all_pages()
+    assert len(notices) == 3 * PER_PAGE
+
+    board.requests.clear()
+    scraper.parse_notices = _not_parsed
+    assert scraper.scrape_all_pages() == ([], {})
+    assert scraper.all_pages_unchanged
+    assert sorted(board.requests) == [(1, True, 304), (2, True, 304), (3, True, 304)]
+
+
+def test_same_body_without_an_etag_is_unchanged(board):
+    board.etags = False
+    scraper = board_scraper(board)
+    scraper.scrape_all_pages()
+
+    scraper.parse_notices = _not_parsed
+    assert scraper.scrape_all_pages() == ([], {})
+    assert scraper.all_pages_unchanged
+
+
+def test_one_changed_page_refetches_the_others_in_full(board):
+    scraper = board_scraper(board)
+    scraper.scrape_all_pages()
+
+    board.requests.clear()
+    board.titles[PER_PAGE] = 'Notice 4 (revised)'
+    notices, page_notices = scraper.scrape_all_pages()
+    assert not scraper.all_pages_unchanged
+    assert sorted(page_notices) == [1, 2, 3] and len(notices) == 3 * PER_PAGE
+    assert sorted(board.requests) == [(1, False, 200), (1, True, 304), (2, True, 200),
+                                      (3, False, 200), (3, True, 304)]
+
+
+def test_unchanged_run_skips_notice_work(board, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('TELEGRAM_TOKEN', 'test')
+    monkeypatch.setenv('TELEGRAM_CHAT_ID', '1')
+
+    # The last run saw the board as it is now
+    scraper = board_scraper(board)
+    notices, page_notices = scraper.scrape_all_pages()
+    manager = CacheManager()
+    data = manager.load_cache()
+    for n in notices:
+        manager.update_notice(n, data, was_on_page_1=n in page_notices[1])
+    manager.set_page_validators(scraper.page_validators, data)
+    manager.set_previous_page_1_ids([n['id'] for n in page_notices[1]], data)
+    manager.record_run(data)
+    assert manager.save_cache(data)
+
+    monitor = NoticeMonitor()
+    monitor.scraper.base_url = board.url
+    sent = []
+    monitor.telegram._request = lambda method, data, files=None: (sent.append(method) or {'message_id': 7}, None)
+    monitor.change_detector.detect_changes = lambda *args: pytest.fail("change detection ran")
+    board.requests.clear()
+
+    stats = monitor.run()
+    assert stats['status'] == 'success' and stats['page_unchanged']
+    assert stats['new_count'] == stats['removed_count'] == 0
+    assert board.requests == [(1, True, 304)]                  # incremental: page 1 only
+    assert set(sent) <= {'sendMessage', 'pinChatMessage', 'editMessageText'}   # the dashboard
+
+    data = CacheManager().load_cache()
+    assert data['total_runs'] == 2 and len(data['notices']) == 3 * PER_PAGE
+    assert data['page_validators'] == scraper.page_validators
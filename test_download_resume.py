@@ -0,0 +1,281 @@
+"""
+test_download_resume.py
+───────────────────────
+Local-server tests for ContentProcessor's resumable downloads: a transfer that
+stalls mid-body is resumed with an HTTP Range request from the last received
+byte, and falls back to a whole-file retry when the server can't resume.
+Also checks that a gzip-encoded body is accepted without the length check,
+that file types are sniffed from the download itself, that downloads past
+max_download_bytes are refused, and that one file behind two URLs is
+stored once.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from cache_manager import CacheManager
+from content_processor import ContentProcessor
+from http_client import HttpClient
+
+
+PAYLOAD = bytes(range(256)) * 4096          # 1 MiB
+ETAG    = '"v1"'
+
+
+class _FlakyHandler(BaseHTTPRequestHandler):
+    """
+    Serves PAYLOAD. The first GET is cut off halfway (Content-Length promises
+    the full body). Behaviour on the follow-up is set by the server's flags.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        srv = self.server
+        srv.requests.append(dict(self.headers))
+        first = len(srv.requests) == 1
+
+        range_hdr = self.headers.get('Range')
+        if (range_hdr and srv.supports_ranges
+                and self.headers.get('If-Range') == srv.etag):
+            start = int(range_hdr.split('=')[1].rstrip('-'))
+            body  = PAYLOAD[start:]
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{len(PAYLOAD) - 1}/{len(PAYLOAD)}')
+        else:
+            body = PAYLOAD
+            self.send_response(200)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', srv.etag)
+        if srv.supports_ranges:
+            self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+        if first:
+            # Stall: send half, then drop the connection
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve(supports_ranges: bool = True, etag: str = ETAG) -> ThreadingHTTPServer:
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _FlakyHandler)
+    srv.requests = []
+    srv.supports_ranges = supports_ranges
+    srv.etag = etag
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv
+
+
+def _fetch(srv):
+    processor = ContentProcessor(http=HttpClient())
+    url = f"http://127.0.0.1:{srv.server_port}/notice.pdf"
+    with patch('content_processor.time.sleep'):
+        stored = processor.fetch(url)
+    return stored
+
+
+def test_stalled_download_resumes_from_last_byte():
+    srv = _serve()
+    try:
+        stored = _fetch(srv)
+    finally:
+        srv.shutdown()
+
+    assert stored is not None
+    assert stored.read_bytes() == PAYLOAD
+    assert stored.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+    assert len(srv.requests) == 2
+    assert srv.requests[1]['Range'] == f'bytes={len(PAYLOAD) // 2}-'
+    assert srv.requests[1]['If-Range'] == ETAG
+
+
+def test_no_range_support_falls_back_to_whole_file():
+    srv = _serve(supports_ranges=False)
+    try:
+        stored = _fetch(srv)
+    finally:
+        srv.shutdown()
+
+    assert stored is not None
+    assert stored.read_bytes() == PAYLOAD
+    assert 'Range' not in srv.requests[1]
+
+
+def test_changed_file_restarts_from_zero():
+    # Server ignores the range when If-Range doesn't match → full 200 body
+    srv = _serve()
+    original_get = _FlakyHandler.do_GET
+
+    def do_get(handler):
+        if len(handler.server.requests) == 1:
+            handler.server.etag = '"v2"'     # file replaced after the first attempt
+        original_get(handler)
+
+    try:
+        with patch.object(_FlakyHandler, 'do_GET', do_get):
+            stored = _fetch(srv)
+    finally:
+        srv.shutdown()
+
+    assert stored is not None
+    assert stored.read_bytes() == PAYLOAD
+    assert stored.sha256 == hashlib.sha256(PAYLOAD).hexdigest()
+
+
+class _GzipHandler(BaseHTTPRequestHandler):
+    """
+    Serves PAYLOAD gzip-encoded whatever Accept-Encoding says, Content-Length
+    counting the encoded bytes. The first GET is cut off halfway.
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.requests.append(dict(self.headers))
+        body = gzip.compress(PAYLOAD)
+        self.send_response(200)
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+        if len(self.server.requests) == 1:
+            self.wfile.write(body[:len(body) // 2])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_gzip_encoded_download_is_not_length_checked_or_resumed():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _GzipHandler)
+    srv.requests = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        stored = _fetch(srv)
+    finally:
+        srv.shutdown()
+
+    assert stored is not None
+    assert stored.read_bytes() == PAYLOAD
+    assert [r['Accept-Encoding'] for r in srv.requests] == ['identity', 'identity']
+    # Decoded offsets mean nothing to the encoded body: the retry starts over
+    assert len(srv.requests) == 2 and 'Range' not in srv.requests[1]
+
+
+class _TypedHandler(BaseHTTPRequestHandler):
+    """
+    Serves a PDF at /pdf and /pdf-copy (no extension, misleading
+    Content-Type), the same PDF with no Content-Length at /pdf-unsized, an
+    HTML error page with status 200 at /busy, 404 elsewhere.
+    """
+
+    def do_GET(self):
+        self.server.requests.append(self.command)
+        if self.path == '/busy':
+            body, content_type = b'<html><body>Server busy</body></html>', 'text/html'
+        elif self.path in ('/pdf', '/pdf-copy', '/pdf-unsized'):
+            body, content_type = b'%PDF-1.7\n' + PAYLOAD[:1000], 'application/octet-stream'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        if self.path != '/pdf-unsized':
+            self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+def test_file_type_sniffed_without_extra_requests():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _TypedHandler)
+    srv.requests = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}"
+    processor = ContentProcessor(http=HttpClient())
+    try:
+        assert processor.detect_file_type(f"{base}/pdf") == 'pdf'
+        assert processor.fetch(f"{base}/pdf").file_type == 'pdf'
+        # A failed URL is unknown, and is not requested again this run
+        assert processor.detect_file_type(f"{base}/missing") == 'unknown'
+        assert processor.detect_file_type(f"{base}/missing") == 'unknown'
+    finally:
+        srv.shutdown()
+
+    assert srv.requests == ['GET', 'GET']
+    assert processor.url_types == {f"{base}/pdf": 'pdf'}
+
+
+def test_unknown_file_type_checked_again_next_run():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _TypedHandler)
+    srv.requests = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}"
+    try:
+        first = ContentProcessor(http=HttpClient())
+        # A transient error page served with 200 sniffs as unknown...
+        assert first.detect_file_type(f"{base}/busy") == 'unknown'
+        cache = CacheManager().set_url_file_types(first.url_types, {})
+
+        # ...and is not remembered, so the next run downloads it again
+        second = ContentProcessor(http=HttpClient())
+        second.url_types = CacheManager().get_url_file_types(cache)
+        assert second.detect_file_type(f"{base}/busy") == 'unknown'
+    finally:
+        srv.shutdown()
+
+    assert srv.requests == ['GET', 'GET']
+    assert cache['url_file_types'] == {}
+
+
+def test_download_over_the_size_limit_is_refused():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _TypedHandler)
+    srv.requests = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}"
+    processor = ContentProcessor(http=HttpClient())
+    processor.max_download_bytes = 500
+    try:
+        # Refused from Content-Length, and mid-body when there is none
+        assert processor.fetch(f"{base}/pdf") is None
+        assert processor.fetch(f"{base}/pdf-unsized") is None
+    finally:
+        srv.shutdown()
+
+    # Neither is retried, and nothing partial is kept
+    assert srv.requests == ['GET', 'GET']
+    assert os.listdir(processor.store._dir) == []
+
+
+def test_same_file_behind_two_urls_is_stored_once():
+    srv = ThreadingHTTPServer(('127.0.0.1', 0), _TypedHandler)
+    srv.requests = []
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{srv.server_port}"
+    processor = ContentProcessor(http=HttpClient())
+    try:
+        first = processor.fetch(f"{base}/pdf")
+        assert processor.fetch(f"{base}/pdf-copy") is first
+        assert processor.fetch(f"{base}/pdf") is first          # served from the store
+    finally:
+        srv.shutdown()
+
+    assert srv.requests == ['GET', 'GET']
+    assert first.read_bytes() == b'%PDF-1.7\n' + PAYLOAD[:1000]
@@ -0,0 +1,85 @@
+"""
+test_file_id_reuse.py
+─────────────────────
+Telegram file_id reuse: media sent once is re-sent by reference instead of
+re-uploaded, and a file_id Telegram no longer accepts falls back to an
+upload whose new id replaces it. Telegram is replaced by a stub.
+"""
+
+import json
+from typing import Tuple
+
+from telegram_utils import TelegramUtils, media_hash
+
+
+NOTICE = {'title': 'Exam routine', 'date': '01-10-2026', 'download_url': 'https://example.com/n.pdf'}
+PAGES = [b'\x89PNG\r\n\x1a\n' + bytes([n]) * 16 for n in range(3)]
+
+
+class _Telegram:
+    """Stub Bot API: hands out a new file_id per upload, rejects ids in expired."""
+
+    def __init__(self):
+        self.uploads = 0
+        self.references = []
+        self.expired = set()
+        self.sent = 0
+
+    def __call__(self, method, data, files=None):
+        self.sent += 1
+        if method == 'sendMessage':
+            return {'message_id': self.sent}
+        kind = 'document' if method == 'sendDocument' else 'photo'
+        if method == 'sendMediaGroup':
+            media = [m['media'] for m in json.loads(data['media'])]
+        else:
+            media = [data.get(kind, 'attach://upload')]
+        refs = [m for m in media if not m.startswith('attach://')]
+        if self.expired & set(refs):
+            return None
+        self.references.extend(refs)
+
+        messages = []
+        for m in media:
+            if m.startswith('attach://'):
+                self.uploads += 1
+                m = f"upload{self.uploads}"
+            sent = [{'file_id': m}] if kind == 'photo' else {'file_id': m}
+            messages.append({'message_id': self.sent, kind: sent})
+        return messages if method == 'sendMediaGroup' else messages[0]
+
+
+def _telegram() -> Tuple[TelegramUtils, _Telegram]:
+    tg, api = TelegramUtils(), _Telegram()
+    tg._make_request = api
+    return tg, api
+
+
+def test_media_sent_again_is_referenced_not_uploaded():
+    tg, api = _telegram()
+    file_ids = {}
+    tg.send_notice_with_media(NOTICE, 'NEW', PAGES, file_ids=file_ids)
+    assert api.uploads == 3 and set(file_ids) == {media_hash(p) for p in PAGES}
+
+    results, all_sent = tg.send_notice_with_media(NOTICE, 'EDITED', PAGES, file_ids=file_ids)
+    assert all_sent and len(results) == 3
+    assert api.uploads == 3 and api.references == [file_ids[media_hash(p)] for p in PAGES]
+
+
+def test_pdf_sent_again_is_referenced_not_uploaded():
+    tg, api = _telegram()
+    file_ids = {}
+    tg.send_notice_with_media(NOTICE, 'NEW', [], b'%PDF-1.7', file_ids=file_ids, pdf_hash='pdf')
+    tg.send_notice_with_media(NOTICE, 'NEW', [], b'%PDF-1.7', file_ids=file_ids, pdf_hash='pdf')
+    assert api.uploads == 1 and api.references == [file_ids['pdf']]
+
+
+def test_rejected_file_id_is_replaced_by_a_new_upload():
+    tg, api = _telegram()
+    file_ids = {}
+    tg.send_notice_with_media(NOTICE, 'NEW', PAGES, file_ids=file_ids)
+    api.expired = {file_ids[media_hash(PAGES[0])]}
+
+    results, all_sent = tg.send_notice_with_media(NOTICE, 'EDITED', PAGES, file_ids=file_ids)
+    assert all_sent and len(results) == 3
+    assert api.uploads == 6 and not api.expired & set(file_ids.values())
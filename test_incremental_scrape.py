@@ -0,0 +1,47 @@
+"""
+test_incremental_scrape.py
+──────────────────────────
+Local-server tests for NoticeScraper.scrape_incremental: page 1 is read
+first and deeper pages only until every notice that left page 1 is found
+again, so a new notice on top costs one extra page and a quiet board one
+conditional request.
+"""
+
+from conftest import PER_PAGE, board_scraper
+
+
+def _last_run(board):
+    """A scraper that has read the whole board, and the page 1 ids it saw."""
+    scraper = board_scraper(board)
+    _, page_notices = scraper.scrape_all_pages()
+    board.requests.clear()
+    return scraper, {n['id'] for n in page_notices[1]}
+
+
+def test_new_notice_on_top_reads_one_page_further(board):
+    scraper, page_1_ids = _last_run(board)
+    board.titles.insert(0, 'Fresh notice')
+
+    notices, page_notices = scraper.scrape_incremental(page_1_ids)
+    assert sorted(page_notices) == [1, 2]
+    assert [page for page, _, _ in board.requests] == [1, 2]
+    assert page_1_ids <= {n['id'] for n in notices}
+    assert notices[0]['title'] == 'Fresh notice'
+
+
+def test_quiet_board_takes_one_conditional_request(board):
+    scraper, page_1_ids = _last_run(board)
+
+    assert scraper.scrape_incremental(page_1_ids) == ([], {})
+    assert scraper.all_pages_unchanged
+    assert board.requests == [(1, True, 304)]
+
+
+def test_removed_notice_is_searched_for_down_to_max_pages(board):
+    scraper, page_1_ids = _last_run(board)
+    board.titles.remove('Notice 2')
+
+    notices, page_notices = scraper.scrape_incremental(page_1_ids)
+    assert sorted(page_notices) == [1, 2, 3]
+    assert len(notices) == 3 * PER_PAGE - 1
+    assert 'Notice 2' not in {n['title'] for n in notices}
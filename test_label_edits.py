@@ -0,0 +1,51 @@
+"""
+test_label_edits.py
+───────────────────
+Deleted-notice labels: a message sent as text is edited with one
+editMessageText call, and a message of unknown kind falls back from the
+caption edit to the text edit. Telegram is replaced by a stub.
+"""
+
+from cache_manager import CacheManager
+from telegram_utils import EDIT_DONE, EDIT_GONE, TelegramUtils
+
+
+def _telegram(calls: list, kinds: dict) -> TelegramUtils:
+    """A client whose messages have the given kinds ('text' or 'photo'); others are gone."""
+    tg = TelegramUtils()
+
+    def request(method, data, files=None):
+        calls.append((method, data['message_id']))
+        kind = kinds.get(data['message_id'])
+        if kind is None:
+            return None, 'Bad Request: message to edit not found'
+        if method == 'editMessageCaption' and kind == 'text':
+            return None, 'Bad Request: there is no caption in the message to edit'
+        if method == 'editMessageText' and kind != 'text':
+            return None, 'Bad Request: there is no text in the message to edit'
+        return {'message_id': data['message_id']}, None
+
+    tg._request = request
+    return tg
+
+
+def test_text_messages_take_one_request():
+    calls = []
+    tg = _telegram(calls, {1: 'photo', 2: 'text', 3: 'text'})
+    statuses = tg.edit_labels({1: 'x', 2: 'x', 3: 'x', 4: 'x'}, text_ids={2})
+    assert statuses == {1: EDIT_DONE, 2: EDIT_DONE, 3: EDIT_DONE, 4: EDIT_GONE}
+    assert sorted(calls) == sorted([
+        ('editMessageCaption', 1),
+        ('editMessageText', 2),
+        ('editMessageCaption', 3), ('editMessageText', 3),   # kind not recorded
+        ('editMessageCaption', 4),
+    ])
+
+
+def test_sent_text_messages_are_recorded():
+    manager = CacheManager('notice_cache.json')   # nothing is read or written
+    data = {'notices': {'n1': {'id': 'n1', 'telegram_message_ids': []}}}
+    manager.append_telegram_message_ids('n1', [5, 6], data, text_ids=[6])
+    manager.append_telegram_message_ids('n1', [7], data)
+    assert data['notices']['n1']['telegram_message_ids'] == [5, 6, 7]
+    assert data['notices']['n1']['text_message_ids'] == [6]
@@ -0,0 +1,139 @@
+"""
+test_notice_ids.py
+──────────────────
+Stable notice ids: a title edit keeps the id (EDITED, not NEW + REMOVED),
+rows sharing a download URL keep their own ids whatever the page order,
+and the v4 cache migration re-keys old content-hash ids, merging records
+that an earlier title edit had split but not rows listed side by side.
+"""
+
+import hashlib
+
+from cache_manager import CacheManager
+from change_detector import ChangeDetector, ChangeType
+from conftest import make_notice, make_record
+from notice_ids import notice_id
+from scraper import NoticeScraper
+
+
+URL = "https://www.dhakacollege.edu.bd/storage/notices/2026/10021.pdf"
+
+
+def _old_id(title: str, date: str, url: str) -> str:
+    """Ids as scraper.py made them before v4."""
+    return hashlib.md5(f"{title}{date}{url}".encode()).hexdigest()
+
+
+def _record(nid: str, title: str, last_seen: str, message_ids):
+    return make_record(make_notice(1, title, id=nid, download_url=URL), last_seen, message_ids)
+
+
+def test_title_edit_is_reported_as_edited():
+    scraper = NoticeScraper()
+    before = scraper._make_notice('1', 'Exam routine', '01-10-2026', '/storage/notices/2026/10021.pdf')
+    after = scraper._make_notice('1', 'Exam routine (revised)', '01-10-2026', '/storage/notices/2026/10021.pdf')
+    assert before['id'] == after['id'] == notice_id(URL, '', '')
+
+    cache = {'notices': {before['id']: dict(before)}, 'previous_page_1_ids': [before['id']]}
+    changes = ChangeDetector().detect_changes([after], [after], cache)
+    assert [c.change_type for c in changes] == [ChangeType.EDITED]
+
+
+def test_rows_sharing_a_file_keep_separate_ids():
+    scraper = NoticeScraper()
+    first = scraper._make_notice('1', 'Routine', '01-10-2026', URL)
+    second = scraper._make_notice('2', 'Routine (Bangla)', '01-10-2026', URL)
+    again = scraper._make_notice('1', 'Routine', '01-10-2026', URL)
+    unique = scraper._dedupe([first, second, again])
+    assert len(unique) == 2 and unique[0]['id'] != unique[1]['id']
+
+
+def test_new_row_linking_a_cached_file_does_not_take_its_id():
+    scraper = NoticeScraper()
+    old = scraper._make_notice('1', 'Routine', '01-10-2026', URL)
+    base_id = old['id']
+    cache = {'notices': {base_id: dict(old)}, 'previous_page_1_ids': [base_id]}
+    manager = CacheManager('notice_cache.json')   # nothing is read or written
+    scraper.cached_fingerprint = lambda nid: manager.notice_fingerprint(nid, cache)
+
+    # Next run: a new row on top of page 1 links the same file
+    new = scraper._make_notice('1', 'Routine (corrigendum)', '02-10-2026', URL)
+    old = scraper._make_notice('2', 'Routine', '01-10-2026', URL)
+    unique = scraper._dedupe([new, old])
+    assert old['id'] == base_id and new['id'] != base_id
+
+    changes = ChangeDetector().detect_changes(unique, unique, cache)
+    assert [(c.change_type, c.notice_id) for c in changes] == [(ChangeType.NEW, new['id'])]
+
+    # Once both are cached, each keeps its id whatever the page order
+    cache['notices'][new['id']] = dict(new)
+    for rows in ([new, old], [old, new]):
+        rows = [scraper._make_notice(str(i), n['title'], n['date'], URL) for i, n in enumerate(rows)]
+        assert {n['title']: n['id'] for n in scraper._dedupe(rows)} == \
+            {'Routine': base_id, 'Routine (corrigendum)': new['id']}
+
+
+def test_v3_cache_is_rekeyed_and_split_records_merged(cache_file):
+    old_a = _old_id('Exam routine', '01-10-2026', URL)
+    old_b = _old_id('Exam routine (revised)', '01-10-2026', URL)
+
+    # A v3 cache where a title edit split one notice into two records
+    writer = CacheManager(cache_file)
+    writer.current_version = 3
+    data = writer.load_cache()
+    data['notices'][old_a] = _record(old_a, 'Exam routine', '2026-10-01T10:00:00', [11, 12])
+    data['notices'][old_b] = _record(old_b, 'Exam routine (revised)', '2026-10-02T10:00:00', [13])
+    data['previous_page_1_ids'] = [old_b, old_a]
+    writer.mark_dirty(old_a)
+    writer.mark_dirty(old_b)
+    writer.save_cache(data)
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    new_id = notice_id(URL, '', '')
+    assert list(data['notices'].keys()) == [new_id]
+    merged = data['notices'][new_id]
+    assert merged['title'] == 'Exam routine (revised)'
+    assert merged['telegram_message_ids'] == [11, 12, 13]
+    assert merged['first_seen'] == '2026-10-01T10:00:00'
+    assert data['previous_page_1_ids'] == [new_id]
+    assert manager.save_cache(data)
+
+    # The migrated cache loads clean, with no second migration
+    reloaded = CacheManager(cache_file)
+    data = reloaded.load_cache()
+    assert data['version'] == 4 and not reloaded.corrupted_ids
+    assert data['notices'][new_id]['telegram_message_ids'] == [11, 12, 13]
+
+
+def test_rekey_keeps_rows_on_the_page_together_apart(cache_file):
+    old_a = _old_id('Routine', '01-10-2026', URL)
+    old_b = _old_id('Routine (Bangla)', '01-10-2026', URL)
+
+    # Two rows linking one file, both on the page over the same runs
+    writer = CacheManager(cache_file)
+    writer.current_version = 3
+    data = writer.load_cache()
+    data['notices'][old_a] = dict(_record(old_a, 'Routine', '2026-10-03T10:00:00', [11]),
+                                  first_seen='2026-10-01T10:00:00')
+    data['notices'][old_b] = dict(_record(old_b, 'Routine (Bangla)', '2026-10-03T10:00:00', [12]),
+                                  first_seen='2026-10-02T10:00:00')
+    data['previous_page_1_ids'] = [old_b, old_a]
+    writer.mark_dirty(old_a)
+    writer.mark_dirty(old_b)
+    writer.save_cache(data)
+
+    manager = CacheManager(cache_file)
+    data = manager.load_cache()
+    assert len(data['notices']) == 2
+    titles = {nid: r['title'] for nid, r in data['notices'].items()}
+    assert titles[notice_id(URL, '', '')] == 'Routine'
+
+    # The scraper gives the rows the same ids: nothing is reported
+    scraper = NoticeScraper()
+    scraper.cached_fingerprint = lambda nid: manager.notice_fingerprint(nid, data)
+    rows = scraper._dedupe([scraper._make_notice('1', 'Routine (Bangla)', '01-10-2026', URL),
+                            scraper._make_notice('2', 'Routine', '01-10-2026', URL)])
+    assert {n['id'] for n in rows} == set(titles)
+    assert ChangeDetector().detect_changes(rows, rows, data) == []
+
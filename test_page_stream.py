@@ -0,0 +1,73 @@
+"""
+test_page_stream.py
+───────────────────
+Encoded pages flow from render (or the media cache) to Telegram one album
+at a time: albums take their pages from the stream as they are sent, the
+media cache stores a stream only once every page has gone through, and a
+stream that ends early falls back to the PDF.
+"""
+
+import json
+
+from media_cache import MediaCache, PageStream
+from telegram_utils import TelegramUtils
+
+
+NOTICE = {'title': 'Exam routine', 'date': '01-10-2026', 'download_url': 'https://example.com/n.pdf'}
+
+
+def _pages(count: int, taken: list):
+    for n in range(count):
+        taken.append(n)
+        yield b'\x89PNG\r\n\x1a\n' + bytes([n]) * 16
+
+
+def _telegram(calls: list) -> TelegramUtils:
+    tg = TelegramUtils()
+
+    def make_request(method, data, files=None):
+        calls.append((method, len(files or {})))
+        if method == 'sendMediaGroup':
+            return [{'message_id': i} for i in range(len(json.loads(data['media'])))]
+        return {'message_id': 1}
+
+    tg._make_request = make_request
+    return tg
+
+
+def test_albums_take_pages_from_the_stream_one_group_at_a_time():
+    calls, taken = [], []
+    tg = _telegram(calls)
+    taken_before_send = []
+    original = tg._send_album
+
+    def send_album(group, *args):
+        taken_before_send.append(len(taken))
+        return original(group, *args)
+
+    tg._send_album = send_album
+    results, all_sent = tg.send_notice_with_media(NOTICE, 'NEW', PageStream(13, _pages(13, taken)))
+    assert all_sent and len(results) == 13
+    assert taken_before_send == [10, 13]
+    assert calls == [('sendMediaGroup', 10), ('sendMediaGroup', 3)]
+
+
+def test_stream_ending_early_sends_the_pdf_instead():
+    calls = []
+    tg = _telegram(calls)
+    results, all_sent = tg.send_notice_with_media(NOTICE, 'NEW', PageStream(13, _pages(12, [])),
+                                                  b'%PDF-1.7')
+    assert not all_sent
+    assert calls == [('sendMediaGroup', 10), ('sendDocument', 1)]
+
+
+def test_media_cache_stores_complete_streams_only(tmp_path):
+    cache = MediaCache(str(tmp_path / 'media_cache'))
+    assert len(list(cache.record('short', _pages(2, []), 3))) == 2
+    assert len(list(cache.record('whole', _pages(3, []), 3))) == 3
+    assert cache.get('short') is None
+
+    reread = MediaCache(str(tmp_path / 'media_cache'))
+    pages = reread.get('whole')
+    assert len(pages) == 3 and list(pages) == list(_pages(3, []))
+    assert sorted(p.name for p in (tmp_path / 'media_cache').iterdir()) == ['index.json', 'whole']
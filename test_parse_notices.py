@@ -0,0 +1,58 @@
+"""
+test_parse_notices.py
+─────────────────────
+Notice table parsing: the lxml and BeautifulSoup engines read the same
+rows, with or without the usual page structure; the table path learned
+for a page layout is reused on the next page with that layout; and a new
+layout with no notice table is reported instead of treated as empty.
+"""
+
+import pytest
+
+from conftest import page_html
+from scraper import NoticeScraper
+
+
+TITLES = [f"Notice {n}" for n in range(1, 4)]
+
+
+def _bare_page(titles) -> bytes:
+    """The rows in a bare table: only the fallback table scan finds them."""
+    return page_html(titles).replace(
+        b'<div class="mt-6 flex flex-col gap-4 md:mt-8 md:gap-6 lg:mt-10 lg:gap-8">', b'<div>')
+
+
+def _rows(notices):
+    return [(n['serial'], n['title'], n['date'], n['download_url']) for n in notices]
+
+
+@pytest.mark.parametrize('page', [page_html(TITLES), _bare_page(TITLES)], ids=['primary', 'fallback'])
+def test_engines_read_the_same_rows(page):
+    lxml_scraper, bs4_scraper = NoticeScraper(), NoticeScraper()
+    bs4_scraper.engine = 'bs4'
+    html_content = page.decode()
+    notices = lxml_scraper.parse_notices(html_content)
+    assert [n['title'] for n in notices] == TITLES
+    assert _rows(notices) == _rows(bs4_scraper.parse_notices(html_content))
+
+
+def test_learned_table_path_is_reused():
+    scraper = NoticeScraper()
+    scraper.parse_notices(_bare_page(TITLES).decode())
+    assert len(scraper.table_layouts) == 1
+
+    def not_discovered(doc):
+        raise AssertionError("table searched for again")
+
+    scraper._discover_rows = not_discovered
+    notices = scraper.parse_notices(_bare_page(['Notice 9']).decode())
+    assert [n['title'] for n in notices] == ['Notice 9']
+
+
+def test_new_layout_without_a_notice_table_is_reported():
+    scraper = NoticeScraper()
+    scraper.parse_notices(page_html(TITLES).decode())
+    assert scraper.layout_error is None
+
+    assert scraper.parse_notices('<html><body><main><p>Under maintenance</p></main></body></html>') == []
+    assert scraper.layout_error and 'notice table not found' in scraper.layout_error
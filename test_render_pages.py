@@ -0,0 +1,65 @@
+"""
+test_render_pages.py
+────────────────────
+PDF pages rendered in the process pool come back branded and in page
+order, a damaged PDF gives an empty stream instead of an error, and the
+branding layers cached per page size give the same pages as fresh ones.
+"""
+
+import io
+
+import fitz
+import pytest
+from PIL import Image
+
+import branding
+from content_processor import ContentProcessor
+from media_cache import PageStream
+
+
+def _pdf(pages: int) -> bytes:
+    """Page n has n + 1 lines of text, so its cropped render is taller than page n - 1's."""
+    doc = fitz.open()
+    for n in range(pages):
+        page = doc.new_page()
+        for line in range(n + 1):
+            page.insert_text((72, 72 + line * 40), f"Page {n + 1} line {line + 1}", fontsize=14)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture
+def processor():
+    processor = ContentProcessor(render_workers=2)
+    yield processor
+    processor.shutdown_render_pool()
+
+
+def test_pages_come_back_in_order(processor):
+    pages = processor.render_pdf_pages(_pdf(5), format='PNG')
+    assert isinstance(pages, PageStream) and len(pages) == 5
+
+    heights = [Image.open(io.BytesIO(page)).height for page in pages]
+    assert len(heights) == 5
+    assert heights == sorted(heights) and len(set(heights)) == 5
+
+
+def test_damaged_pdf_gives_an_empty_stream(processor):
+    pages = processor.render_pdf_pages(b'%PDF-1.7\nnot really a pdf')
+    assert len(pages) == 0 and list(pages) == []
+
+
+def test_cached_branding_layers_match_fresh_ones():
+    page = Image.new('RGB', (600, 800), 'white')
+    first = branding.add_branding(page)
+    assert first.size == (600, 800 + branding.BAR_HEIGHT)
+
+    hits = branding._tiled_watermark.cache_info().hits
+    again = branding.add_branding(page)
+    assert branding._tiled_watermark.cache_info().hits == hits + 1
+
+    branding._tiled_watermark.cache_clear()
+    branding._footer_bar.cache_clear()
+    fresh = branding.add_branding(page)
+    assert again.tobytes() == first.tobytes() == fresh.tobytes()
@@ -0,0 +1,49 @@
+"""
+test_serializers.py
+───────────────────
+State encodings: every available format round-trips and is recognised
+from its first bytes, and a cache written in one format is read back, and
+rewritten, by a manager configured for another.
+"""
+
+import pytest
+
+import serializers
+from cache_manager import CacheManager
+from conftest import make_notice
+
+
+SAMPLE = {"notices": {"a1": {"title": "পরীক্ষার নোটিশ", "ids": [1, 2]}}, "n": None}
+
+
+@pytest.mark.parametrize('name', sorted(serializers.SERIALIZERS))
+def test_formats_round_trip_and_are_detected(name, tmp_path):
+    raw = serializers.SERIALIZERS[name].dumps(SAMPLE)
+    assert serializers.detect(raw).loads(raw) == SAMPLE
+
+    path = str(tmp_path / 'log.json')
+    serializers.dump_file(path, SAMPLE, serializers.SERIALIZERS[name])
+    assert serializers.load_file(path) == SAMPLE
+
+
+def test_unknown_format_falls_back_to_compact_json():
+    assert serializers.get_serializer('yaml').name == 'json-compact'
+
+
+@pytest.mark.parametrize('written, reader', [('json', 'json-gz'), ('json-gz', 'json-compact'),
+                                             ('json-compact', 'json')])
+def test_cache_is_read_whatever_format_wrote_it(written, reader, cache_file, seed):
+    seed([make_notice(n) for n in range(3)], on_page_1=True, state_format=written)
+
+    manager = CacheManager(cache_file, state_format=reader)
+    data = manager.load_cache()
+    assert sorted(data['notices']) == ['n0', 'n1', 'n2'] and not manager.corrupted_ids
+    manager.update_notice(make_notice(3), data)
+    manager.store.compact_every = 0                # rewrite the snapshot in the reader's format
+    assert manager.save_cache(data)
+
+    # detect() reports any JSON text as json-compact
+    assert serializers.detect_file(cache_file).name == ('json-gz' if reader == 'json-gz' else 'json-compact')
+    data = CacheManager(cache_file, state_format=written).load_cache()
+    assert sorted(data['notices']) == ['n0', 'n1', 'n2', 'n3']
+    assert data['notices']['n0']['title'] == 'Notice 0'
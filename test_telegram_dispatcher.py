@@ -0,0 +1,134 @@
+"""
+test_telegram_dispatcher.py
+───────────────────────────
+Concurrent sends: jobs sharing a key run in submission order while other
+keys overlap, the chat's rate limiter spaces requests after a burst, and a
+429 pauses every sender for retry_after before the request is retried.
+The limiter runs on a fake clock; Telegram is replaced by a stub.
+"""
+
+import threading
+import time
+
+import pytest
+
+import telegram_dispatcher
+from telegram_dispatcher import RateLimiter, TelegramDispatcher
+from telegram_utils import TelegramUtils
+
+
+class _Clock:
+    """Stands in for the time module: sleep() moves monotonic() forward."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch) -> _Clock:
+    clock = _Clock()
+    monkeypatch.setattr(telegram_dispatcher, 'time', clock)
+    return clock
+
+
+def test_jobs_with_one_key_run_in_order_while_keys_overlap():
+    log, running, overlap = [], set(), []
+    lock = threading.Lock()
+
+    def send(key, n):
+        with lock:
+            running.add(key)
+            overlap.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.discard(key)
+            log.append((key, n))
+        return n
+
+    with TelegramDispatcher(max_workers=3) as dispatcher:
+        futures = [dispatcher.submit(key, send, key, n) for n in range(4) for key in 'abc']
+        assert [f.result() for f in futures] == [n for n in range(4) for _ in 'abc']
+
+    for key in 'abc':
+        assert [n for k, n in log if k == key] == [0, 1, 2, 3]
+    assert max(overlap) > 1
+
+
+def test_failed_job_does_not_stop_the_next_one_for_its_key():
+    def send(n):
+        if n == 0:
+            raise RuntimeError("send failed")
+        return n
+
+    with TelegramDispatcher(max_workers=2) as dispatcher:
+        first = dispatcher.submit('a', send, 0)
+        second = dispatcher.submit('a', send, 1)
+        with pytest.raises(RuntimeError):
+            first.result()
+        assert second.result() == 1
+
+
+def test_limiter_spaces_requests_after_a_burst(clock):
+    limiter = RateLimiter(rate=2.0, burst=3)
+    sent_at = []
+    for _ in range(6):
+        limiter.acquire()
+        sent_at.append(clock.now)
+    assert sent_at == pytest.approx([0, 0, 0, 0.5, 1.0, 1.5])
+
+
+def test_pause_holds_senders_for_retry_after(clock):
+    limiter = RateLimiter(rate=1.0, burst=3)
+    limiter.acquire()
+    limiter.pause(5)
+    limiter.pause(2)                 # a shorter retry_after does not cut the pause short
+    limiter.acquire()
+    assert clock.now == pytest.approx(5.0)
+
+
+class _Reply:
+    def __init__(self, body: dict):
+        self.body = body
+
+    def json(self) -> dict:
+        return self.body
+
+
+def test_rate_limited_request_waits_out_retry_after_and_retries(clock):
+    tg = TelegramUtils()
+    replies = [{'ok': False, 'error_code': 429, 'description': 'Too Many Requests: retry after 4',
+                'parameters': {'retry_after': 4}},
+               {'ok': True, 'result': {'message_id': 9}}]
+    posts = []
+
+    def post(url, data=None, files=None):
+        posts.append(clock.now)
+        return _Reply(replies[len(posts) - 1])
+
+    tg.http.post = post
+    assert tg._request('sendMessage', {'text': 'x'}) == ({'message_id': 9}, None)
+    assert posts[0] == 0 and posts[1] >= 4
+
+
+def test_rate_limit_retries_are_bounded(clock):
+    tg = TelegramUtils()
+    tg.max_rate_limit_retries = 2
+    posts = []
+
+    def post(url, data=None, files=None):
+        posts.append(url)
+        return _Reply({'ok': False, 'error_code': 429, 'description': 'Too Many Requests',
+                       'parameters': {'retry_after': 1}})
+
+    tg.http.post = post
+    result, error = tg._request('sendMessage', {'text': 'x'})
+    assert result is None and error == 'Too Many Requests'
+    assert len(posts) == 3
@@ -306,7 +306,7 @@ run(9, "DELETED label edit", "Send a message then edit it to prepend [DELETED]."
 # ─────────────────────────────────────────────────────────────────────────────
 def case_10(tg):
     notice = {**NOTICE_BASE, 'title': '[TC-10] API error — bad token response (should log & not crash)'}
-    # Patch requests.post to return a fake "401 Unauthorized" response
+    # Patch the HTTP client's post to return a fake "401 Unauthorized" response
     mock_response = MagicMock()
     mock_response.json.return_value = {'ok': False, 'description': 'Unauthorized (simulated)'}
 
@@ -316,14 +316,14 @@ def case_10(tg):
     )
     time.sleep(0.5)
 
-    with patch('telegram_utils.requests.post', return_value=mock_response):
+    with patch.object(tg.http, 'post', return_value=mock_response):
         result = tg.send_photo(_tiny_png(), caption='Should not appear')
 
     ok = result is None   # must return None cleanly, not raise
     return ok, "returned None gracefully on API error"
 
 
-run(10, "API error — bad token (simulated)", "requests.post returns {'ok': False}. Code must log and return None without crashing.", case_10)
+run(10, "API error — bad token (simulated)", "http.post returns {'ok': False}. Code must log and return None without crashing.", case_10)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -338,14 +338,14 @@ def case_11(tg):
     )
     time.sleep(0.5)
 
-    with patch('telegram_utils.requests.post', side_effect=req_lib.exceptions.Timeout("simulated timeout")):
+    with patch.object(tg.http, 'post', side_effect=req_lib.exceptions.Timeout("simulated timeout")):
         result = tg.send_message("Should not appear — timeout test")
 
     ok = result is None
     return ok, "returned None on Timeout without crashing"
 
 
-run(11, "Network timeout simulation", "requests.post raises Timeout. Code must catch it and return None.", case_11)
+run(11, "Network timeout simulation", "http.post raises Timeout. Code must catch it and return None.", case_11)
 
 
 # ─────────────────────────────────────────────────────────────────────────────